@@ -0,0 +1,55 @@
+"""
+Shared helpers for the benchmark scripts: sys.path setup, timing and
+loading the baseline implementation of a module straight from git history.
+"""
+import contextlib
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(REPO_ROOT, 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+def baseline_rev():
+    """Returns the root commit of the repository (the pre-optimization baseline)."""
+    out = subprocess.run(['git', 'rev-list', '--max-parents=0', 'HEAD'], cwd=REPO_ROOT,
+                         capture_output=True, text=True, check=True)
+    return out.stdout.split()[0]
+
+
+def load_baseline_module(module_name, rev=None):
+    """Loads src/<module_name>.py as it was at `rev` (default: the baseline commit)."""
+    rev = rev or baseline_rev()
+    source = subprocess.run(['git', 'show', f'{rev}:src/{module_name}.py'], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    spec = importlib.util.spec_from_loader(f'baseline_{module_name}', loader=None)
+    module = importlib.util.module_from_spec(spec)
+    module.__file__ = os.path.join(SRC_DIR, f'{module_name}.py')
+    exec(compile(source, module.__file__, 'exec'), module.__dict__)
+    return module
+
+
+def timed(func, *args, repeat=3, quiet=True, **kwargs):
+    """Runs func `repeat` times and returns (best_seconds, last_result). Stdout is swallowed when quiet."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        sink = io.StringIO() if quiet else None
+        with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def write_file(path, content=''):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
@@ -0,0 +1,78 @@
+"""
+Benchmark: Blueprint export, one UAssetAPI process at a time vs the bounded export pool.
+
+Builds a fake Unreal project whose Content/ holds --assets .uasset files, a few of them broken,
+hanging or flaky, and exports it with uasset_exporter_standin.py in place of UAssetAPI.CLI.exe
+(each export sleeps --delay seconds, like a .NET start). Runs the baseline
+batch_export_blueprints_to_json (sequential, no timeout) on the healthy assets only, since a
+hanging asset would block it forever, then the pool on all of them, and reports throughput and the
+failures the pool logged (hangs end at --timeout, flaky assets pass on retry). Then re-runs the
+export on the unchanged project and after editing, touching and deleting 1% of the assets: only
+new or changed assets (and the ones that failed) are exported again.
+
+Usage: python benchmarks/bench_blueprint_export.py [--assets 400] [--delay 0.05] [--jobs 0]
+"""
+import argparse
+import os
+import tempfile
+
+from _bench_utils import timed, load_baseline_module, write_file
+
+import UnrealForBP
+
+STANDIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uasset_exporter_standin.py')
+
+
+def fake_project(root, assets, healthy_only=False):
+    for a in range(assets):
+        name = f'BP_Asset{a}'
+        if not healthy_only and a % 100 == 1:
+            name += ('Broken', 'Hang', 'Flaky')[(a // 100) % 3]
+        write_file(os.path.join(root, 'Content', f'Folder{a % 20}', f'{name}.uasset'), 'x' * 256)
+    return root
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--assets', type=int, default=400)
+    parser.add_argument('--delay', type=float, default=0.05)
+    parser.add_argument('--jobs', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=2.0)
+    args = parser.parse_args()
+    os.environ['UASSET_STANDIN_DELAY'] = str(args.delay)
+    baseline = load_baseline_module('UnrealForBP')
+    baseline.UASSETAPI_CLI_EXE = STANDIN
+    with tempfile.TemporaryDirectory(prefix='uuml_bp_') as root:
+        healthy = fake_project(os.path.join(root, 'healthy'), args.assets, healthy_only=True)
+        t_old, _ = timed(baseline.batch_export_blueprints_to_json, healthy, os.path.join(root, 'out_old'), repeat=1)
+        print(f"  sequential (baseline): {t_old:7.2f} s  {args.assets / t_old:7.1f} assets/s  (healthy assets only)")
+        project = fake_project(os.path.join(root, 'project'), args.assets)
+        output = os.path.join(root, 'out_new')
+        t_new, summary = timed(UnrealForBP.batch_export_blueprints_to_json, project, output,
+                               jobs=args.jobs, exporter=[STANDIN], timeout=args.timeout, repeat=1)
+        print(f"  export pool:           {t_new:7.2f} s  {args.assets / t_new:7.1f} assets/s  "
+              f"({summary.exported} exported, {summary.failed} failed after retries, timeout {args.timeout} s)")
+        with open(os.path.join(output, 'log-error.txt'), encoding='utf-8') as f:
+            for line in f:
+                uasset, error = line.rstrip('\n').split('\t', 1)
+                print(f"    {os.path.basename(uasset)}: {error}")
+        # Incremental re-runs: unchanged, then with 1% of the assets edited, 1% touched and 1% deleted
+        t_rerun, summary = timed(UnrealForBP.batch_export_blueprints_to_json, project, output,
+                                 jobs=args.jobs, exporter=[STANDIN], timeout=args.timeout, repeat=1)
+        print(f"  unchanged re-run:      {t_rerun:7.2f} s  ({summary.skipped} skipped, {summary.exported} exported, "
+              f"{summary.failed} failed)")
+        assets = sorted(UnrealForBP.find_uasset_files(os.path.join(project, 'Content')))
+        for path in assets[2::100]:
+            write_file(path, 'y' * 256)
+        for path in assets[3::100]:
+            os.utime(path)
+        for path in assets[4::100]:
+            os.remove(path)
+        t_rerun, summary = timed(UnrealForBP.batch_export_blueprints_to_json, project, output,
+                                 jobs=args.jobs, exporter=[STANDIN], timeout=args.timeout, repeat=1)
+        print(f"  after edits re-run:    {t_rerun:7.2f} s  ({summary.skipped} skipped, {summary.exported} exported, "
+              f"{summary.failed} failed, {summary.pruned} pruned)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: CPPGenericUML header parsing on large generated headers (protobuf-style, up to 50k lines).
+
+Compares the baseline parse_headers_to_uml_json / extract_classes_from_cpp (per-class brace counting
+and content.find('};')) against the brace-match index. The time per line of the new parser should stay
+flat as the header grows.
+
+Usage: python benchmarks/bench_cpp_generic_parser.py [--lines 10000 25000 50000]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from _bench_utils import load_baseline_module, timed, write_file
+
+import CPPGenericUML
+from UmlModel import ENUM
+
+MESSAGE_TEMPLATE = '''
+class {name} final : public ::google::protobuf::Message {{
+ public:
+  {name}();
+  ~{name}() override;
+  // nested types ----------------------------------------------------
+  class {name}_Entry : public ::google::protobuf::Message {{
+   public:
+    const std::string& key() const {{ return key_; }}
+    void set_key(const std::string& value);
+    enum Kind : int {{
+      KIND_UNSPECIFIED = 0,
+      KIND_A = 1,
+      KIND_B = 2,
+    }};
+   private:
+    std::string key_;
+    int value_;
+  }};
+  static const {name}& default_instance();
+  int field_count() const {{ return count_; }}
+  void set_field_count(int value) {{ count_ = value; }}
+  bool IsInitialized() const;
+  void Clear();
+  size_t ByteSizeLong() const;
+ private:
+  int count_;
+  std::string name_;
+  {name}_Entry* entry_;
+}};
+'''
+
+
+def build_header(path, lines):
+    """Writes a protobuf-like header of roughly `lines` lines. Returns the number of messages."""
+    per_message = MESSAGE_TEMPLATE.count('\n')
+    count = max(1, lines // per_message)
+    parts = ['// Generated by the protocol buffer compiler.  DO NOT EDIT!\n#pragma once\n',
+             'namespace bench {\nnamespace proto {\n']
+    for i in range(count):
+        parts.append(MESSAGE_TEMPLATE.format(name=f'Message{i}'))
+    parts.append('}  // namespace proto\n}  // namespace bench\n')
+    write_file(path, ''.join(parts))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lines', type=int, nargs='+', default=[10000, 25000, 50000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    baseline = load_baseline_module('CPPGenericUML')
+    root = tempfile.mkdtemp(prefix='uuml_cpp_parse_')
+    try:
+        for lines in args.lines:
+            project = os.path.join(root, f'lines_{lines}')
+            path = os.path.join(project, 'generated.pb.h')
+            messages = build_header(path, lines)
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+            t_old, old_json = timed(baseline.parse_headers_to_uml_json, project, repeat=args.repeat)
+            t_old_extract, _ = timed(baseline.extract_classes_from_cpp, content, repeat=args.repeat)
+            t_new, new_model = timed(CPPGenericUML.parse_headers_to_model, project, repeat=args.repeat)
+            print(f"[{lines} lines] {messages} messages")
+            print(f"  baseline parse:                  {t_old * 1000:8.1f} ms  "
+                  f"{t_old * 1e6 / lines:6.2f} us/line  {len(old_json['classes'])} classes")
+            print(f"  baseline extract_classes_from_cpp: {t_old_extract * 1000:6.1f} ms")
+            print(f"  brace index parse:               {t_new * 1000:8.1f} ms  "
+                  f"{t_new * 1e6 / lines:6.2f} us/line  {sum(1 for e in new_model.entities() if e.kind != ENUM)} classes")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: C# extraction on a synthetic 5k-file solution.
+
+Compares the baseline CSharpUML.generate_uml_json (whole-file member regexes appended to every class,
+global used_names probing) against the scope-aware scanner with partial-class merging and
+per-namespace name counters. Also reports how many '_N' suffixed names each one produced.
+
+Usage: python benchmarks/bench_csharp_parser.py [--files 5000]
+"""
+import argparse
+import os
+import re
+import shutil
+import tempfile
+
+from _bench_utils import load_baseline_module, timed, write_file
+
+import CSharpUML
+from UmlModel import CLASS, STRUCT, INTERFACE, ATTRIBUTE, METHOD
+
+FILE_TEMPLATE = '''using System;
+using System.Collections.Generic;
+
+namespace Company.Module{module}
+{{
+    /// <summary>Generated service {i}.</summary>
+    [Serializable]
+    public partial class Service{pair} : ServiceBase, IService
+    {{
+        private readonly Dictionary<string, List<int>> _cache{i} = new Dictionary<string, List<int>>();
+        private int _counter{i};
+        public string Name{i} {{ get; set; }} = "service";
+        public event Action<int> Changed{i};
+
+        public void Start() {{ _counter{i} = 0; }}
+        public void Update() {{ if (_counter{i} > 10) {{ Changed{i}?.Invoke(_counter{i}); }} }}
+        public void Dispose() {{ _cache{i}.Clear(); }}
+        public int Compute{i}(int a, int b) => a + b;
+        protected virtual T Resolve{i}<T>(string key) where T : class => default;
+    }}
+
+    public class Model{i}
+    {{
+        public int Id;
+        public string Label;
+        public float Value {{ get; set; }}
+        public override string ToString() {{ return Label; }}
+        public void Update() {{ }}
+
+        public enum Kind {{ None, First, Second }}
+    }}
+}}
+'''
+
+SHARED_TEMPLATE = '''namespace Company.Module{module}
+{{
+    public interface IService {{ void Start(); void Update(); }}
+    public abstract class ServiceBase {{ public abstract void Dispose(); }}
+}}
+'''
+
+
+def build_solution(root, files, modules=50):
+    for module in range(modules):
+        write_file(os.path.join(root, f'Module{module}', 'Shared.cs'), SHARED_TEMPLATE.format(module=module))
+    for i in range(files - modules):
+        module = i % modules
+        # Every pair of files contributes to the same partial class
+        write_file(os.path.join(root, f'Module{module}', f'Service{i}.cs'),
+                   FILE_TEMPLATE.format(module=module, i=i, pair=i // (2 * modules)))
+
+
+def as_lists(model):
+    """The baseline's {'classes', 'interfaces'} shape of a UmlModel, for side-by-side counts."""
+    def entry(entity):
+        return {'name': entity.name, 'methods': entity.member_names(METHOD),
+                'attributes': entity.member_names(ATTRIBUTE)}
+    return {'classes': [entry(e) for e in model.entities() if e.kind in (CLASS, STRUCT)],
+            'interfaces': [entry(e) for e in model.entities(INTERFACE)]}
+
+
+def suffixed_names(uml_json):
+    pattern = re.compile(r'_\d+$')
+    names = []
+    for entity in uml_json['classes'] + uml_json['interfaces']:
+        names.append(entity['name'])
+        names.extend(entity.get('methods', []))
+        names.extend(entity.get('attributes', []))
+    return sum(1 for name in names if pattern.search(name))
+
+
+def members_per_class(uml_json):
+    classes = uml_json['classes']
+    total = sum(len(c['methods']) + len(c['attributes']) for c in classes)
+    return total / len(classes) if classes else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    baseline = load_baseline_module('CSharpUML')
+    root = tempfile.mkdtemp(prefix='uuml_cs_parse_')
+    try:
+        build_solution(root, args.files)
+        t_old, old_json = timed(baseline.generate_uml_json, root, repeat=args.repeat)
+        t_new, new_model = timed(CSharpUML.generate_model, root, repeat=args.repeat)
+        new_json = as_lists(new_model)
+        print(f"[{args.files} files]")
+        print(f"  baseline:     {t_old:7.2f} s  {len(old_json['classes'])} classes, "
+              f"{members_per_class(old_json):.0f} members/class, {suffixed_names(old_json)} suffixed names")
+        print(f"  scope-aware:  {t_new:7.2f} s  {len(new_json['classes'])} classes, "
+              f"{members_per_class(new_json):.0f} members/class, {suffixed_names(new_json)} suffixed names")
+        print(f"  speedup: {t_old / t_new:.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
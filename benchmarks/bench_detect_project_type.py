@@ -0,0 +1,59 @@
+"""
+Benchmark: project type detection on a synthetic 100k-file tree.
+
+Compares the baseline detect_project_type (several os.walk passes) against the
+single os.scandir pass of UumlCentralApp.classify_project.
+
+Usage: python benchmarks/bench_detect_project_type.py [--files 100000] [--repeat 3]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from _bench_utils import load_baseline_module, timed, write_file
+
+import UumlCentralApp
+
+
+def build_tree(root, total_files, layout):
+    """Creates a synthetic project with `total_files` files spread over nested directories."""
+    per_dir = 50
+    if layout == 'unreal':
+        write_file(os.path.join(root, 'Game.uproject'), '{}')
+        write_file(os.path.join(root, 'Source', 'Game', 'Game.h'), '')
+        # Plugins, Content and Intermediate dominate a real Unreal tree
+        bulk = [('Content', '.uasset'), ('Intermediate', '.h'), ('Plugins', '.cpp')]
+    else:
+        bulk = [('pkg', '.py'), ('data', '.json'), ('docs', '.md')]
+    for i in range(total_files):
+        top, ext = bulk[i % len(bulk)]
+        d = os.path.join(root, top, f'd{(i // per_dir) % 40}', f'sub{i // (per_dir * 40)}')
+        os.makedirs(d, exist_ok=True)
+        open(os.path.join(d, f'f{i}{ext}'), 'w').close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    baseline = load_baseline_module('UumlCentralApp')
+    for layout in ('unreal', 'python'):
+        root = tempfile.mkdtemp(prefix=f'uuml_detect_{layout}_')
+        try:
+            build_tree(root, args.files, layout)
+            t_old, old_type = timed(baseline.detect_project_type, root, repeat=args.repeat)
+            t_new, info = timed(UumlCentralApp.classify_project, root, repeat=args.repeat)
+            print(f"[{layout}] {args.files} files")
+            print(f"  baseline detect_project_type: {t_old * 1000:8.1f} ms -> {old_type}")
+            print(f"  classify_project:             {t_new * 1000:8.1f} ms -> {info['type']} "
+                  f"(confidence {info['confidence']:.2f}, {info['files_scanned']} files scanned, "
+                  f"{'full scan' if info['complete'] else 'early exit'})")
+            print(f"  speedup: {t_old / t_new:.1f}x")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
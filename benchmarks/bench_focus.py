@@ -0,0 +1,51 @@
+"""
+Benchmark: --focus neighborhood extraction on a 100k-entity model.
+
+The model is the parsed CodeExamples/UnrealProject replicated under new ids (as in
+bench_snapshot_load.py), with the copies chained by inheritance so deep neighborhoods keep growing.
+Times building the relation index once, the BFS + sub-model extraction for a few depths and
+directions, and the PUML emission of the focused model against the full one.
+
+Usage: python benchmarks/bench_focus.py [--entities 100000] [--focus ACharacter_4]
+"""
+import argparse
+import os
+import tempfile
+
+from _bench_utils import timed
+from bench_snapshot_load import EXAMPLE_PROJECT, replicated_model
+
+import CPPForUnrealEngine
+from ModelFocus import Focus, RelationIndex, focus_model
+from UmlModel import EXTENDS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entities', type=int, default=100000)
+    parser.add_argument('--focus', default='ACharacter_4')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    model = replicated_model(args.entities)
+    copies = -(-len(model) // len(CPPForUnrealEngine.parse_unreal_headers_to_model(EXAMPLE_PROJECT)))
+    for copy in range(1, copies):
+        model.add_relation(EXTENDS, f'ACharacter_{copy}', f'ACharacter_{copy - 1}')
+    print(f"[{len(model)} entities, {len(model.relation_kind)} relations]")
+    t_index, index = timed(RelationIndex, model, repeat=args.repeat)
+    print(f"  relation index build           {t_index * 1000:9.2f} ms")
+    for depth in (1, 2, 4, 8):
+        for direction in ('up', 'down', 'both'):
+            focus = Focus(args.focus, depth, direction)
+            elapsed, sub = timed(focus_model, model, focus, index, repeat=args.repeat)
+            print(f"  focus depth {depth} {direction:5}            {elapsed * 1000:9.2f} ms  {len(sub):6} entities")
+    sub = focus_model(model, Focus(args.focus, 2, 'both'), index)
+    with tempfile.TemporaryDirectory(prefix='uuml_focus_') as root:
+        puml_path = os.path.join(root, 'UML_ClassDiagram.puml')
+        t_sub, _ = timed(CPPForUnrealEngine.generate_puml_from_model, sub, output_file=puml_path, repeat=args.repeat)
+        t_full, _ = timed(CPPForUnrealEngine.generate_puml_from_model, model, output_file=puml_path, repeat=1)
+    print(f"  PUML of the depth-2 focus      {t_sub * 1000:9.2f} ms")
+    print(f"  PUML of the full model         {t_full * 1000:9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark: implicit Go interface satisfaction on 20k types x 2k interfaces.
+
+Compares a pairwise check (every interface against every type's method set) with the inverted
+(method, signature) -> types index used by GoUML.implemented_interfaces. Both must find the same
+implementations. First checks the resolver end to end on a small Go package whose parameter names
+differ between interfaces and implementations (slice, array, variadic and generic parameters) and
+whose methods are split between value and pointer receivers, and a struct whose slice and array
+fields must not be read as embedded types.
+
+Usage: python benchmarks/bench_go_interface_resolver.py [--types 20000] [--interfaces 2000]
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from _bench_utils import timed, write_file
+
+import GoUML
+
+
+def build_method_sets(types, interfaces, vocabulary=5000, seed=7):
+    """Random method sets over a shared vocabulary; every interface is a subset of some type."""
+    rng = random.Random(seed)
+    methods = [(f'M{i}', f'(pkg.T{i % 50})(error)') for i in range(vocabulary)]
+    method_sets = {}
+    for t in range(types):
+        method_sets[('pkg', f'Type{t}')] = dict(rng.sample(methods, rng.randint(3, 12)))
+    interface_methods = {}
+    keys = list(method_sets)
+    for i in range(interfaces):
+        source = method_sets[rng.choice(keys)]
+        picked = rng.sample(sorted(source.items()), rng.randint(1, min(3, len(source))))
+        interface_methods[('pkg', f'Iface{i}')] = dict(picked)
+    return method_sets, interface_methods
+
+
+# Interfaces and implementations whose parameter names differ; expected IMPLEMENTS relations
+SIGNATURES_GO = """package sig
+
+type List[T any] struct{ items []T }
+
+type Writer interface{ Write(b []byte) (int, error) }
+type Hasher interface{ Sum(block [16]byte) [32]byte }
+type Logger interface{ Log(format string, args ...any) }
+type Merger interface{ Merge(l List[int]) List[int] }
+type Closer interface{ Close() error }
+type WriteCloser interface {
+	Writer
+	Close() error
+}
+
+type Buf struct{ data []byte }
+
+func (x Buf) Write(p []byte) (n int, err error) { return len(p), nil }
+func (x Buf) Sum(in [16]byte) (out [32]byte)    { return }
+func (x Buf) Log(f string, values ...any)       {}
+func (x Buf) Merge(other List[int]) List[int]   { return other }
+
+type File struct{ name string }
+
+func (f File) Write(data []byte) (int, error) { return len(data), nil }
+func (f *File) Close() error                  { return nil }
+
+type Wrapper struct{ *File }
+type Holder struct{ File }
+
+// Slice and array fields named after project types: fields, not embeds
+type Node struct {
+	Next *Node
+	File [4]byte
+	Buf  []Buf
+	data []byte
+	name string
+}
+"""
+EXPECTED_IMPLEMENTS = {
+    ('sig.Buf', 'sig.Writer', ''), ('sig.Buf', 'sig.Hasher', ''), ('sig.Buf', 'sig.Logger', ''),
+    ('sig.Buf', 'sig.Merger', ''), ('sig.File', 'sig.Writer', ''), ('sig.File', 'sig.Closer', '*File'),
+    ('sig.File', 'sig.WriteCloser', '*File'), ('sig.Wrapper', 'sig.Writer', ''),
+    ('sig.Wrapper', 'sig.Closer', ''), ('sig.Wrapper', 'sig.WriteCloser', ''),
+    ('sig.Holder', 'sig.Writer', ''), ('sig.Holder', 'sig.Closer', '*Holder'),
+    ('sig.Holder', 'sig.WriteCloser', '*Holder'),
+}
+
+EXPECTED_FIELDS = {'sig.Node': ['Next', 'File', 'Buf', 'data', 'name']}
+
+
+def check_go_source():
+    """Resolves SIGNATURES_GO with GoUML and compares its IMPLEMENTS relations with the expected ones."""
+    with tempfile.TemporaryDirectory(prefix='uuml_go_') as root:
+        go_file = os.path.join(root, 'sig', 'sig.go')
+        write_file(go_file, SIGNATURES_GO)
+        model = GoUML.merge_uml_json([(go_file, GoUML.extract_go_structs_and_interfaces(go_file))])
+    for struct_id, fields in EXPECTED_FIELDS.items():
+        found = model.find(struct_id).member_names(GoUML.ATTRIBUTE)
+        assert found == fields, f'{struct_id} fields {found}, expected {fields}'
+    found = {(source, target, label) for kind, source, target, label in model.relations()
+             if kind == GoUML.IMPLEMENTS}
+    assert found == EXPECTED_IMPLEMENTS, (f'missing {sorted(EXPECTED_IMPLEMENTS - found)}, '
+                                          f'unexpected {sorted(found - EXPECTED_IMPLEMENTS)}')
+    compositions = [(source, target) for _, source, target, _ in model.relations(GoUML.COMPOSITION)]
+    assert not any(source == 'sig.Node' for source, _ in compositions), f'Node compositions {compositions}'
+    print(f"[Go source check] {len(found)} implementations resolved as expected")
+
+
+def pairwise(method_sets, interface_methods):
+    result = {}
+    for iface, methods in interface_methods.items():
+        matched = [key for key, own in method_sets.items()
+                   if all(own.get(name) == sig for name, sig in methods.items())]
+        if matched:
+            result[iface] = sorted(matched)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--types', type=int, default=20000)
+    parser.add_argument('--interfaces', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    check_go_source()
+    method_sets, interface_methods = build_method_sets(args.types, args.interfaces)
+    t_old, old = timed(pairwise, method_sets, interface_methods, repeat=args.repeat)
+    t_new, new = timed(GoUML.implemented_interfaces, method_sets, interface_methods, repeat=args.repeat)
+    assert old == new, 'index and pairwise check disagree'
+    pairs = sum(len(v) for v in new.values())
+    print(f"[{args.types} types x {args.interfaces} interfaces] {pairs} implementations")
+    print(f"  pairwise:       {t_old:7.2f} s")
+    print(f"  inverted index: {t_new:7.2f} s")
+    print(f"  speedup: {t_old / t_new:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: the interactive HTML viewer of a 50k-entity model.
+
+The model is the parsed CodeExamples/UnrealProject replicated under new ids (as in
+bench_snapshot_load.py), with the copies spread over --modules namespaces (as in bench_pages.py).
+Times the generation of the page (per-namespace layout, spatial index, JSON) and reports the page
+size, the grid and what opening the page costs: parsing the embedded JSON, and the number of boxes
+looked up for a full-window viewport at member zoom (the most the viewer ever draws at that zoom).
+
+Usage: python benchmarks/bench_html_viewer.py [--entities 50000] [--modules 64]
+"""
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+
+from _bench_utils import timed
+from bench_pages import with_modules
+from bench_snapshot_load import replicated_model
+
+from HtmlViewer import write_html_viewer
+
+VIEWPORT = (1920 / 0.6, 1080 / 0.6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entities', type=int, default=50000)
+    parser.add_argument('--modules', type=int, default=64)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    model = with_modules(replicated_model(args.entities), args.modules)
+    print(f"[{len(model)} entities, {len(model.relation_kind)} relations, {args.modules} modules]")
+    with tempfile.TemporaryDirectory(prefix='uuml_html_') as root:
+        html_path = os.path.join(root, 'diagram.html')
+        t_write, _ = timed(write_html_viewer, model, html_path, repeat=args.repeat)
+        with open(html_path, encoding='utf-8') as f:
+            html = f.read()
+    print(f"  generate viewer     {t_write:6.2f} s  HTML {len(html) / 2**20:.1f} MB")
+    text = re.search(r'<script id="uuml-data" type="application/json">(.*?)</script>', html, re.S).group(1)
+    start = time.perf_counter()
+    data = json.loads(text)
+    print(f"  parse embedded JSON {time.perf_counter() - start:6.2f} s  (the browser does this once on open)")
+    cell = data['cell']
+    buckets = [len(row) - 2 for row in data['grid']]
+    print(f"  spatial index       {len(buckets)} cells of {cell} px, {sum(buckets) / len(buckets):.1f} boxes/cell, "
+          f"max {max(buckets)}")
+    # Boxes looked up for the worst viewport: the cells it covers with the most boxes
+    across = int(VIEWPORT[0] // cell) + 2
+    down = int(VIEWPORT[1] // cell) + 2
+    counts = {(row[0], row[1]): len(row) - 2 for row in data['grid']}
+    worst = max(sum(counts.get((cx + i, cy + j), 0) for i in range(across) for j in range(down))
+                for cx, cy in counts)
+    print(f"  drawn when close    <= {worst} boxes per frame ({across} x {down} cells), of {len(model)}")
+
+
+if __name__ == '__main__':
+    main()
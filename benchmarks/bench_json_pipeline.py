@@ -0,0 +1,84 @@
+"""
+Benchmark: non-render pipeline time with and without the JSON round trip.
+
+On a scaled-up copy of CodeExamples/UnrealProject (parsed once, up front), times what main() does
+between parsing and rendering:
+  - round trip: json.dump(indent=2) of the model, json.load of the file, then the PUML (the old main)
+  - background JSON: compact streaming JSON on a thread while the PUML is generated from the model
+  - --no-json: the PUML from the model only
+and the peak traced memory of each mode.
+
+Usage: python benchmarks/bench_json_pipeline.py [--copies 200]
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+from _bench_utils import timed
+from bench_unreal_header_parser import build_project
+
+import CPPForUnrealEngine
+from ModelExport import export_artifacts
+from UmlModel import UmlModel
+
+
+def read_text(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def round_trip(model, root):
+    json_file = os.path.join(root, 'UML_ClassDiagram.json')
+    with open(json_file, 'w', encoding='utf-8') as jf:
+        json.dump(model.to_dict(), jf, indent=2, ensure_ascii=False)
+    with open(json_file, 'r', encoding='utf-8') as f:
+        model = UmlModel.from_dict(json.load(f))
+    return read_text(CPPForUnrealEngine.generate_puml_from_model(model, root))
+
+
+def background_json(model, root):
+    export = export_artifacts(model, root, 'UML_ClassDiagram', with_snapshot=False)
+    puml_path = CPPForUnrealEngine.generate_puml_from_model(model, root)
+    export.join()
+    return read_text(puml_path)
+
+
+def no_json(model, root):
+    return read_text(CPPForUnrealEngine.generate_puml_from_model(model, root))
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--copies', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    root = tempfile.mkdtemp(prefix='uuml_json_pipeline_')
+    try:
+        build_project(root, args.copies, 1)
+        model = CPPForUnrealEngine.parse_unreal_headers_to_model(root)
+        print(f"[{len(model)} entities, {len(model.member_kind)} members]")
+        results = {}
+        for label, func in (('round trip', round_trip), ('background JSON', background_json), ('--no-json', no_json)):
+            elapsed, puml = timed(func, model, root, repeat=args.repeat)
+            results[label] = puml
+            size = os.path.getsize(os.path.join(root, 'UML_ClassDiagram.json')) if label != '--no-json' else 0
+            print(f"  {label:16} {elapsed:6.2f} s  peak {peak_memory(func, model, root) / 2**20:7.1f} MB"
+                  + (f"  JSON {size / 2**20:.1f} MB" if size else ''))
+        assert len(set(results.values())) == 1, 'the modes produced different PUML'
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: diagram size and render time with and without member level of detail.
+
+Builds a synthetic Unreal-like project as a model: --classes classes with --properties UPROPERTY
+attributes (a third of them protected or private) and --accessors GetX/SetX pairs each, chained by
+inheritance, plus --enums generated enums of --values values. The diagram is emitted and rendered
+with every member, then with the ModelDetail policy (--max-members, public-only, accessor
+collapsing, --max-enum-values). Reports PUML size, render time and SVG size for each. Rendering uses
+the native renderer; PlantUML is timed as well when Java and plantuml.jar are available.
+
+Usage: python benchmarks/bench_member_detail.py [--classes 200] [--properties 300] [--enums 20] [--values 2000]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from _bench_utils import timed
+
+import CPPForUnrealEngine
+from ModelDetail import make_detail, apply_detail
+from NativeRenderer import render_model
+from PlantUMLServer import PlantUMLServer, plantuml_jar_path
+from UmlModel import UmlModel, CLASS, ENUM, ATTRIBUTE, METHOD, VALUE, EXTENDS
+
+
+def synthetic_model(classes, properties, accessors, enums, values):
+    model = UmlModel()
+    for c in range(classes):
+        model.add_entity(f'AGenerated{c}', CLASS, namespace='Game', stereotype='Class')
+        for p in range(properties):
+            model.add_member(ATTRIBUTE, f'Property{p}', 'float', visibility=p % 3 if p % 2 else 0)
+        for a in range(accessors):
+            model.add_member(METHOD, f'GetValue{a}', 'float')
+            model.add_member(METHOD, f'SetValue{a}', 'void', 'float')
+        model.add_member(METHOD, 'BeginPlay', 'void', visibility=1)
+        model.add_member(METHOD, 'Tick', 'void', 'float', 0)
+    for e in range(enums):
+        model.add_entity(f'EGenerated{e}', ENUM, namespace='Game', stereotype='Enum')
+        for v in range(values):
+            model.add_member(VALUE, f'Value{v}')
+    for c in range(1, classes):
+        model.add_relation(EXTENDS, f'AGenerated{c}', f'AGenerated{(c - 1) // 2}')
+    return model
+
+
+def measure(label, diagram, root, server, repeat):
+    puml = os.path.join(root, f'{label}.puml')
+    t_emit, _ = timed(CPPForUnrealEngine.generate_puml_from_model, diagram, output_file=puml, repeat=repeat)
+    svg = os.path.join(root, f'{label}.svg')
+    t_native, _ = timed(render_model, diagram, svg, repeat=repeat)
+    line = (f"  {label:<7} PUML {os.path.getsize(puml) / 2**20:6.2f} MB in {t_emit:5.2f} s | native render "
+            f"{t_native:6.2f} s, SVG {os.path.getsize(svg) / 2**20:6.2f} MB")
+    if server is not None:
+        os.remove(svg)
+        t_plantuml, result = timed(lambda: server.submit(puml).result(), repeat=1)
+        size = f"{os.path.getsize(result) / 2**20:.2f} MB" if result else 'not generated'
+        line += f" | PlantUML {t_plantuml:6.2f} s, SVG {size}"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--classes', type=int, default=200)
+    parser.add_argument('--properties', type=int, default=300)
+    parser.add_argument('--accessors', type=int, default=20)
+    parser.add_argument('--enums', type=int, default=20)
+    parser.add_argument('--values', type=int, default=2000)
+    parser.add_argument('--max-members', type=int, default=20)
+    parser.add_argument('--max-enum-values', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    model = synthetic_model(args.classes, args.properties, args.accessors, args.enums, args.values)
+    print(f"[{len(model)} entities, {len(model.member_kind)} members]")
+    detail = make_detail(args.max_members, True, True, args.max_enum_values)
+    root = tempfile.mkdtemp(prefix='uuml_detail_')
+    server = None
+    if shutil.which('java') is not None and os.path.exists(plantuml_jar_path()):
+        server = PlantUMLServer()
+    try:
+        measure('full', model, root, server, args.repeat)
+        diagram = apply_detail(model, detail, os.path.join(root, 'members.txt'))
+        measure('detail', diagram, root, server, args.repeat)
+        if server is None:
+            print("  (PlantUML not timed: needs Java and plantuml.jar)")
+    finally:
+        if server is not None:
+            server.close()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: memory held by the Unreal model on a ~100k-entity project.
+
+Parses renamed copies of the CodeExamples/UnrealProject headers, then measures with tracemalloc
+the per-header dicts the backend used to keep (classes/interfaces/enums with member and relation
+dicts, after association resolution) against the UmlModel built from them (interned symbols and
+array-backed tables). The target is a model of at most a third of the dicts.
+
+Usage: python benchmarks/bench_model_memory.py [--entities 100000]
+"""
+import argparse
+import gc
+import glob
+import json
+import os
+import tracemalloc
+
+from _bench_utils import REPO_ROOT
+
+import CPPForUnrealEngine
+from UnrealHeaderScanner import scan_header
+
+EXAMPLE_SOURCE = os.path.join(REPO_ROOT, 'CodeExamples', 'UnrealProject', 'Source')
+
+
+def parsed_headers(entities):
+    """JSON payloads of parsed headers (as the parse cache stores them) totalling about `entities` entities."""
+    headers = []
+    for path in sorted(glob.glob(os.path.join(EXAMPLE_SOURCE, '**', '*.h'), recursive=True)):
+        with open(path, encoding='utf-8') as f:
+            headers.append(f.read())
+    payloads = []
+    total = 0
+    copy = 0
+    while total < entities:
+        for content in headers:
+            header = scan_header(content.replace('_API A', f'_API AC{copy}'))
+            total += len(header['classes']) + len(header['interfaces']) + len(header['enums'])
+            payloads.append(json.dumps(header))
+        copy += 1
+    return payloads, total
+
+
+def traced():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entities', type=int, default=100000)
+    args = parser.parse_args()
+    payloads, total = parsed_headers(args.entities)
+    tracemalloc.start()
+    base = traced()
+    # Fresh string objects per header, as parse results arriving from workers or the cache have
+    header_data = [(f'Header{i}.h', json.loads(payload)) for i, payload in enumerate(payloads)]
+    del payloads
+    model = CPPForUnrealEngine.build_model(header_data)
+    del model
+    dict_bytes = traced() - base
+    model = CPPForUnrealEngine.merge_headers(header_data)
+    del header_data
+    model_bytes = traced() - base
+    tracemalloc.stop()
+    members = len(model.member_kind)
+    print(f"[{total} entities, {members} members, {len(model.relation_kind)} relations, "
+          f"{len(model.symbols)} distinct symbols]")
+    print(f"  dicts:    {dict_bytes / 2**20:8.1f} MB  {dict_bytes / total:7.0f} B/entity")
+    print(f"  UmlModel: {model_bytes / 2**20:8.1f} MB  {model_bytes / total:7.0f} B/entity")
+    print(f"  ratio: {model_bytes / dict_bytes:.2f} (target <= 0.33)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: the native (Java-free) renderer on a 5k-entity diagram.
+
+The model is the parsed CodeExamples/UnrealProject replicated under new ids (as in
+bench_snapshot_load.py), with the copies chained by inheritance so most classes end up in one large
+connected component. Times the layered layout alone and the whole render (box sizing, layout and
+SVG writing), and reports the layout size and SVG size. PlantUML is not needed.
+
+Usage: python benchmarks/bench_native_renderer.py [--entities 5000]
+"""
+import argparse
+import os
+import tempfile
+
+from _bench_utils import timed
+from bench_snapshot_load import EXAMPLE_PROJECT, replicated_model
+
+import CPPForUnrealEngine
+from LayeredLayout import layered_layout
+from NativeRenderer import box_lines, box_size, render_model
+from UmlModel import EXTENDS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entities', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    model = replicated_model(args.entities)
+    copies = -(-len(model) // len(CPPForUnrealEngine.parse_unreal_headers_to_model(EXAMPLE_PROJECT)))
+    for copy in range(1, copies):
+        model.add_relation(EXTENDS, f'ACharacter_{copy}', f'AGameObject_{copy - 1}')
+    print(f"[{len(model)} entities, {len(model.relation_kind)} relations]")
+    sizes = [box_size(*box_lines(entity)) for entity in model.entities()]
+    index_of = {entity.id: e for e, entity in enumerate(model.entities())}
+    edges = [(index_of[target], index_of[source]) for _, source, target, _ in model.relations()
+             if source in index_of and target in index_of]
+    t_layout, layout = timed(layered_layout, sizes, edges, repeat=args.repeat)
+    print(f"  layered layout      {t_layout:6.2f} s  {len(edges)} edges, {layout.width:.0f} x {layout.height:.0f} px")
+    with tempfile.TemporaryDirectory(prefix='uuml_native_') as root:
+        svg_path = os.path.join(root, 'diagram.svg')
+        t_render, _ = timed(render_model, model, svg_path, repeat=args.repeat)
+        print(f"  full native render  {t_render:6.2f} s  SVG {os.path.getsize(svg_path) / 2**20:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: partitioning a 100k-entity model into bounded PUML pages.
+
+The model is the parsed CodeExamples/UnrealProject replicated under new ids (as in
+bench_snapshot_load.py), with each copy assigned to one of --modules namespaces. Times the
+partition and the emission of every page plus the index, and reports the page count and the
+largest page (entities, relations, PUML size): the layout work PlantUML gets per page stays
+bounded whatever the model size.
+
+Usage: python benchmarks/bench_pages.py [--entities 100000] [--max-nodes 150] [--modules 64]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from _bench_utils import timed
+from bench_snapshot_load import replicated_model
+
+import CPPForUnrealEngine
+from ModelPages import make_paging, partition, write_pages
+from UmlModel import UmlModel, Entity
+
+
+def with_modules(model, modules):
+    """Copy of `model` whose namespaces are Module<n>, n taken from the copy suffix of the id."""
+    result = UmlModel()
+    for e in range(len(model)):
+        entity = Entity(model, e)
+        copy = int(entity.id.rsplit('_', 1)[1])
+        result.add_entity(entity.id, entity.kind, entity.name, f'Module{copy % modules}', entity.stereotype,
+                          entity.template)
+        for m in entity.members():
+            result.add_member(m.kind, m.name, m.type, m.params, m.visibility)
+    for kind, source, target, label in model.relations():
+        result.add_relation(kind, source, target, label)
+    return result
+
+
+def write_page(page, path):
+    return CPPForUnrealEngine.generate_puml_from_model(page, output_file=path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entities', type=int, default=100000)
+    parser.add_argument('--max-nodes', type=int, default=150)
+    parser.add_argument('--modules', type=int, default=64)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    paging = make_paging(args.max_nodes)
+    flat = replicated_model(args.entities)
+    structured = with_modules(flat, args.modules)
+    root = tempfile.mkdtemp(prefix='uuml_pages_')
+    try:
+        print(f"[{len(flat)} entities, {len(flat.relation_kind)} relations, "
+              f"at most {paging.max_nodes} entities / {paging.max_edges} relations per page]")
+        for label, model in ((f'{args.modules} modules', structured), ('no structure', flat)):
+            t_partition, pages = timed(partition, model, paging, repeat=args.repeat)
+            t_write, (_, paths) = timed(write_pages, model, os.path.join(root, label.replace(' ', '_')),
+                                        write_page, paging, 'Benchmark', repeat=1)
+            largest = max(os.path.getsize(path) for path in paths)
+            print(f"  {label:14} partition {t_partition * 1000:8.1f} ms, partition + write {t_write:6.2f} s, "
+                  f"{len(pages)} pages, largest {max(len(p.entities) for p in pages)} entities / "
+                  f"{max(p.edges for p in pages)} relations / {largest / 1024:.0f} KB")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: streaming the Unreal PUML into the file vs building it in memory and printing it.
+
+The model is the parsed CodeExamples/UnrealProject replicated under new ids (as in
+bench_snapshot_load.py). Compares, for the same PUML text:
+  - in memory: the lines joined into one string, printed to the console, then written (the old main)
+  - in memory, no print: the same without the console dump
+  - streamed: generate_puml_from_model, lines written through the buffered PumlWriter
+and the peak traced memory of each. The console is --console (default os.devnull, the best case:
+a real Windows console or CI log is much slower).
+
+Usage: python benchmarks/bench_puml_stream.py [--entities 100000] [--console /dev/null]
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+from _bench_utils import timed
+from bench_snapshot_load import replicated_model
+
+import CPPForUnrealEngine
+
+
+def in_memory(model, path, console=None):
+    puml = '\n'.join(CPPForUnrealEngine.iter_puml_from_model(model))
+    if console is not None:
+        with open(console, 'w', encoding='utf-8') as out, contextlib.redirect_stdout(out):
+            print(puml)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(puml)
+    return path
+
+
+def streamed(model, path):
+    return CPPForUnrealEngine.generate_puml_from_model(model, output_file=path)
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entities', type=int, default=100000)
+    parser.add_argument('--console', default=os.devnull)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    model = replicated_model(args.entities)
+    root = tempfile.mkdtemp(prefix='uuml_puml_stream_')
+    try:
+        paths = {}
+        modes = (('in memory + print', in_memory, (args.console,)), ('in memory', in_memory, ()),
+                 ('streamed', streamed, ()))
+        for label, func, extra in modes:
+            path = os.path.join(root, label.replace(' ', '_') + '.puml')
+            elapsed, _ = timed(func, model, path, *extra, repeat=args.repeat)
+            peak = peak_memory(func, model, path, *extra)
+            paths[label] = path
+            print(f"  {label:18} {elapsed:6.2f} s  peak {peak / 2**20:7.1f} MB")
+        size = os.path.getsize(paths['streamed'])
+        print(f"[{len(model)} entities, PUML {size / 2**20:.1f} MB]")
+        texts = set()
+        for path in paths.values():
+            with open(path, 'r', encoding='utf-8') as f:
+                texts.add(f.read())
+        assert len(texts) == 1, 'the modes produced different PUML'
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
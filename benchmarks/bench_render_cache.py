@@ -0,0 +1,78 @@
+"""
+Benchmark: render cache lookups on a paged diagram after a one-class edit.
+
+The model is the parsed CodeExamples/UnrealProject replicated under new ids (as in
+bench_snapshot_load.py), split into --modules namespaces and written as bounded pages. A first pass
+renders every page into an empty cache; then one member is added to one class, the pages are
+rewritten and a second pass only re-renders the pages whose PUML changed. Rendering is simulated
+(a fixed --render-ms per page, the warm cost of one diagram in the PlantUML server) so the benchmark
+runs without Java; the hashing, lookup and hardlinking are the real RenderCache code.
+
+Usage: python benchmarks/bench_render_cache.py [--entities 20000] [--max-nodes 150] [--render-ms 150]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from bench_pages import with_modules, write_page
+from bench_snapshot_load import replicated_model
+
+from ModelPages import make_paging, page_files, write_pages
+from PlantUMLServer import plantuml_jar_path
+from RenderCache import RenderCache
+from UmlModel import METHOD
+
+
+def render_pass(cache, paths, render_ms):
+    """Cache lookup per page, simulated render + store on a miss. Returns (seconds, renders)."""
+    jar = plantuml_jar_path()
+    renders = 0
+    start = time.perf_counter()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            key = cache.key(f.read(), jar)
+        svg_path = os.path.splitext(path)[0] + '.svg'
+        if cache.fetch(key, svg_path):
+            continue
+        time.sleep(render_ms / 1000)
+        with open(svg_path, 'w', encoding='utf-8') as f:
+            f.write(f'<svg><!-- {key} --></svg>')
+        cache.store(key, svg_path)
+        renders += 1
+    return time.perf_counter() - start, renders
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entities', type=int, default=20000)
+    parser.add_argument('--max-nodes', type=int, default=150)
+    parser.add_argument('--modules', type=int, default=64)
+    parser.add_argument('--render-ms', type=float, default=150.0)
+    args = parser.parse_args()
+    paging = make_paging(args.max_nodes)
+    model = with_modules(replicated_model(args.entities), args.modules)
+    root = tempfile.mkdtemp(prefix='uuml_render_cache_')
+    try:
+        cache = RenderCache(os.path.join(root, 'cache'))
+        pages_dir = os.path.join(root, 'pages')
+        index_path, _ = write_pages(model, pages_dir, write_page, paging, 'Benchmark')
+        paths = page_files(index_path)
+        print(f"[{len(model)} entities, {len(paths)} diagrams, simulated render {args.render_ms:.0f} ms each]")
+        t_cold, renders = render_pass(cache, paths, args.render_ms)
+        print(f"  cold cache                     {t_cold:8.2f} s  {renders:5} renders")
+        t_warm, renders = render_pass(cache, paths, args.render_ms)
+        print(f"  unchanged rerun                {t_warm:8.2f} s  {renders:5} renders")
+        # One edit: a new method on the last class of the model
+        model.add_member(METHOD, 'BenchmarkEdit', 'void')
+        index_path, _ = write_pages(model, pages_dir, write_page, paging, 'Benchmark')
+        t_edit, renders = render_pass(cache, page_files(index_path), args.render_ms)
+        print(f"  after a one-class edit         {t_edit:8.2f} s  {renders:5} renders")
+        cache.report(cache.evict())
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: rendering many diagrams with one JVM per diagram vs the persistent PlantUML server.
+
+Writes --diagrams small class diagrams (pages of the CodeExamples/UnrealProject model) and renders
+them with the one-shot `java -jar plantuml.jar -tsvg` path and through PlantUMLServer (-pipe mode,
+one JVM for all of them). Needs Java and src/plantuml.jar (or --java / --jar).
+
+Usage: python benchmarks/bench_render_server.py [--diagrams 20] [--java java] [--jar src/plantuml.jar]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from _bench_utils import REPO_ROOT
+
+import CPPForUnrealEngine
+from ModelPages import make_paging, write_pages
+from PlantUMLServer import PlantUMLServer, plantuml_jar_path, render_one_shot
+
+EXAMPLE_PROJECT = os.path.join(REPO_ROOT, 'CodeExamples', 'UnrealProject')
+
+
+def write_page(page, path):
+    return CPPForUnrealEngine.generate_puml_from_model(page, output_file=path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--diagrams', type=int, default=20)
+    parser.add_argument('--java', default='java')
+    parser.add_argument('--jar', default=plantuml_jar_path())
+    args = parser.parse_args()
+    if shutil.which(args.java) is None or not os.path.exists(args.jar):
+        print(f"[skipped] needs Java ({args.java}) and PlantUML ({args.jar})")
+        return
+    model = CPPForUnrealEngine.parse_unreal_headers_to_model(EXAMPLE_PROJECT)
+    root = tempfile.mkdtemp(prefix='uuml_render_')
+    try:
+        max_nodes = max(1, len(model) // args.diagrams)
+        _, paths = write_pages(model, root, write_page, make_paging(max_nodes), 'Benchmark')
+        print(f"[{len(paths)} diagrams of at most {max_nodes} entities]")
+        start = time.perf_counter()
+        for path in paths:
+            render_one_shot(path, args.jar, args.java)
+        t_old = time.perf_counter() - start
+        server = PlantUMLServer(jar=args.jar, java=args.java)
+        start = time.perf_counter()
+        futures = [server.submit(path) for path in paths]
+        rendered = sum(1 for future in futures if future.result())
+        t_new = time.perf_counter() - start
+        server.close()
+        print(f"  one JVM per diagram: {t_old:7.2f} s  {t_old / len(paths) * 1000:7.0f} ms/diagram")
+        print(f"  render server:       {t_new:7.2f} s  {t_new / len(paths) * 1000:7.0f} ms/diagram "
+              f"({rendered} rendered, {server.stats['fallbacks']} fallbacks, {server.stats['restarts']} restarts; "
+              f"includes JVM start)")
+        print(f"  speedup: {t_old / t_new:.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
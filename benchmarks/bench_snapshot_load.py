@@ -0,0 +1,103 @@
+"""
+Benchmark: cold load of a 100k-entity model, JSON vs the mmap-ed binary snapshot.
+
+The model is the parsed CodeExamples/UnrealProject replicated under new ids. Each query starts from
+the file on disk: json.load (then a scan for one class) against open_snapshot (then a binary search
+for one class, or one pass over the relations), and a full load into a UmlModel with each format.
+
+Usage: python benchmarks/bench_snapshot_load.py [--entities 100000]
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+from _bench_utils import REPO_ROOT, timed
+
+import CPPForUnrealEngine
+from ModelExport import write_json
+from ModelSnapshot import write_snapshot, open_snapshot
+from UmlModel import UmlModel, Entity
+
+EXAMPLE_PROJECT = os.path.join(REPO_ROOT, 'CodeExamples', 'UnrealProject')
+
+
+def replicated_model(entities):
+    base = CPPForUnrealEngine.parse_unreal_headers_to_model(EXAMPLE_PROJECT)
+    model = UmlModel()
+    copy = 0
+    while len(model) < entities:
+        suffix = f'_{copy}'
+        for entity in base.entities():
+            model.add_entity(entity.id + suffix, entity.kind, entity.name + suffix, entity.namespace,
+                             entity.stereotype, entity.template)
+            for m in entity.members():
+                model.add_member(m.kind, m.name, m.type, m.params, m.visibility)
+        for kind, source, target, label in base.relations():
+            model.add_relation(kind, source + suffix, target + suffix, label)
+        copy += 1
+    return model
+
+
+def json_find(path, class_id):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return next(e for e in data['entities'] if e['id'] == class_id)['name']
+
+
+def snapshot_find(path, class_id):
+    with open_snapshot(path) as snapshot:
+        return snapshot.find(class_id).name
+
+
+def json_relations(path):
+    with open(path, encoding='utf-8') as f:
+        return len(json.load(f)['relations'])
+
+
+def snapshot_relations(path):
+    with open_snapshot(path) as snapshot:
+        return sum(1 for _ in snapshot.relations())
+
+
+def json_model(path):
+    with open(path, encoding='utf-8') as f:
+        return len(UmlModel.from_dict(json.load(f)))
+
+
+def snapshot_model(path):
+    with open_snapshot(path) as snapshot:
+        return len(snapshot.to_model())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entities', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    model = replicated_model(args.entities)
+    root = tempfile.mkdtemp(prefix='uuml_snapshot_')
+    try:
+        json_path = write_json(model, os.path.join(root, 'model.json'))
+        snap_path = write_snapshot(model, os.path.join(root, 'model.uumlsnap'))
+        class_id = Entity(model, len(model) // 2).id
+        print(f"[{len(model)} entities, {len(model.member_kind)} members, {len(model.relation_kind)} relations] "
+              f"JSON {os.path.getsize(json_path) / 2**20:.1f} MB, snapshot {os.path.getsize(snap_path) / 2**20:.1f} MB")
+        rows = [
+            ('json.load + find one class', json_find, json_path, class_id),
+            ('snapshot open + find one class', snapshot_find, snap_path, class_id),
+            ('json.load + iterate relations', json_relations, json_path),
+            ('snapshot open + iterate relations', snapshot_relations, snap_path),
+            ('json.load -> UmlModel', json_model, json_path),
+            ('snapshot -> UmlModel', snapshot_model, snap_path),
+        ]
+        for label, func, *func_args in rows:
+            elapsed, _ = timed(func, *func_args, repeat=args.repeat)
+            print(f"  {label:36} {elapsed * 1000:9.2f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
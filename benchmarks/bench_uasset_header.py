@@ -0,0 +1,159 @@
+"""
+Benchmark: pre-classifying .uasset files by their header before any export runs.
+
+Writes --assets sample packages: mostly textures, meshes, sounds and materials with --bulk-kb of
+(sparse) bulk data, a quarter Blueprints and WidgetBlueprints with native or Blueprint parents, and
+a few files that are not readable packages. The headers follow FPackageFileSummary of UE 4.27,
+5.1, 5.4 and 5.5. Times UAssetHeader.classify_uasset over the directory (assets/s), checks every
+class and parent against what was written, and reports how many exporter processes are avoided.
+
+Usage: python benchmarks/bench_uasset_header.py [--assets 5000] [--bulk-kb 2048]
+"""
+import argparse
+import os
+import struct
+import tempfile
+import time
+
+from _bench_utils import timed
+
+import UAssetHeader
+import UnrealForBP
+
+# (LegacyFileVersion, FileVersionUE4, FileVersionUE5) of UE 4.27, 5.1, 5.4 and 5.5
+VERSIONS = ((-7, 522, 0), (-8, 522, 1008), (-8, 522, 1012), (-8, 522, 1017))
+# asset class -> (script package of the class, generated class, its package)
+ASSET_CLASSES = {
+    'Texture2D': ('/Script/Engine', None, None),
+    'StaticMesh': ('/Script/Engine', None, None),
+    'SoundWave': ('/Script/Engine', None, None),
+    'Material': ('/Script/Engine', None, None),
+    'Blueprint': ('/Script/Engine', 'BlueprintGeneratedClass', '/Script/Engine'),
+    'WidgetBlueprint': ('/Script/UMGEditor', 'WidgetBlueprintGeneratedClass', '/Script/UMG'),
+}
+NATIVE_PARENTS = ('/Script/Engine.Actor', '/Script/Engine.Character', '/Script/Engine.Pawn')
+
+
+def fstring(text):
+    raw = text.encode('latin-1') + b'\0'
+    return struct.pack('<i', len(raw)) + raw
+
+
+def write_package(path, name, asset_class, parent, version, bulk):
+    """Writes a package whose header declares one `asset_class` export (and its generated class)."""
+    legacy, ue4, ue5 = version
+    summary = {'ue4': ue4, 'ue5': ue5, 'editor_only': False}
+    names = []
+    imports = []
+
+    def name_index(text):
+        if text not in names:
+            names.append(text)
+        return names.index(text)
+
+    def import_object(class_name, object_name, outer):
+        imports.append((name_index('/Script/CoreUObject'), name_index(class_name), outer, name_index(object_name)))
+        return -len(imports)
+
+    def import_path(object_path, class_name='Class'):
+        package, _, obj = object_path.partition('.')
+        outer = next((-i - 1 for i, row in enumerate(imports) if names[row[3]] == package and row[2] == 0), None)
+        if outer is None:
+            outer = import_object('Package', package, 0)
+        return import_object(class_name, obj, outer)
+
+    package, generated, generated_package = ASSET_CLASSES[asset_class]
+    exports = [(import_path(f'{package}.{asset_class}'), 0, 0, name_index(name))]
+    if generated:
+        parent_class = 'Class' if parent.startswith('/Script/') else 'BlueprintGeneratedClass'
+        super_index = import_path(parent, parent_class)
+        exports.append((import_path(f'{generated_package}.{generated}'), super_index, 0, name_index(f'{name}_C')))
+    exports.append((import_path('/Script/CoreUObject.MetaData'), 0, 0, name_index('PackageMetaData')))
+
+    head = struct.pack('<Ii', UAssetHeader.PACKAGE_TAG, legacy) + struct.pack('<i', 864)
+    head += struct.pack('<i', ue4) + (struct.pack('<i', ue5) if legacy <= -8 else b'') + struct.pack('<i', 0)
+    head += struct.pack('<i', 3) + bytes(20 * 3)
+    if ue5 >= UAssetHeader.VER_UE5_PACKAGE_SAVED_HASH:
+        head += bytes(20)
+    tail_of_summary = bytes(160)  # DependsOffset, thumbnails, engine version, compression, ...
+
+    def summary_bytes(name_offset, export_offset, import_offset, total):
+        data = head + struct.pack('<i', total) + fstring('None') + struct.pack('<I', 0)
+        data += struct.pack('<ii', len(names), name_offset)
+        if ue5 >= UAssetHeader.VER_UE5_ADD_SOFTOBJECTPATH_LIST:
+            data += struct.pack('<ii', 0, 0)
+        data += fstring('8B5E1C2D4F6A4B3C9D0E1F2A3B4C5D6E') + struct.pack('<ii', 0, 0)
+        data += struct.pack('<iiii', len(exports), export_offset, len(imports), import_offset)
+        return data + tail_of_summary
+
+    name_table = b''.join(fstring(text) + bytes(4) for text in names)
+    import_stride = 28 + 8 + (4 if ue5 >= UAssetHeader.VER_UE5_OPTIONAL_RESOURCES else 0)
+    import_table = b''.join(struct.pack('<iiiiiii', class_package, 0, class_name, 0, outer, object_name, 0)
+                            + bytes(import_stride - 28) for class_package, class_name, outer, object_name in imports)
+    export_stride = UAssetHeader.export_stride(summary)
+    export_table = b''.join(struct.pack('<iiii', class_index, super_index, 0, outer) + struct.pack('<ii', object_name, 0)
+                            + bytes(export_stride - 24) for class_index, super_index, outer, object_name in exports)
+    name_offset = len(summary_bytes(0, 0, 0, 0))
+    import_offset = name_offset + len(name_table)
+    export_offset = import_offset + len(import_table)
+    total = export_offset + len(export_table)
+    with open(path, 'wb') as f:
+        f.write(summary_bytes(name_offset, export_offset, import_offset, total))
+        f.write(name_table + import_table + export_table)
+        f.truncate(total + bulk)
+
+
+def sample_assets(root, count, bulk):
+    """Writes the sample assets; returns {path: (asset class, parent class)} (None for unreadable files)."""
+    expected = {}
+    classes = ['Texture2D', 'StaticMesh', 'SoundWave', 'Material', 'Texture2D', 'StaticMesh'] * 3
+    classes += ['Blueprint'] * 5 + ['WidgetBlueprint']
+    for a in range(count):
+        folder = os.path.join(root, 'Content', f'Folder{a % 50}')
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f'Asset{a}.uasset')
+        if a % 97 == 0:
+            with open(path, 'wb') as f:
+                f.write(b'not a package' * (a % 3))
+            expected[path] = None
+            continue
+        asset_class = classes[a % len(classes)]
+        parent = None
+        if asset_class == 'Blueprint':
+            parent = NATIVE_PARENTS[a % 3] if a % 4 else f'/Game/Folder{(a + 1) % 50}/BP_Base.BP_Base_C'
+        elif asset_class == 'WidgetBlueprint':
+            parent = '/Script/UMG.UserWidget'
+        write_package(path, f'Asset{a}', asset_class, parent, VERSIONS[a % len(VERSIONS)],
+                      0 if parent else bulk * 1024)
+        expected[path] = (asset_class, parent)
+    return expected
+
+
+def classify_all(paths):
+    return [UAssetHeader.classify_uasset(path) for path in paths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--assets', type=int, default=5000)
+    parser.add_argument('--bulk-kb', type=int, default=2048)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix='uuml_uasset_') as root:
+        start = time.perf_counter()
+        expected = sample_assets(root, args.assets, args.bulk_kb)
+        print(f"[{len(expected)} sample assets written in {time.perf_counter() - start:.1f} s, "
+              f"{args.bulk_kb} KB of bulk data per non-Blueprint asset]")
+        paths = sorted(expected)
+        t_classify, infos = timed(classify_all, paths, repeat=args.repeat)
+        wrong = sum(1 for path, info in zip(paths, infos) if (tuple(info) if info else None) != expected[path])
+        print(f"  classify_uasset     {t_classify:6.2f} s  {len(paths) / t_classify:8.0f} assets/s  "
+              f"({wrong} misclassified)")
+        t_select, (selected, parents) = timed(UnrealForBP.select_blueprints, paths, repeat=1)
+        print(f"  select_blueprints   {t_select:6.2f} s  {len(selected)} of {len(paths)} assets go to the exporter "
+              f"({len(parents)} Blueprints, {len(selected) - len(parents)} unreadable), "
+              f"{len(paths) - len(selected)} exporter processes avoided")
+
+
+if __name__ == '__main__':
+    main()
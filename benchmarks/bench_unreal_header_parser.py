@@ -0,0 +1,69 @@
+"""
+Benchmark: Unreal header parsing throughput (MB/s) on a scaled-up copy of CodeExamples/UnrealProject.
+
+Compares the baseline line/regex parser of CPPForUnrealEngine against the single-pass
+UnrealHeaderScanner, serially and without the parse cache. The 'bundled' layout concatenates
+several example headers per file, which the baseline truncates after the first UCLASS.
+
+Usage: python benchmarks/bench_unreal_header_parser.py [--copies 200] [--bundle 8]
+"""
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+
+from _bench_utils import REPO_ROOT, load_baseline_module, timed, write_file
+
+import CPPForUnrealEngine
+
+EXAMPLE_SOURCE = os.path.join(REPO_ROOT, 'CodeExamples', 'UnrealProject', 'Source')
+
+
+def build_project(root, copies, bundle):
+    """Writes `copies` renamed copies of the example headers, `bundle` headers per file. Returns total bytes."""
+    headers = []
+    for path in sorted(glob.glob(os.path.join(EXAMPLE_SOURCE, '**', '*.h'), recursive=True)):
+        with open(path, encoding='utf-8') as f:
+            headers.append(f.read())
+    total = 0
+    for copy in range(copies):
+        for start in range(0, len(headers), bundle):
+            # Unique class names per copy keep association resolution realistic
+            content = '\n'.join(headers[start:start + bundle]).replace('_API A', f'_API AC{copy}')
+            path = os.path.join(root, 'Source', f'Module{copy % 16}', f'Copy{copy}_{start}.h')
+            write_file(path, content)
+            total += len(content.encode('utf-8'))
+    return total
+
+
+def count_entities(uml):
+    if isinstance(uml, dict):
+        return sum(len(uml[key]) for key in ('classes', 'interfaces', 'enums'))
+    return len(uml)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--copies', type=int, default=200)
+    parser.add_argument('--bundle', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    baseline = load_baseline_module('CPPForUnrealEngine')
+    for layout, bundle in (('one header per file', 1), (f'{args.bundle} headers per file', args.bundle)):
+        root = tempfile.mkdtemp(prefix='uuml_ue_parse_')
+        try:
+            total = build_project(root, args.copies, bundle)
+            mb = total / (1024 * 1024)
+            t_old, old_json = timed(baseline.parse_unreal_headers_to_uml_json, root, repeat=args.repeat)
+            t_new, new_json = timed(CPPForUnrealEngine.parse_unreal_headers_to_model, root, repeat=args.repeat)
+            print(f"[{layout}] {mb:.1f} MB of headers")
+            print(f"  baseline parser: {t_old:7.2f} s  {mb / t_old:6.2f} MB/s  {count_entities(old_json)} entities")
+            print(f"  single pass:     {t_new:7.2f} s  {mb / t_new:6.2f} MB/s  {count_entities(new_json)} entities")
+            print(f"  speedup: {t_old / t_new:.1f}x")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
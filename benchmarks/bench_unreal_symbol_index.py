@@ -0,0 +1,86 @@
+"""
+Benchmark: Unreal association resolution, bare class-name set vs the UnrealSymbolIndex.
+
+On a scaled-up copy of CodeExamples/UnrealProject (headers scanned once, up front), times the step
+between parsing and merging:
+  - name set: re.finditer(r'class\s+(\w+)') over every header, then the attribute types and the
+    comma-split parameter strings of every entity looked up in the set (the old resolution)
+  - symbol index: UnrealSymbolIndex built from the scanned headers, then one hashed lookup per
+    normalized type reference
+and the number of association relations each produces.
+
+Usage: python benchmarks/bench_unreal_symbol_index.py [--copies 400]
+"""
+import argparse
+import os
+import re
+import shutil
+import tempfile
+
+from _bench_utils import timed
+from bench_unreal_header_parser import build_project
+
+import CPPForUnrealEngine
+from FileDiscovery import find_files
+from UnrealSymbolIndex import UnrealSymbolIndex
+
+
+def name_set_resolution(contents, header_data):
+    all_class_names = set()
+    for content in contents:
+        for m in re.finditer(r'class\s+(\w+)', content):
+            all_class_names.add(m.group(1))
+    count = 0
+    for _, header in header_data:
+        for entity in CPPForUnrealEngine.resolvable_entities(header):
+            candidates = {attr['type'] for attr in entity['attributes']}
+            for meth in entity['methods']:
+                for param_type in meth.get('params', '').split(','):
+                    candidates.add(param_type.strip())
+            targets = {t for t in candidates if t in all_class_names and t != entity['name']}
+            relations = [rel for rel in entity['relations'] if rel['type'] != 'association']
+            for target in sorted(targets):
+                relations.append({'type': 'association', 'target': CPPForUnrealEngine.clean_relation_target(target)})
+            entity['relations'] = relations
+            count += len(targets)
+    return count
+
+
+def symbol_index_resolution(header_data):
+    index = UnrealSymbolIndex.from_headers(header_data)
+    count = 0
+    for path, header in header_data:
+        module = index.headers[path][0]
+        for entity in CPPForUnrealEngine.resolvable_entities(header):
+            CPPForUnrealEngine.resolve_associations(entity, index, module)
+            count += sum(1 for rel in entity['relations'] if rel['type'] == 'association')
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--copies', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    root = tempfile.mkdtemp(prefix='uuml_symbol_index_')
+    try:
+        build_project(root, args.copies, 1)
+        paths = find_files(os.path.join(root, 'Source'), ('.h',), language='cpp4ue')
+        contents = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                contents.append(f.read())
+        header_data = [(path, CPPForUnrealEngine.parse_unreal_header(path)) for path in paths]
+        entities = sum(len(CPPForUnrealEngine.resolvable_entities(header)) for _, header in header_data)
+        print(f"[{len(paths)} headers, {entities} entities]")
+        t_old, old_count = timed(name_set_resolution, contents, header_data, repeat=args.repeat)
+        t_new, new_count = timed(symbol_index_resolution, header_data, repeat=args.repeat)
+        print(f"  name set:     {t_old * 1000:8.1f} ms  {old_count} associations")
+        print(f"  symbol index: {t_new * 1000:8.1f} ms  {new_count} associations")
+        print(f"  speedup: {t_old / t_new:.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Stand-in for UAssetAPI.CLI.exe, so the Blueprint export pool can be run on Linux.
+
+Accepts the same command line ('export <uasset> <json>') and writes a small JSON after
+UASSET_STANDIN_DELAY seconds (default 0.05, about a .NET start). The asset file name picks a failure:
+'Broken' exits with an error, 'Hang' never finishes (for the timeout) and 'Flaky' fails on the
+first attempt only.
+
+Usage: uasset_exporter_standin.py export <uasset> <json>
+(or UUML_UASSET_EXPORTER="python benchmarks/uasset_exporter_standin.py")
+"""
+import json
+import os
+import sys
+import time
+
+
+def main():
+    if len(sys.argv) != 4 or sys.argv[1] != 'export':
+        print(__doc__.strip().splitlines()[-2], file=sys.stderr)
+        return 2
+    uasset, output = sys.argv[2], sys.argv[3]
+    name = os.path.basename(uasset)
+    time.sleep(float(os.environ.get('UASSET_STANDIN_DELAY', '0.05')))
+    if 'Hang' in name:
+        time.sleep(3600)
+    if 'Broken' in name:
+        print(f'Unhandled exception: cannot deserialize {uasset}', file=sys.stderr)
+        return 1
+    if 'Flaky' in name and not os.path.exists(output + '.attempt'):
+        open(output + '.attempt', 'w').close()
+        print('IOException: the file is in use by another process', file=sys.stderr)
+        return 1
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'Source': uasset, 'Size': os.path.getsize(uasset)}, f)
+    if os.path.exists(output + '.attempt'):
+        os.remove(output + '.attempt')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
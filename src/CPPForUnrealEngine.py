@@ -2,53 +2,137 @@ import os
 import re
 import json
 from collections import defaultdict
-from SVGRenderer import render_svg
+from SVGRenderer import render_svg, render_svgs, output_kind
+from FileDiscovery import iter_files
+from ParallelParse import parse_files
+from ParseCache import open_parse_cache
+from UnrealHeaderScanner import scan_header, clean_type, clean_param, clean_params
+from UnrealSymbolIndex import UnrealSymbolIndex, module_of
+from ModelExport import export_artifacts
+from ModelFocus import apply_focus
+from ModelDetail import apply_detail, is_more
+from ModelPages import write_pages
+from PumlWriter import write_puml_lines, puml_summary
+from NativeRenderer import stereotype_colors
+from UmlModel import UmlModel, Entity, CLASS, STRUCT, INTERFACE, ENUM, ATTRIBUTE, METHOD, VALUE, EXTENDS, IMPLEMENTS, ASSOCIATION, visibility_code
 
 """
 CPPForUnrealEngine.py
 -----------------------
-Generates UML-compliant JSON (according to https://plantuml.com/class-diagram) for all Unreal Engine C++ headers in the project.
+Builds the UML model (UmlModel, according to https://plantuml.com/class-diagram) for all Unreal Engine C++ headers in the project.
 Includes ALL attributes and methods present in the header, respecting visibility, without depending on Unreal macros.
 Only entities and relationships allowed by the PlantUML Class Diagram are considered.
 """
 
-def clean_type(type_str):
+# Bump whenever parse_unreal_header changes its output, to invalidate cached entries
+PARSER_VERSION = 3
+
+def clean_relation_target(name):
     """
-    Cleans the data type by removing unwanted characters.
+    Cleans the relation target by removing visibility and extra spaces.
     """
-    type_str = re.sub(r'[&*]', '', type_str)
-    type_str = re.sub(r'<[^>]*>', '', type_str)
-    type_str = re.sub(r'\b(const|virtual|static|inline|override|final|explicit|friend|mutable|volatile|constexpr|typename|class|struct|enum|public|protected|private)\b', '', type_str)
-    return type_str.strip()
+    return re.sub(r'^(public|protected|private)\s*:?', '', name, flags=re.IGNORECASE).strip()
 
-def clean_param(param):
+# --- Unreal header parsing to UML JSON ---
+def parse_unreal_header(file_path):
     """
-    Cleans the parameter by removing unwanted characters.
+    Parses one Unreal header into {'forward_declarations', 'classes', 'interfaces', 'enums'} with the
+    single-pass scanner (every class/struct/interface/enum of the header is emitted).
+    Association relations are not resolved here (they need the symbol index of every header),
+    so the result only depends on the file itself and can be cached and parsed in parallel.
     """
-    param = clean_type(param)
-    param = re.sub(r'\b\w+\s*$', '', param).strip()
-    return param
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    header = scan_header(content)
+    for entity in header['classes'] + header['interfaces']:
+        for rel in entity['relations']:
+            rel['target'] = clean_relation_target(rel['target'])
+    return header
 
-def clean_params(params_str):
+def association_candidates(entity):
     """
-    Cleans the parameters by removing unwanted characters.
+    Returns the type names referenced by the attributes and parameters of `entity` (template
+    arguments included, already normalized by the scanner), i.e. its possible association targets.
     """
-    if not params_str.strip():
-        return ''
-    params = []
-    for p in params_str.split(','):
-        p = clean_param(p.strip())
-        if p:
-            params.append(p)
-    return ', '.join(params)
+    return set(entity.get('refs', ()))
 
-# --- Unreal header parsing to UML JSON ---
-def parse_unreal_headers_to_uml_json(project_dir):
+def resolve_associations(entity, index, module=''):
+    """
+    Sets the association relations of `entity` to the referenced types the symbol index resolves
+    (one hashed lookup per reference, preferring definitions of `module`). Previously resolved
+    associations are replaced, so it can be re-run when the index changes.
     """
-    Scans all .h headers inside the Source folder and generates a UML-compliant JSON (PlantUML class diagram):
+    class_name = entity['name']
+    relations = [rel for rel in entity['relations'] if rel['type'] != 'association']
+    rel_targets = set()
+    for ref in association_candidates(entity):
+        symbol = index.resolve(ref, module)
+        if symbol is not None and symbol[1] != class_name:
+            rel_targets.add(symbol[1])
+    # Add association relationships
+    for target in sorted(rel_targets):
+        relations.append({'type': 'association', 'target': target})
+    entity['relations'] = relations
+
+def resolvable_entities(header):
+    """Entities of a parsed header that carry relations (UCLASS/USTRUCT/UINTERFACE declarations)."""
+    return [e for e in header['classes'] + header['interfaces'] if 'relations' in e]
+
+RELATION_KINDS = {'extends': EXTENDS, 'implements': IMPLEMENTS, 'association': ASSOCIATION}
+
+def _add_members(model, entity):
+    for attr in entity.get('attributes', []):
+        model.add_member(ATTRIBUTE, attr['name'], attr['type'], visibility=visibility_code(attr.get('visibility')))
+    for meth in entity.get('methods', []):
+        model.add_member(METHOD, meth['name'], meth['type'], meth.get('params', ''),
+                         visibility_code(meth.get('visibility')))
+
+def merge_headers(header_data):
+    """
+    Builds the UmlModel from the per-header results (in path order): every class, then every
+    interface, then every enum. Only class relations are kept, as the diagram only draws those.
+    The namespace of an entity is the Unreal module of its header.
+    """
+    model = UmlModel()
+    for path, header in header_data:
+        for c in header['classes']:
+            kind = c.get('type', 'class')
+            model.add_entity(c['name'], STRUCT if kind == 'struct' else CLASS, namespace=module_of(path),
+                             stereotype=kind.capitalize())
+            _add_members(model, c)
+    for path, header in header_data:
+        for i in header['interfaces']:
+            model.add_entity(i['name'], INTERFACE, namespace=module_of(path), stereotype='Interface')
+            _add_members(model, i)
+    for path, header in header_data:
+        for e in header['enums']:
+            model.add_entity(e['name'], ENUM, namespace=module_of(path), stereotype='Enum')
+            for value in e.get('values', []):
+                model.add_member(VALUE, value)
+    for _, header in header_data:
+        for c in header['classes']:
+            for rel in c.get('relations', []):
+                model.add_relation(RELATION_KINDS[rel['type']], c['name'], clean_relation_target(rel['target']),
+                                   rel.get('label', ''))
+    return model
+
+def build_model(header_data):
+    """Resolves associations against the symbol index of every header, then merges the headers into a UmlModel."""
+    index = UnrealSymbolIndex.from_headers(header_data)
+    for path, header in header_data:
+        module = index.headers[path][0]
+        for entity in resolvable_entities(header):
+            resolve_associations(entity, index, module)
+    return merge_headers(header_data)
+
+def parse_unreal_headers_to_model(project_dir, jobs=1, cache=None):
+    """
+    Scans all .h headers inside the Source folder and builds the UML model (PlantUML class diagram):
     - classes, interfaces, enums
     - ALL attributes and methods (with visibility)
-    - relationships: extends (inheritance), implements (interface)
+    - relationships: extends (inheritance), implements (interface), association
+    Headers are parsed on `jobs` processes (optionally through a ParseCache); associations are
+    resolved afterwards, once the symbol index of every header is built.
     """
     import sys
     source_dir = os.path.join(project_dir, 'Source')
@@ -58,218 +142,62 @@ def parse_unreal_headers_to_uml_json(project_dir):
         if getattr(sys, 'frozen', False):
             input('Press any key to exit...')
         sys.exit(1)
-    classes = []
-    interfaces = []
-    enums = []
-    all_class_names = set()
-    header_data = []
-    for root, dirs, files in os.walk(source_dir):
-        for file in files:
-            if file.endswith('.h'):
-                file_path = os.path.join(root, file)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                for decl_match in re.finditer(r'class\s+(\w+)', content):
-                    all_class_names.add(decl_match.group(1))
-                header_data.append((file_path, content))
+    headers = iter_files(source_dir, ('.h',), language='cpp4ue', project_root=project_dir)
+    header_data = parse_files(headers, parse_unreal_header, jobs=jobs, cache=cache, version=PARSER_VERSION)
     if not header_data:
         print(f"[UML] ERROR: No .h files found inside the 'Source' folder: {source_dir}")
         if getattr(sys, 'frozen', False):
             input('Press any key to exit...')
         sys.exit(1)
-    # Second pass: process each header normally
-    for file_path, content in header_data:
-        content_no_comments = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-        content_no_comments = re.sub(r'//.*', '', content_no_comments)
-        # Enums
-        for m in re.finditer(r'UENUM\s*\(.*?\)?\s*enum\s+class\s+(\w+)[^{]*{([^}]*)}', content_no_comments, re.DOTALL):
-            name, body = m.group(1), m.group(2)
-            values = [v.split()[0].replace(',', '') for v in body.splitlines() if v.strip() and not v.strip().startswith('//')]
-            enums.append({'name': name, 'values': values})
-        # Unreal Interfaces (UINTERFACE)
-        for m in re.finditer(r'UINTERFACE\s*\(.*?\)?\s*class\s+(\w+)\s*:\s*public\s+UInterface\s*{', content_no_comments):
-            interface_name = m.group(1)
-            interfaces.append({'name': interface_name, 'methods': []})
-        # Unreal Classes/Structs/Interfaces
-        lines = content_no_comments.split('\n')
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            kind = None
-            if re.match(r'^UCLASS\b', line):
-                kind = 'class'
-            elif re.match(r'^USTRUCT\b', line):
-                kind = 'struct'
-            elif re.match(r'^UINTERFACE\b', line):
-                kind = 'interface'
-            if kind:
-                # New: join declaration lines until '{' or ':' is found
-                decl_j = 1
-                decl_lines = [lines[i + decl_j].strip()]
-                while '{' not in decl_lines[-1] and ':' not in decl_lines[-1] and i + decl_j + 1 < len(lines):
-                    decl_j += 1
-                    decl_lines.append(lines[i + decl_j].strip())
-                decl_line_full = ' '.join(decl_lines)
-                # Robust regex for Unreal: supports macro API and inheritance
-                decl_match = re.match(r'class\s+(?:\w+_API\s+)?([A-Za-z_][A-Za-z0-9_]*)\b', decl_line_full)
-                if decl_match:
-                    ctype = 'class'
-                    name = decl_match.group(1)
-                    parent = ''
-                    # Try to capture inheritance if present
-                    parent_match = re.search(r':\s*public\s+([\w_:<> ,]+)', decl_line_full)
-                    if parent_match:
-                        parent = parent_match.group(1)
-                    k = i + decl_j
-                    # Extract class body until '};'
-                    body_lines = []
-                    started = False
-                    for lidx in range(k, len(lines)):
-                        l = lines[lidx]
-                        body_lines.append(l)
-                        if '{' in l:
-                            started = True
-                        if started and re.search(r'}\s*;', l):
-                            break
-                    body = '\n'.join(body_lines)
-                    class_name = str(name)
-                    # Pass 1: Collect attributes (including private)
-                    attributes = []
-                    current_vis = 'private' if kind == 'class' else 'public'
-                    for bl in body.split('\n'):
-                        bl_strip = bl.strip()
-                        vis_match = re.match(r'^(public|protected|private)\s*:\s*$', bl_strip)
-                        if vis_match:
-                            current_vis = vis_match.group(1)
-                            continue
-                        attr_match = re.match(r'([\w:<>]+(?:\s*\*)?)\s+([\w_]+)\s*(?:;|=|\[)', bl_strip)
-                        if attr_match and '(' not in bl_strip and not bl_strip.startswith('//'):
-                            attr_type = clean_type(attr_match.group(1))
-                            attr_name = attr_match.group(2)
-                            attributes.append({'name': attr_name, 'type': attr_type, 'visibility': current_vis})
-                    # Pass 2: Collect methods (including overrides, constructor and correct visibility)
-                    methods = []
-                    current_vis = 'private' if kind == 'class' else 'public'
-                    for bl in body.split('\n'):
-                        bl_strip = bl.strip()
-                        vis_match = re.match(r'^(public|protected|private)\s*:\s*$', bl_strip)
-                        if vis_match:
-                            current_vis = vis_match.group(1)
-                            continue
-                        # Improved regex for virtual methods (with or without override)
-                        meth_match = re.match(r'(virtual\s+)?([\w:<>]+(?:\s*\*)?)?\s*([A-Za-z_][\w]*)\s*\(([^)]*)\)\s*(const)?\s*(override)?\s*(final)?\s*(=\s*0)?\s*(\{|;)', bl_strip)
-                        if meth_match:
-                            is_virtual = meth_match.group(1) is not None
-                            meth_type = clean_type(meth_match.group(2) or '')
-                            method_name = meth_match.group(3)
-                            meth_params = clean_params(meth_match.group(4))
-                            # Ignore clearly truncated methods or constructors
-                            if method_name == class_name or len(method_name) <= 2 or (method_name[-1:] == class_name[-1:] and len(method_name) < len(class_name)):
-                                continue
-                            # Fix truncated type: if the type ends the same as the class name but is truncated, fix to class name
-                            if meth_type and meth_type != class_name and meth_type.endswith(class_name[:-1]):
-                                meth_type = class_name
-                            # Capture all Unreal override methods (Tick, BeginPlay, etc.)
-                            if meth_match.group(6) == 'override' or method_name in [
-                                'Tick', 'BeginPlay', 'SetupPlayerInputComponent', 'GetLifetimeReplicatedProps', 'OnRep_PlayerState', 'GetAbilitySystemComponent', 'LoseBall_Implementation']:
-                                methods.append({'name': method_name, 'type': meth_type if meth_type else class_name, 'params': meth_params, 'visibility': current_vis})
-                            # Add all declared methods
-                            elif meth_type or meth_params or method_name:
-                                methods.append({'name': method_name, 'type': meth_type if meth_type else class_name, 'params': meth_params, 'visibility': current_vis})
-                    # UML Relationships
-                    relations = []
-                    if parent:
-                        for p in parent.split(','):
-                            relations.append({'type': 'extends', 'target': p.strip()})
-                    # --- Add association/use relationships ---
-                    # Collect attribute and method types for relationships
-                    rel_targets = set()
-                    for attr in attributes:
-                        if attr['type'] in all_class_names and attr['type'] != class_name:
-                            rel_targets.add(attr['type'])
-                    for meth in methods:
-                        # Parameters can be multiple types separated by comma
-                        for param_type in meth.get('params', '').split(','):
-                            t = param_type.strip()
-                            if t in all_class_names and t != class_name:
-                                rel_targets.add(t)
-                    # Add association relationships
-                    for target in sorted(rel_targets):
-                        relations.append({'type': 'association', 'target': target})
-                    # Clean the 'target' field by removing visibility and extra spaces
-                    def clean_relation_target(name):
-                        return re.sub(r'^(public|protected|private)\s*:?', '', name, flags=re.IGNORECASE).strip()
-                    for rel in relations:
-                        rel['target'] = clean_relation_target(rel['target'])
-                    entity = {
-                        'name': class_name,
-                        'type': kind,
-                        'attributes': attributes,
-                        'methods': methods,
-                        'relations': relations
-                    }
-                    if kind == 'interface':
-                        interfaces.append(entity)
-                    elif kind == 'struct':
-                        classes.append(entity)  # Struct becomes UML class
-                    else:
-                        classes.append(entity)
-                    break
-            i += 1
-    return {'classes': classes, 'interfaces': interfaces, 'enums': enums}
+    return build_model(header_data)
 
-def main(project_dir):
-    uml_json = parse_unreal_headers_to_uml_json(project_dir)
-    json_file = os.path.join(project_dir, 'UML_ClassDiagram.json')
-    with open(json_file, 'w', encoding='utf-8') as jf:
-        json.dump(uml_json, jf, indent=2, ensure_ascii=False)
-    print(f'[UML] UML JSON saved at: {json_file}')
+def main(project_dir, jobs=1, use_cache=True, write_json=True, write_snapshot=True, focus=None, paging=None,
+         detail=None):
+    with open_parse_cache(project_dir, enabled=use_cache) as cache:
+        model = parse_unreal_headers_to_model(project_dir, jobs=jobs, cache=cache)
+    # --focus draws only the neighborhood of one class; the artifacts keep the full model
+    diagram = apply_focus(model, focus)
+    # --max-members & co. collapse oversized boxes; their full members go to a side file
+    diagram = apply_detail(diagram, detail, os.path.join(project_dir, 'UML_ClassDiagram_members.txt'))
+    # The JSON and snapshot artifacts are written in the background; the PUML is generated from the model itself
+    export = export_artifacts(model, project_dir, 'UML_ClassDiagram', 'UML', write_json, write_snapshot)
 
-    try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            uml_json = json.load(f)
-    except Exception as e:
-        print(f"[UML] Error reading JSON to generate PUML: {e}")
+    if paging is not None:
+        # One bounded .puml per page plus an index page, rendered by a single PlantUML run
+        index_path, page_paths = write_pages(diagram, os.path.join(project_dir, 'UML_ClassDiagram_pages'),
+                                             lambda page, path: generate_puml_from_model(page, project_dir, path),
+                                             paging, 'UML Class Diagram')
+        svgs = render_svgs(page_paths + [index_path])
+        if svgs:
+            print(f"[UML] {len(svgs)} {output_kind(svgs[-1])}s generated; index: {svgs[-1]}")
+        else:
+            print(f"[UML] {output_kind()} not generated!")
+        if export is not None:
+            export.wait()
         return
 
-    # Generate dynamic PUML from real JSON
-    print("\n[UML] PUML GENERATED DYNAMICALLY FROM JSON:\n")
-    puml = generate_puml_from_json(uml_json, project_dir)
-    print(puml)
-
-    # Save PUML to file
-    puml_path = os.path.join(project_dir, 'UML_ClassDiagram.puml')
-    with open(puml_path, 'w', encoding='utf-8') as pf:
-        pf.write(puml)
-    print(f"[UML] PUML saved at: {puml_path}")
-
-    # Generate SVG from PUML
-    plantuml_jar_path = os.path.abspath(os.path.join(os.path.dirname(__file__), 'plantuml.jar'))
-    svg_cmd = f'java -jar "{plantuml_jar_path}" -tsvg "{puml_path}"'
-    print(f"[UML] Generating SVG with: {svg_cmd}")
-    os.system(svg_cmd)
+    # The diagram is streamed into the file; only --verbose echoes it to the console
+    puml_path = generate_puml_from_model(diagram, project_dir)
+    print(f"[UML] PUML saved at: {puml_summary(puml_path)}")
 
-    # Automatically open SVG (if possible)
-    svg_path = puml_path.replace('.puml', '.svg')
-    if os.path.exists(svg_path):
-        print(f"[UML] Opening SVG: {svg_path}")
-        import webbrowser
-        webbrowser.open(svg_path)
+    # Generate SVG from PUML (persistent PlantUML server) and open it automatically
+    svg_path = render_svg(puml_path)
+    if svg_path:
+        print(f"[UML] {output_kind(svg_path)} generated: {svg_path}")
     else:
-        print(f"[UML] SVG not found: {svg_path}")
+        print(f"[UML] {output_kind()} not generated!")
+    if export is not None:
+        export.wait()
 
 
-def generate_puml_from_json(uml_json, project_dir=None):
-    """
-    Generates dynamic PUML from real UML JSON, grouping and coloring by stereotype/type.
-    Classes without relationships are grouped in 'Others'.
-    Bright colored arrows and boxes with shadow.
-    Adds a title with project name and Unreal version, and a fictitious class with used plugins.
-    """
-    def clean_relation_target(name):
-        return re.sub(r'^(public|protected|private)\s*:?', '', name, flags=re.IGNORECASE).strip()
+def generate_puml_from_model(model, project_dir=None, output_file=None):
+    """Writes UML_ClassDiagram.puml (or `output_file`) for the UmlModel and returns its path."""
+    output_file = output_file or os.path.join(project_dir or '.', 'UML_ClassDiagram.puml')
+    return write_puml_lines(output_file, iter_puml_from_model(model, project_dir), model)
+
 
-    # --- Reads .uproject if available ---
+def read_uproject(project_dir):
+    """(project name, Unreal version, enabled plugins) from the project's .uproject, if any."""
     project_name = None
     unreal_version = None
     plugins = []
@@ -282,59 +210,69 @@ def generate_puml_from_json(uml_json, project_dir=None):
             project_name = upjson.get('Modules', [{}])[0].get('Name')
             unreal_version = upjson.get('EngineAssociation')
             plugins = [p['Name'] for p in upjson.get('Plugins', []) if p.get('Enabled')]
+    return project_name, unreal_version, plugins
 
-    classes = uml_json.get('classes', [])
-    interfaces = uml_json.get('interfaces', [])
-    enums = uml_json.get('enums', [])
-    all_items = []
-    name_to_item = {}
-    for c in classes:
-        st = c.get('type', 'Class').capitalize()
-        item = {'name': c['name'], 'stereotype': st, 'fields': [f"+{a['name']} : {a['type']}" for a in c.get('attributes', [])], 'methods': [f"+{m['name']}({m.get('params','')}) : {m['type']}" for m in c.get('methods', [])]}
-        all_items.append(item)
-        name_to_item[c['name']] = item
-    for i in interfaces:
-        item = {'name': i['name'], 'stereotype': 'Interface', 'fields': [], 'methods': [f"+{m['name']}({m.get('params','')}) : {m['type']}" for m in i.get('methods', [])]}
-        all_items.append(item)
-        name_to_item[i['name']] = item
-    for e in enums:
-        item = {'name': e['name'], 'stereotype': 'Enum', 'fields': e.get('values', []), 'methods': []}
-        all_items.append(item)
-        name_to_item[e['name']] = item
+
+def iter_entity_lines(entity, external_refs=None):
+    """PUML lines of one entity box (inside a package)."""
+    st = entity.stereotype
+    kind = 'struct' if st.lower() == 'struct' else ('interface' if st.lower() == 'interface' else ('enum' if st.lower() == 'enum' else 'class'))
+    if entity.kind == ENUM:
+        fields = [f"    //{v.name}//" if is_more(v) else f"    {v.name}" for v in entity.members(VALUE)]
+        methods = []
+    else:
+        fields = []
+        methods = []
+        for m in entity.members():
+            if m.kind == ATTRIBUTE:
+                fields.append(f"    +{m.name} : {m.type}")
+            elif m.kind == METHOD:
+                methods.append(f"    +{m.name}({m.params}) : {m.type}")
+            elif is_more(m):
+                # '+N more' line of --max-members, after the attributes or the methods it summarizes
+                if methods:
+                    methods.append(f"    {{method}} //{m.name}//")
+                else:
+                    fields.append(f"    //{m.name}//")
+    yield f"  {kind} {entity.name} <<{st}>> {{"
+    yield from fields
+    if fields and methods:
+        yield "    --"
+    yield from methods
+    if external_refs:
+        yield "    --"
+        yield f"    <<References: {', '.join(sorted(external_refs))}>>"
+    yield "  }"
+
+
+def iter_puml_from_model(model, project_dir=None):
+    """
+    Yields the lines of a dynamic PUML for the UmlModel, grouping and coloring by stereotype/type.
+    Classes without relationships are grouped in 'Others'.
+    Bright colored arrows and boxes with shadow.
+    Adds a title with project name and Unreal version, and a fictitious class with used plugins.
+    Entities are formatted one at a time; only entity indices are kept per package.
+    """
+    project_name, unreal_version, plugins = read_uproject(project_dir)
     # Relationships (inheritance, implements, association)
-    relations = []
+    arrows = {EXTENDS: ('<|--', 'inherits'), IMPLEMENTS: ('..|>', 'implements'), ASSOCIATION: ('-->', 'assoc')}
     related_names = set()
-    for c in classes:
-        for rel in c.get('relations', []):
-            target = clean_relation_target(rel['target'])
-            src = c['name']
-            if rel['type'] == 'extends':
-                relations.append((src, target, '<|--', 'inherits'))
-            elif rel['type'] == 'implements':
-                relations.append((src, target, '..|>', 'implements'))
-            elif rel['type'] == 'association':
-                relations.append((src, target, '-->', rel.get('label','assoc')))
-            related_names.add(src)
-            related_names.add(target)
     # --- Detect real entities and external references ---
-    real_entities = set(item['name'] for item in all_items)
+    real_entities = set(entity.name for entity in model.entities())
     referenced_targets = set()
     class_to_external_refs = defaultdict(set)
-    for c in classes:
-        for rel in c.get('relations', []):
-            target = clean_relation_target(rel['target'])
-            referenced_targets.add(target)
-            if target not in real_entities:
-                class_to_external_refs[c['name']].add(target)
+    for kind, src, target, label in model.relations():
+        related_names.add(src)
+        related_names.add(target)
+        referenced_targets.add(target)
+        if target not in real_entities:
+            class_to_external_refs[src].add(target)
     only_referenced = referenced_targets - real_entities
 
     # 1. Discover all unique stereotypes
-    stereotypes = sorted(set(item['stereotype'] for item in all_items))
-    # 2. Automatically generate colors (pastel palette)
-    pastel_palette = [
-        '#FFD580', '#B3E6B3', '#FFB3B3', '#B3D1FF', '#E0B3FF', '#FFF0B3', '#C6E2FF', '#FFCCE5', '#D5FFCC', '#FFDFBA'
-    ]
-    colors = {st: pastel_palette[i % len(pastel_palette)] for i, st in enumerate(stereotypes)}
+    stereotypes = sorted(set(entity.stereotype for entity in model.entities()))
+    # 2. Automatically generate colors (pastel palette, shared with the native renderer)
+    colors = stereotype_colors(stereotypes)
     # 3. Dynamically build skinparam
     skinparam = '\n'.join([
         f'  BackgroundColor<<{st}>> {color}' for st, color in colors.items()
@@ -344,89 +282,65 @@ def generate_puml_from_json(uml_json, project_dir=None):
     skinparam += '  BackgroundColor<<ExternalReference>> #E0E0E0\n  BorderColor<<ExternalReference>> #888\n  FontColor<<ExternalReference>> #666\n  FontStyle<<ExternalReference>> italic\n'
 
     # 4. Diagram header
-    puml = ["@startuml", ""]
-    puml.append("top to bottom direction")  # Forces vertical layout
+    yield "@startuml"
+    yield ""
+    yield "top to bottom direction"  # Forces vertical layout
     if project_name or unreal_version:
         title = f"{project_name or ''} (Unreal Engine {unreal_version or ''})".strip()
-        puml.append(f"title <size:24>{title}</size>")
-        puml.append("")
-    puml.append("' Dynamic color definition by stereotype, shadow, spacing and vivid arrows")
-    puml.append(f"skinparam class {{\n{skinparam}\n}}\n")
+        yield f"title <size:24>{title}</size>"
+        yield ""
+    yield "' Dynamic color definition by stereotype, shadow, spacing and vivid arrows"
+    yield f"skinparam class {{\n{skinparam}\n}}\n"
     # 4b. Fictitious Plugins box
     if plugins:
-        puml.append('class "Plugins Used" as PluginsUsed <<(P,orchid)>> {')
+        yield 'class "Plugins Used" as PluginsUsed <<(P,orchid)>> {'
         for pl in plugins:
-            puml.append(f"  {pl}")
-        puml.append('}')
-        puml.append("")
+            yield f"  {pl}"
+        yield '}'
+        yield ""
     # 5. Group by stereotype AND name prefix
-    import collections
     def get_prefix(name):
         return name[0] if name and name[0].isalpha() else '_'
+    packages = defaultdict(lambda: defaultdict(list))
+    others = []
+    for entity in model.entities():
+        if entity.name in related_names:
+            packages[entity.stereotype][get_prefix(entity.name)].append(entity.index)
+        else:
+            others.append(entity.index)
     package_names = []
     for st in stereotypes:
-        items_by_prefix = collections.defaultdict(list)
-        for item in all_items:
-            if item['stereotype'] == st and item['name'] in related_names:
-                prefix = get_prefix(item['name'])
-                items_by_prefix[prefix].append(item)
+        items_by_prefix = packages.get(st)
         if not items_by_prefix:
             continue
         for prefix, items in sorted(items_by_prefix.items()):
             pkg_name = f"{st}s_{prefix}"  # Unique name for package
             package_names.append(pkg_name)
-            puml.append(f"package \"{st}s - {prefix}*\" as {pkg_name} <<Rectangle>> {{")
-            for item in items:
-                kind = 'struct' if st.lower() == 'struct' else ('interface' if st.lower() == 'interface' else ('enum' if st.lower() == 'enum' else 'class'))
-                stereotype_tag = f"<<{st}>>"
-                puml.append(f"  {kind} {item['name']} {stereotype_tag} {{")
-                for f in item['fields']:
-                    puml.append(f"    {f}")
-                if item['fields'] and item['methods']:
-                    puml.append("    --")
-                for m in item['methods']:
-                    puml.append(f"    {m}")
-                refs = class_to_external_refs.get(item['name'])
-                if refs:
-                    puml.append("    --")
-                    puml.append(f"    <<References: {', '.join(sorted(refs))}>>")
-                puml.append("  }")
-            puml.append("}")
-            puml.append("")
+            yield f"package \"{st}s - {prefix}*\" as {pkg_name} <<Rectangle>> {{"
+            for index in items:
+                entity = Entity(model, index)
+                yield from iter_entity_lines(entity, class_to_external_refs.get(entity.name))
+            yield "}"
+            yield ""
     # 6. Group Others (no relationships)
-    others = [item for item in all_items if item['name'] not in related_names]
     if others:
         package_names.append('Others')
-        puml.append('package "Others" as Others <<Rectangle>> {')
-        for item in others:
-            kind = 'struct' if item['stereotype'].lower() == 'struct' else ('interface' if item['stereotype'].lower() == 'interface' else ('enum' if item['stereotype'].lower() == 'enum' else 'class'))
-            stereotype_tag = f"<<{item['stereotype']}>>"
-            puml.append(f"  {kind} {item['name']} {stereotype_tag} {{")
-            for f in item['fields']:
-                puml.append(f"    {f}")
-            if item['fields'] and item['methods']:
-                puml.append("    --")
-            for m in item['methods']:
-                puml.append(f"    {m}")
-            puml.append("  }")
-        puml.append('}')
-        puml.append("")
+        yield 'package "Others" as Others <<Rectangle>> {'
+        for index in others:
+            yield from iter_entity_lines(Entity(model, index))
+        yield '}'
+        yield ""
     # 7. Invisible links to force vertical alignment of packages
     for i in range(len(package_names) - 1):
-        puml.append(f"{package_names[i]} --[hidden]--> {package_names[i+1]}")
+        yield f"{package_names[i]} --[hidden]--> {package_names[i+1]}"
     # 8. Relationships (custom colored arrows, highlighted label)
-    puml.append("' --- Relationships ---")
-    arrow_colors = {
-        '<|--': '#FF4500;line.bold', # Bright orange, inheritance
-        '..|>': '#1E90FF;line.dashed', # Bright blue, implements
-        '-->': '#32CD32;line.bold', # Bright green, association
-    }
-    for src, tgt, arrow, label in relations:
+    yield "' --- Relationships ---"
+    for kind, src, tgt, label in model.relations():
         if tgt in only_referenced:
             continue  # Do not draw arrow to external reference
-        puml.append(f"{src} {arrow} {tgt} : <b><size:16>{label}</size></b>")
-    puml.append("\n@enduml")
-    return '\n'.join(puml)
+        arrow, default_label = arrows[kind]
+        yield f"{src} {arrow} {tgt} : <b><size:16>{label or default_label}</size></b>"
+    yield "\n@enduml"
 
 if __name__ == '__main__':
     import sys
@@ -1,226 +1,337 @@
 import os
 import re
 from collections import defaultdict
-import json
+from FileDiscovery import iter_files
+from ParallelParse import parse_files
+from ParseCache import open_parse_cache
+from ModelExport import export_artifacts
+from ModelFocus import apply_focus
+from ModelPages import write_pages
+from PumlWriter import write_puml_lines, puml_summary
+from UmlModel import UmlModel, CLASS, STRUCT, ENUM, ATTRIBUTE, METHOD, STATIC_METHOD, VALUE, EXTENDS
+
+# Bump whenever parse_header_file changes its output, to invalidate cached entries
+PARSER_VERSION = 2
+
+# Comments and literals are blanked out (same length) before any other regex runs
+NOISE_PATTERN = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'', re.DOTALL)
+BRACE_PATTERN = re.compile(r'[{}]')
+# Heads of the scopes whose bodies are indexed: namespaces, classes/structs and enums (ending at their '{')
+SCOPE_PATTERN = re.compile(r"""
+    \b(?:
+        namespace(?:\s+(?P<ns_name>\w+(?:\s*::\s*\w+)*))?
+      | (?P<kind>class|struct)\s+(?:[A-Z][A-Z0-9_]+\s+)?(?P<name>\w+)(?:\s+final)?\s*(?::(?P<bases>[^{};]*))?
+      | enum(?:\s+(?:class|struct))?\s+(?P<enum_name>\w+)\s*(?::\s*[\w:\s]+)?
+    )\s*\{""", re.VERBOSE)
+# Template prefix right before a class head (looked up in a bounded window)
+TEMPLATE_PATTERN = re.compile(r'template\s*<([^<>]*(?:<[^<>]*>[^<>]*)*)>\s*$')
+TEMPLATE_WINDOW = 256
+# Member regexes only start at the beginning of a type token, so no match attempt is made from inside a word
+# Regex for methods (very basic, ignores templates/macros)
+METHOD_PATTERN = re.compile(r'(?<![\w:<>*&])([\w:<>*&]+)\s+(\w+)\s*\(([^)]*)\)\s*(const)?\s*;')
+# Regex for static methods
+STATIC_METHOD_PATTERN = re.compile(r'static\s+([\w:<>*&]+)\s+(\w+)\s*\(([^)]*)\)\s*(const)?\s*;')
+# Regex for attributes (very basic)
+ATTR_PATTERN = re.compile(r'(?<![\w:<>*&])([\w:<>*&]+)\s+(\w+)\s*;')
+# Valid (possibly qualified) names for the emitter
+QUALIFIED_NAME = re.compile(r'^[A-Za-z_]\w*(?:::[A-Za-z_]\w*)*$')
+
+def mask_comments_and_strings(content):
+    """Replaces comments and string/char literals with spaces, keeping every offset unchanged."""
+    return NOISE_PATTERN.sub(lambda m: ' ' * len(m.group()), content)
+
+def build_brace_index(content):
+    """
+    One stack pass over the '{'/'}' of `content`: returns {open_pos: close_pos} in order of the
+    opening braces. Unbalanced braces are dropped.
+    """
+    index = {}
+    stack = []
+    for m in BRACE_PATTERN.finditer(content):
+        if m.group() == '{':
+            stack.append(m.start())
+            index[m.start()] = None
+        elif stack:
+            index[stack.pop()] = m.start()
+    for pos in stack:
+        del index[pos]
+    return index
+
+def split_bases(bases_str):
+    """Splits 'public A, private B<C, D>' into base names ['A', 'B'] (commas inside <> are kept)."""
+    bases = []
+    depth = 0
+    current = []
+    for ch in bases_str + ',':
+        if ch == '<':
+            depth += 1
+        elif ch == '>':
+            depth -= 1
+        elif ch == ',' and depth <= 0:
+            base = re.sub(r'<.*', '', ''.join(current), flags=re.DOTALL).strip()
+            if base:
+                bases.append(base.split()[-1].lstrip(':'))
+            current = []
+            continue
+        current.append(ch)
+    return bases
+
+def scan_scopes(content):
+    """
+    Indexes every namespace, class/struct and enum body of a header in linear time.
+    Returns scope dicts {'kind', 'name', 'bases', 'template', 'text'} in source order, where 'name'
+    is qualified with the enclosing namespaces/classes ('ns::Outer::Inner') and 'text' is the
+    scope's own body: nested type bodies are cut out and other nested blocks (inline function
+    bodies, brace initializers) are replaced by ';'.
+    """
+    masked = mask_comments_and_strings(content)
+    heads = {m.end() - 1: m for m in SCOPE_PATTERN.finditer(masked)}
+    brace_index = build_brace_index(masked)
+    scopes = []
+    # Enclosing blocks: [close_pos, scope dict or None, qualified prefix]
+    stack = []
+    for open_pos, close_pos in brace_index.items():
+        while stack and stack[-1][0] < open_pos:
+            stack.pop()
+        parent = stack[-1][1] if stack else None
+        prefix = stack[-1][2] if stack else ''
+        head = heads.get(open_pos)
+        if head is None:
+            if parent is not None:
+                parent['children'].append((open_pos, close_pos, False))
+            stack.append([close_pos, None, prefix])
+            continue
+        start = head.start()
+        template = None
+        if head.group('kind'):
+            kind, name = head.group('kind'), head.group('name')
+            window_start = max(0, start - TEMPLATE_WINDOW)
+            template_match = TEMPLATE_PATTERN.search(masked, window_start, start)
+            if template_match:
+                template = ' '.join(template_match.group(1).split())
+                start = template_match.start()
+        elif head.group('enum_name'):
+            kind, name = 'enum', head.group('enum_name')
+        else:
+            kind, name = 'namespace', head.group('ns_name')
+            if name:
+                name = re.sub(r'\s+', '', name)
+        if parent is not None:
+            parent['children'].append((start, close_pos, kind != 'namespace'))
+        # Anonymous namespaces do not add a qualifier
+        qualified = f'{prefix}::{name}' if prefix and name else (name or prefix)
+        scope = {
+            'kind': kind,
+            'name': qualified,
+            'bases': split_bases(head.group('bases') or ''),
+            'template': template,
+            'open': open_pos,
+            'close': close_pos,
+            'children': [],
+        }
+        scopes.append(scope)
+        stack.append([close_pos, scope, qualified])
+    for scope in scopes:
+        parts = []
+        pos = scope['open'] + 1
+        for child_start, child_end, named in scope.pop('children'):
+            parts.append(masked[pos:child_start])
+            if not named:
+                parts.append(';')
+            pos = child_end + 1
+        parts.append(masked[pos:scope.pop('close')])
+        del scope['open']
+        scope['text'] = ''.join(parts)
+    return scopes
+
+def extract_members(body):
+    """Returns (methods, static_methods, attributes) names declared directly in a class body."""
+    static_methods = [m[1] for m in STATIC_METHOD_PATTERN.findall(body)]
+    static_set = set(static_methods)
+    methods = [m[1] for m in METHOD_PATTERN.findall(body) if m[1] not in static_set]
+    attributes = [a[1] for a in ATTR_PATTERN.findall(body)]
+    return methods, static_methods, attributes
+
+def enum_values(body):
+    return [v.strip().split('=')[0].strip() for v in body.split(',') if v.strip()]
 
 def extract_classes_from_cpp(file_content):
     classes = {}
     enums = {}
-    # Regex for class/struct with optional inheritance
-    class_pattern = re.compile(r'\b(class|struct)\s+(\w+)\s*(?::\s*([\w\s:,]+))?\s*{', re.MULTILINE)
-    # Regex for enums
-    enum_pattern = re.compile(r'\benum\s+(class\s+)?(\w+)\s*{', re.MULTILINE)
-    # Regex for templates
-    template_pattern = re.compile(r'template\s*<([^>]*)>')
-    # Regex for methods (very basic, ignores templates/macros)
-    method_pattern = re.compile(r'(?:public:|protected:|private:)?\s*([\w:<>*&]+)\s+(\w+)\s*\(([^)]*)\)\s*(const)?\s*;')
-    # Regex for static methods
-    static_method_pattern = re.compile(r'static\s+([\w:<>*&]+)\s+(\w+)\s*\(([^)]*)\)\s*(const)?\s*;')
-    # Regex for attributes (very basic)
-    attr_pattern = re.compile(r'(?:public:|protected:|private:)?\s*([\w:<>*&]+)\s+(\w+)\s*;')
-    
-    for enum_match in enum_pattern.finditer(file_content):
-        enum_name = enum_match.group(2)
-        start = enum_match.end()
-        brace_count = 1
-        i = start
-        while brace_count > 0 and i < len(file_content):
-            if file_content[i] == '{':
-                brace_count += 1
-            elif file_content[i] == '}':
-                brace_count -= 1
-            i += 1
-        enum_body = file_content[start:i]
-        values = [v.strip().split('=')[0].strip() for v in enum_body.split(',') if v.strip()]
-        enums[enum_name] = values
-
-    for class_match in class_pattern.finditer(file_content):
-        kind, class_name, inheritance = class_match.groups()
-        start = class_match.end()
-        # Find the class body (naive: count braces)
-        brace_count = 1
-        i = start
-        while brace_count > 0 and i < len(file_content):
-            if file_content[i] == '{':
-                brace_count += 1
-            elif file_content[i] == '}':
-                brace_count -= 1
-            i += 1
-        class_body = file_content[start:i]
-        bases = []
-        if inheritance:
-            bases = [b.strip().split(' ')[-1] for b in inheritance.split(',')]
-        # Detect templates
-        template_match = template_pattern.search(file_content, 0, class_match.start())
-        template_params = template_match.group(1) if template_match else None
-        # Static methods
-        static_methods = [m[1] for m in static_method_pattern.findall(class_body)]
-        # Regular methods
-        methods = [m[1] for m in method_pattern.findall(class_body) if m[1] not in static_methods]
-        # Attributes
-        attributes = [a[1] for a in attr_pattern.findall(class_body)]
-        classes[class_name] = {
-            'kind': kind,
-            'bases': bases,
-            'methods': methods,
-            'static_methods': static_methods,
-            'attributes': attributes,
-            'template': template_params,
-        }
+    for scope in scan_scopes(file_content):
+        if scope['kind'] == 'enum':
+            enums[scope['name']] = enum_values(scope['text'])
+        elif scope['kind'] != 'namespace':
+            methods, static_methods, attributes = extract_members(scope['text'])
+            classes[scope['name']] = {
+                'kind': scope['kind'],
+                'bases': scope['bases'],
+                'methods': methods,
+                'static_methods': static_methods,
+                'attributes': attributes,
+                'template': scope['template'],
+            }
     return classes, enums
 
-def parse_headers_to_uml_json(project_dir):
+def parse_header_file(path):
     """
-    Scans all .h/.hpp headers and generates a UML-compliant JSON (PlantUML class diagram):
-    - classes, structs, enums
-    - ALL attributes and methods (with visibility)
-    - relationships: extends (inheritance), implements (interface)
+    Parses one .h/.hpp header into {"classes", "enums", "relations"}.
+    Class and enum names are qualified with their namespaces and enclosing classes.
+    Runs independently per file, so it can be used as a ParallelParse worker.
     """
-    uml_json = {
+    file_json = {
         "classes": [],
         "enums": [],
         "relations": []
     }
-    # Varrer arquivos .h e .hpp
-    for root, _, files in os.walk(project_dir):
-        for file in files:
-            if file.endswith('.h') or file.endswith('.hpp'):
-                path = os.path.join(root, file)
-                try:
-                    with open(path, encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                    # Regex para classes/structs
-                    class_pattern = re.compile(r'\b(class|struct)\s+(\w+)\s*(?::\s*([\w\s:,]+))?\s*{', re.MULTILINE)
-                    # Regex para enums
-                    enum_pattern = re.compile(r'\benum\s+(class\s+)?(\w+)\s*{', re.MULTILINE)
-                    # Encontrar classes/structs
-                    for match in class_pattern.finditer(content):
-                        kind, cname, bases_str = match.groups()
-                        bases = [b.strip().split(' ')[-1] for b in bases_str.split(',')] if bases_str else []
-                        # Extrair corpo da classe
-                        start = match.end()
-                        end = content.find('};', start)
-                        class_body = content[start:end] if end != -1 else ''
-                        # Extrair métodos e atributos
-                        method_pattern = re.compile(r'(?:public:|protected:|private:)?\s*([\w:\u003c\u003e\*\&]+)\s+(\w+)\s*\(([^)]*)\)\s*(const)?\s*;')
-                        attr_pattern = re.compile(r'(?:public:|protected:|private:)?\s*([\w:\u003c\u003e\*\&]+)\s+(\w+)\s*;')
-                        static_method_pattern = re.compile(r'static\s+([\w:\u003c\u003e\*\&]+)\s+(\w+)\s*\(([^)]*)\)\s*;')
-                        static_methods = [m[1] for m in static_method_pattern.findall(class_body)]
-                        methods = [m[1] for m in method_pattern.findall(class_body) if m[1] not in static_methods]
-                        attributes = [a[1] for a in attr_pattern.findall(class_body)]
-                        uml_json["classes"].append({
-                            "name": cname,
-                            "kind": kind,
-                            "bases": bases,
-                            "methods": methods,
-                            "static_methods": static_methods,
-                            "attributes": attributes,
-                            "template": None
-                        })
-                        for base in bases:
-                            uml_json["relations"].append({
-                                "type": "<|--",
-                                "from": base,
-                                "to": cname
-                            })
-                    # Encontrar enums
-                    for ematch in enum_pattern.finditer(content):
-                        _, ename = ematch.groups()
-                        start = ematch.end()
-                        end = content.find('};', start)
-                        enum_body = content[start:end] if end != -1 else ''
-                        values = [line.strip().split('=')[0].strip().split('//')[0].strip() for line in enum_body.split('\n') if line.strip() and not line.strip().startswith('//') and line.strip() != '}']
-                        uml_json["enums"].append({
-                            "name": ename,
-                            "values": values
-                        })
-                except Exception as e:
-                    print(f"[UML] Error reading {path}: {e}")
-    return uml_json
-
-def generate_puml_from_json(uml_json, project_dir=None):
+    try:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        classes, enums = extract_classes_from_cpp(content)
+        for cname, data in classes.items():
+            file_json["classes"].append({"name": cname, **data})
+            for base in data['bases']:
+                # Bases are kept as written; merge_header_results qualifies them
+                file_json["relations"].append({
+                    "type": "<|--",
+                    "from": base,
+                    "to": cname
+                })
+        for ename, values in enums.items():
+            file_json["enums"].append({
+                "name": ename,
+                "values": values
+            })
+    except Exception as e:
+        print(f"[UML] Error reading {path}: {e}")
+    return file_json
+
+def parse_headers_to_model(project_dir, jobs=1, cache=None):
+    """
+    Scans all .h/.hpp headers and builds the UML model (PlantUML class diagram):
+    - classes, structs, enums
+    - ALL attributes and methods (with visibility)
+    - relationships: extends (inheritance), implements (interface)
+    Headers are parsed on `jobs` processes and merged in path order.
+    """
+    # Varrer arquivos .h e .hpp (pastas de build e caminhos ignorados são pulados)
+    headers = iter_files(project_dir, ('.h', '.hpp'), language='cpp')
+    return merge_header_results(parse_files(headers, parse_header_file, jobs=jobs, cache=cache, version=PARSER_VERSION))
+
+def resolve_base(base, derived, defined_names):
     """
-    Generates PlantUML from UML JSON (compatível com Unreal/PlantUML).
+    Qualifies a base class name as C++ lookup would: from the scope enclosing `derived` outwards,
+    falling back to the name as written.
     """
-    puml_lines = ["@startuml"]
-    puml_lines.append('skinparam backgroundColor #23272e')
-    puml_lines.append('skinparam classFontColor #ffffff')
-    puml_lines.append('skinparam classAttributeFontColor #ffffff')
-    puml_lines.append('skinparam classMethodFontColor #ffffff')
-    puml_lines.append('skinparam classStereotypeFontColor #ffffff')
-    puml_lines.append('skinparam classBorderColor #d19a66') # Orange for C++
-    puml_lines.append('skinparam classBackgroundColor #23272e')
-    puml_lines.append('skinparam ArrowColor #f5f5f5')
-    puml_lines.append('left to right direction')
-    puml_lines.append('hide empty members')
-    puml_lines.append('title C++ Project UML')
-    puml_lines.append('')
+    base = base.lstrip(':')
+    scope = derived.split('::')[:-1]
+    for k in range(len(scope), 0, -1):
+        candidate = '::'.join(scope[:k] + [base])
+        if candidate in defined_names:
+            return candidate
+    return base
+
+def merge_header_results(results):
+    """Merges the per-header results of parse_header_file (in path order) into one UmlModel."""
+    model = UmlModel()
+    for _, file_json in results:
+        for class_data in file_json["classes"]:
+            model.add_entity(class_data["name"], STRUCT if class_data["kind"] == 'struct' else CLASS,
+                             template=class_data["template"] or '')
+            for attr in class_data["attributes"]:
+                model.add_member(ATTRIBUTE, attr)
+            for smethod in class_data["static_methods"]:
+                model.add_member(STATIC_METHOD, smethod)
+            for method in class_data["methods"]:
+                model.add_member(METHOD, method)
+    for _, file_json in results:
+        for enum_data in file_json["enums"]:
+            model.add_entity(enum_data["name"], ENUM)
+            for value in enum_data["values"]:
+                model.add_member(VALUE, value)
+    defined_names = {entity.id for entity in model.entities()}
+    for _, file_json in results:
+        for rel in file_json["relations"]:
+            model.add_relation(EXTENDS, rel["to"], resolve_base(rel["from"], rel["to"], defined_names))
+    return model
+
+def generate_puml_from_model(model, project_dir=None, output_file=None):
+    """Writes CppProject.puml (or `output_file`) for the UmlModel and returns its path."""
+    output_file = output_file or os.path.join(project_dir or '.', "CppProject.puml")
+    return write_puml_lines(output_file, iter_puml_from_model(model), model)
+
+
+def iter_puml_from_model(model):
+    """
+    Generates PlantUML from the UmlModel (compatível com Unreal/PlantUML).
+    """
+    yield "@startuml"
+    yield 'skinparam backgroundColor #23272e'
+    yield 'skinparam classFontColor #ffffff'
+    yield 'skinparam classAttributeFontColor #ffffff'
+    yield 'skinparam classMethodFontColor #ffffff'
+    yield 'skinparam classStereotypeFontColor #ffffff'
+    yield 'skinparam classBorderColor #d19a66' # Orange for C++
+    yield 'skinparam classBackgroundColor #23272e'
+    yield 'skinparam ArrowColor #f5f5f5'
+    yield 'left to right direction'
+    yield 'hide empty members'
+    yield 'title C++ Project UML'
+    # Nested classes and namespaces are emitted with qualified names (ns::Outer::Inner)
+    yield 'set namespaceSeparator ::'
+    yield ''
 
     # Proteção: só nomes válidos
     defined_names = set()
-    for class_data in uml_json["classes"]:
-        cname = class_data["name"].strip()
-        if not cname or not re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', cname):
+    member_formats = {ATTRIBUTE: '  +{}', STATIC_METHOD: '  {{static}} +{}()', METHOD: '  +{}()', VALUE: '  {}'}
+    for entity in model.entities():
+        cname = entity.id.strip()
+        if not cname or not QUALIFIED_NAME.match(cname):
             continue
         defined_names.add(cname)
-        stereotype = '<<struct>>' if class_data["kind"] == 'struct' else '<<class>>'
-        template = f'<{class_data["template"]}>' if class_data["template"] else ''
-        puml_lines.append(f'class {cname}{template} {stereotype} {{')
-        for attr in class_data["attributes"]:
-            if attr.strip():
-                puml_lines.append(f'  +{attr}')
-        for smethod in class_data["static_methods"]:
-            if smethod.strip():
-                puml_lines.append(f'  {{static}} +{smethod}()')
-        for method in class_data["methods"]:
-            if method.strip():
-                puml_lines.append(f'  +{method}()')
-        puml_lines.append('}')
-    for enum_data in uml_json["enums"]:
-        ename = enum_data["name"].strip()
-        if not ename or not re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', ename):
-            continue
-        defined_names.add(ename)
-        puml_lines.append(f'enum {ename} {{')
-        for value in enum_data["values"]:
-            if value.strip():
-                puml_lines.append(f'  {value}')
-        puml_lines.append('}')
-    for relation in uml_json["relations"]:
-        src = relation["from"].strip()
-        tgt = relation["to"].strip()
+        if entity.kind == ENUM:
+            yield f'enum {cname} {{'
+        else:
+            stereotype = '<<struct>>' if entity.kind == STRUCT else '<<class>>'
+            template = f'<{entity.template}>' if entity.template else ''
+            yield f'class {cname}{template} {stereotype} {{'
+        for member in entity.members():
+            if member.name.strip():
+                yield member_formats[member.kind].format(member.name)
+        yield '}'
+    for _, derived, base, _ in model.relations(EXTENDS):
+        src = base.strip()
+        tgt = derived.strip()
         if src in defined_names and tgt in defined_names:
-            puml_lines.append(f'{src} {relation["type"]} {tgt}')
-    puml_lines.append('@enduml')
-    output_file = os.path.join(project_dir or '.', "CppProject.puml")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(puml_lines))
-    return output_file
-
-from SVGRenderer import render_svg
-
-def main(project_dir):
-    uml_json = parse_headers_to_uml_json(project_dir)
-    json_file = os.path.join(project_dir, 'UML_ClassDiagram.json')
-    with open(json_file, 'w', encoding='utf-8') as jf:
-        json.dump(uml_json, jf, indent=2, ensure_ascii=False)
-    print(f'[UML] UML JSON saved at: {json_file}')
+            yield f'{src} <|-- {tgt}'
+    yield '@enduml'
 
-    try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            uml_json = json.load(f)
-    except Exception as e:
-        print(f"[UML] Error reading JSON to generate PUML: {e}")
-        return
+from SVGRenderer import render_svg, render_svgs, output_kind
 
-    puml_path = generate_puml_from_json(uml_json, project_dir)
-    print(f"[UML] PUML saved at: {puml_path}")
+def main(project_dir, jobs=1, use_cache=True, write_json=True, write_snapshot=True, focus=None, paging=None):
+    with open_parse_cache(project_dir, enabled=use_cache) as cache:
+        model = parse_headers_to_model(project_dir, jobs=jobs, cache=cache)
+    # --focus draws only the neighborhood of one class; the artifacts keep the full model
+    diagram = apply_focus(model, focus)
+    # The JSON and snapshot artifacts are written in the background; the PUML is generated from the model itself
+    export = export_artifacts(model, project_dir, 'UML_ClassDiagram', 'UML', write_json, write_snapshot)
 
-    svg = render_svg(puml_path)
+    if paging is not None:
+        puml_path, page_paths = write_pages(diagram, os.path.join(project_dir, 'CppProject_pages'),
+                                            lambda page, path: generate_puml_from_model(page, project_dir, path),
+                                            paging, 'C++ Project')
+        svgs = render_svgs(page_paths + [puml_path])
+        svg = svgs[-1] if svgs else None
+    else:
+        puml_path = generate_puml_from_model(diagram, project_dir)
+        svg = render_svg(puml_path)
+    print(f"[UML] PUML saved at: {puml_summary(puml_path)}")
     if svg:
-        print(f"[UML] SVG generated: {svg}")
+        print(f"[UML] {output_kind(svg)} generated: {svg}")
     else:
-        print(f"[UML] SVG not generated!")
+        print(f"[UML] {output_kind()} not generated!")
+    if export is not None:
+        export.wait()
 
 # Mantém o entrypoint CLI
 if __name__ == '__main__':
@@ -4,6 +4,11 @@ import sys
 import subprocess
 import webbrowser
 from collections import defaultdict
+from FileDiscovery import find_files
+from UmlModel import UmlModel, CLASS, ATTRIBUTE, METHOD, EXTENDS, ASSOCIATION
+from ModelFocus import apply_focus
+from ModelPages import write_pages
+from PumlWriter import write_puml_lines
 
 def extract_classes_methods_attributes(cs_code):
     class_regex = r'class\s+(\w+)\s*:\s*MonoBehaviour'
@@ -15,8 +20,11 @@ def extract_classes_methods_attributes(cs_code):
     attrs = re.findall(attr_regex, cs_code)
     return classes, methods, attrs
 
-def generate_puml(project_dir):
-    output_file = os.path.join(project_dir, "UnityProject.puml")
+def clean_name(name):
+    return re.sub(r'[^a-zA-Z0-9_]', '', name)
+
+def build_model(project_dir):
+    """Builds the UmlModel of a Unity project; classes are grouped (namespace) by their Unity base type."""
     class_defs = defaultdict(lambda: {'methods': [], 'attrs': [], 'base': None})
     relations = set()
     type_groups = {
@@ -25,128 +33,151 @@ def generate_puml(project_dir):
         'Component': {'color': '#6ee7b7', 'classes': []},
         'Other': {'color': '#ffb347', 'classes': []}
     }
-    package_styles = {
-        "MonoBehaviour": {"border": "#4e9fff", "background": "#4e9fff"},
-        "ScriptableObject": {"border": "#b57bff", "background": "#b57bff"},
-        "Other": {"border": "#ffb347", "background": "#ffb347"},
-    }
-    for root, _, files in os.walk(project_dir):
-        for file in files:
-            if file.endswith('.cs'):
-                path = os.path.join(root, file)
-                try:
-                    with open(path, encoding='utf-8', errors='ignore') as f:
-                        code = f.read()
-                    class_decl = re.findall(r'class\s+(\w+)\s*:\s*([\w, ]+)', code)
-                    for cls, bases in class_decl:
-                        base = bases.split(',')[0].strip()
-                        class_defs[cls]['base'] = base
-                        if base in type_groups:
-                            type_groups[base]['classes'].append(cls)
-                        elif base == 'MonoBehaviour':
-                            type_groups['MonoBehaviour']['classes'].append(cls)
-                        elif base == 'ScriptableObject':
-                            type_groups['ScriptableObject']['classes'].append(cls)
-                        elif base == 'Component':
-                            type_groups['Component']['classes'].append(cls)
-                        else:
-                            type_groups['Other']['classes'].append(cls)
-                        relations.add((cls, base, 'extends'))
-                    classes, methods, attrs = extract_classes_methods_attributes(code)
-                    for cls in classes:
-                        class_defs[cls]['file'] = path
-                    for m in methods:
-                        class_defs[cls]['methods'].append(m[0])
-                    for a in attrs:
-                        class_defs[cls]['attrs'].append(a[0])
-                    for a in attrs:
-                        atype = a[0]
-                        if atype in class_defs:
-                            relations.add((cls, atype, 'uses'))
-                except Exception:
-                    continue
-    def clean_name(name):
-        return re.sub(r'[^a-zA-Z0-9_]', '', name)
-    filtered_relations = []
+    # Library/PackageCache, Temp and ignored paths are skipped
+    for path in find_files(project_dir, ('.cs',), language='unity'):
+        try:
+            with open(path, encoding='utf-8', errors='ignore') as f:
+                code = f.read()
+            class_decl = re.findall(r'class\s+(\w+)\s*:\s*([\w, ]+)', code)
+            for cls, bases in class_decl:
+                base = bases.split(',')[0].strip()
+                class_defs[cls]['base'] = base
+                if base in type_groups:
+                    type_groups[base]['classes'].append(cls)
+                elif base == 'MonoBehaviour':
+                    type_groups['MonoBehaviour']['classes'].append(cls)
+                elif base == 'ScriptableObject':
+                    type_groups['ScriptableObject']['classes'].append(cls)
+                elif base == 'Component':
+                    type_groups['Component']['classes'].append(cls)
+                else:
+                    type_groups['Other']['classes'].append(cls)
+                relations.add((cls, base, 'extends'))
+            classes, methods, attrs = extract_classes_methods_attributes(code)
+            for cls in classes:
+                class_defs[cls]['file'] = path
+            for m in methods:
+                class_defs[cls]['methods'].append(m[0])
+            for a in attrs:
+                class_defs[cls]['attrs'].append(a[0])
+            for a in attrs:
+                atype = a[0]
+                if atype in class_defs:
+                    relations.add((cls, atype, 'uses'))
+        except Exception:
+            continue
+    model = UmlModel()
+    defined_classes = set()
+    for ptype, info in type_groups.items():
+        for cls in info['classes']:
+            cname = clean_name(cls)
+            if cname in defined_classes:
+                continue
+            model.add_entity(cname, CLASS, namespace=clean_name(ptype), stereotype=ptype)
+            data = class_defs.get(cls, {'attrs': [], 'methods': []})
+            for attr in data['attrs']:
+                model.add_member(ATTRIBUTE, clean_name(attr))
+            for meth in data['methods']:
+                model.add_member(METHOD, clean_name(meth))
+            defined_classes.add(cname)
     for src, dst, rel in relations:
         src_clean = clean_name(src)
         dst_clean = clean_name(dst)
         if src_clean and (rel != 'extends' or dst_clean):
-            filtered_relations.append((src, dst, rel))
+            model.add_relation(EXTENDS if rel == 'extends' else ASSOCIATION, src_clean, dst_clean, rel)
+    return model
+
+def generate_puml(project_dir, model=None, focus=None, paging=None, output_file=None):
+    """
+    Writes UnityProject.puml (or `output_file`) for the model (built from `project_dir` when not given)
+    and returns its path. With a `focus`, only the neighborhood of that class is drawn; with `paging`,
+    the diagram is split into pages and the index page path is returned.
+    """
+    if model is None:
+        model = build_model(project_dir)
+    model = apply_focus(model, focus)
+    if paging is not None:
+        index_path, _ = write_pages(model, os.path.join(project_dir, 'UnityProject_pages'),
+                                    lambda page, path: generate_puml(project_dir, page, output_file=path), paging,
+                                    'Unity Project')
+        return index_path
+    output_file = output_file or os.path.join(project_dir, "UnityProject.puml")
+    write_puml_lines(output_file, iter_puml(model), model)
+    return output_file
+
+def iter_puml(model):
+    """Yields the lines of the Unity PUML of the model."""
     base_visuals = [
         ('MonoBehaviour', '#4e9fff'),
         ('ScriptableObject', '#b57bff'),
         ('Component', '#6ee7b7')
     ]
     defined_classes = set()
-    all_bases = set(clean_name(dst) for _, dst, rel in filtered_relations if rel == 'extends')
-    all_defined = set(clean_name(cls) for cls in class_defs.keys())
+    all_bases = set(dst for _, _, dst, _ in model.relations(EXTENDS))
+    all_defined = set(entity.id for entity in model.entities())
     extra_bases = all_bases - all_defined - set(clean_name(b[0]) for b in base_visuals)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('@startuml\n')
-        f.write('skinparam backgroundColor #1e1e1e\n')
-        f.write('skinparam classAttributeIconSize 0\n')
-        f.write('skinparam defaultTextAlignment center\n')
-        f.write('skinparam shadowing true\n')
-        f.write('skinparam classFontColor #ffffff\n')
-        f.write('skinparam classAttributeFontColor #ffffff\n')
-        f.write('skinparam classMethodFontColor #ffffff\n')
-        f.write('skinparam classStereotypeFontColor #ffffff\n')
-        f.write('skinparam classBorderColor #bbbbbb\n')
-        f.write('skinparam classBackgroundColor #23272e\n')
-        f.write('skinparam ArrowColor #f5f5f5\n')
-        f.write('left to right direction\n')
-        f.write('skinparam package<<MonoBehaviour>> {\n')
-        f.write('  BorderColor #4e9fff\n')
-        f.write('  BackgroundColor #4e9fff\n')
-        f.write('}\n')
-        f.write('skinparam package<<ScriptableObject>> {\n')
-        f.write('  BorderColor #b57bff\n')
-        f.write('  BackgroundColor #b57bff\n')
-        f.write('}\n')
-        f.write('skinparam package<<Other>> {\n')
-        f.write('  BorderColor #ffb347\n')
-        f.write('  BackgroundColor #ffb347\n')
-        f.write('}\n')
-        package_names = set()
-        for ptype, info in type_groups.items():
-            if info['classes']:
-                pname = clean_name(ptype)
-                f.write(f'package "{pname}" <<{pname}>> {{\n')
-                package_names.add(pname)
-                for cls in info['classes']:
-                    cname = clean_name(cls)
-                    if cname not in defined_classes:
-                        data = class_defs.get(cls, {'attrs': [], 'methods': []})
-                        if data['attrs'] or data['methods']:
-                            f.write(f'    class {cname} {{\n')
-                            for attr in data['attrs']:
-                                f.write(f'        +{clean_name(attr)}\n')
-                            for meth in data['methods']:
-                                f.write(f'        +{clean_name(meth)}()\n')
-                            f.write('    }\n')
-                        else:
-                            f.write(f'    class {cname}\n')
-                        defined_classes.add(cname)
-                f.write('}\n')
-        for base, color in base_visuals:
-            bname = clean_name(base)
-            if bname not in defined_classes and bname not in package_names:
-                f.write(f'abstract class {bname} <<(A,#cccccc)>>\n')
-                defined_classes.add(bname)
-        for base in extra_bases:
-            if base and base not in defined_classes:
-                f.write(f'abstract class {base} <<(A,#888888)>>\n')
-                defined_classes.add(base)
-        for src, dst, rel in filtered_relations:
-            src_clean = clean_name(src)
-            dst_clean = clean_name(dst)
-            if rel == 'extends' and dst_clean:
-                f.write(f'{src_clean} --|> {dst_clean}\n')
-            elif rel == 'uses':
-                f.write(f'{src_clean} ..> {dst_clean} : uses\n')
-        f.write('@enduml\n')
-    return output_file
+    yield '@startuml'
+    yield 'skinparam backgroundColor #1e1e1e'
+    yield 'skinparam classAttributeIconSize 0'
+    yield 'skinparam defaultTextAlignment center'
+    yield 'skinparam shadowing true'
+    yield 'skinparam classFontColor #ffffff'
+    yield 'skinparam classAttributeFontColor #ffffff'
+    yield 'skinparam classMethodFontColor #ffffff'
+    yield 'skinparam classStereotypeFontColor #ffffff'
+    yield 'skinparam classBorderColor #bbbbbb'
+    yield 'skinparam classBackgroundColor #23272e'
+    yield 'skinparam ArrowColor #f5f5f5'
+    yield 'left to right direction'
+    yield 'skinparam package<<MonoBehaviour>> {'
+    yield '  BorderColor #4e9fff'
+    yield '  BackgroundColor #4e9fff'
+    yield '}'
+    yield 'skinparam package<<ScriptableObject>> {'
+    yield '  BorderColor #b57bff'
+    yield '  BackgroundColor #b57bff'
+    yield '}'
+    yield 'skinparam package<<Other>> {'
+    yield '  BorderColor #ffb347'
+    yield '  BackgroundColor #ffb347'
+    yield '}'
+    packages = defaultdict(list)
+    for entity in model.entities():
+        packages[entity.namespace].append(entity)
+    package_names = set()
+    for pname, entities in packages.items():
+        yield f'package "{pname}" <<{pname}>> {{'
+        package_names.add(pname)
+        for entity in entities:
+            attrs = entity.member_names(ATTRIBUTE)
+            methods = entity.member_names(METHOD)
+            if attrs or methods:
+                yield f'    class {entity.id} {{'
+                for attr in attrs:
+                    yield f'        +{attr}'
+                for meth in methods:
+                    yield f'        +{meth}()'
+                yield '    }'
+            else:
+                yield f'    class {entity.id}'
+            defined_classes.add(entity.id)
+        yield '}'
+    for base, color in base_visuals:
+        bname = clean_name(base)
+        if bname not in defined_classes and bname not in package_names:
+            yield f'abstract class {bname} <<(A,#cccccc)>>'
+            defined_classes.add(bname)
+    for base in extra_bases:
+        if base and base not in defined_classes:
+            yield f'abstract class {base} <<(A,#888888)>>'
+            defined_classes.add(base)
+    for kind, src, dst, label in model.relations():
+        if kind == EXTENDS and dst:
+            yield f'{src} --|> {dst}'
+        elif kind == ASSOCIATION:
+            yield f'{src} ..> {dst} : {label}'
+    yield '@enduml'
+    yield ''
 
 def main():
     if len(sys.argv) > 1:
@@ -154,14 +185,15 @@ def main():
         os.chdir(root_folder)
         print(f"[UML] Running for Unity3D C# in folder: {root_folder}")
         try:
+            # Imported before the diagram is written, so the native renderer gets its model
+            from SVGRenderer import render_svg, output_kind
             puml_file = generate_puml(root_folder)
             print(f"[UML] PUML generated: {puml_file}")
-            from SVGRenderer import render_svg
             svg = render_svg(puml_file)
             if svg:
-                print(f"[UML] SVG generated: {svg}")
+                print(f"[UML] {output_kind(svg)} generated: {svg}")
             else:
-                print("[UML] SVG not generated!")
+                print(f"[UML] {output_kind()} not generated!")
                 sys.exit(1)
         except Exception as e:
             print(f"[UML] Error: {e}")
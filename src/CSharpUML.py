@@ -1,168 +1,504 @@
 import os
 import re
-import json
 from collections import defaultdict
-from SVGRenderer import render_svg
+from SVGRenderer import render_svg, render_svgs, output_kind
+from FileDiscovery import iter_files
+from ParallelParse import parse_files
+from ParseCache import open_parse_cache
+from ModelExport import export_artifacts
+from ModelFocus import apply_focus
+from ModelPages import write_pages
+from PumlWriter import write_puml_lines, puml_summary
+from UmlModel import UmlModel, CLASS, STRUCT, INTERFACE, ENUM, ATTRIBUTE, METHOD, VALUE, EXTENDS, IMPLEMENTS
 
-def sanitize_name(name, used_names):
-    """Sanitize entity names for PlantUML: avoid reserved words, duplicates, and invalid chars."""
-    reserved = {
-        'if', 'for', 'from', 'to', 'class', 'interface', 'enum', 'package', 'abstract', 'extends', 'implements',
-        'return', 'default', 'public', 'private', 'protected', 'internal', 'static', 'void', 'new', 'null', 'true', 'false',
-        'members', 'preferences', 'interfaces', 'MainApp', 'DialogHelper', 'OperationControl', 'BetterMenu', 'BetterMenuItem', 'BetterToggleMenuItem', 'from'
-    }
-    # Remove invalid chars, keep alphanum and _
+# Bump whenever extract_raw_entities changes its output, to invalidate cached entries
+PARSER_VERSION = 2
+
+RESERVED_NAMES = {
+    'if', 'for', 'from', 'to', 'class', 'interface', 'enum', 'package', 'abstract', 'extends', 'implements',
+    'return', 'default', 'public', 'private', 'protected', 'internal', 'static', 'void', 'new', 'null', 'true', 'false',
+    'members', 'preferences', 'interfaces', 'MainApp', 'DialogHelper', 'OperationControl', 'BetterMenu', 'BetterMenuItem', 'BetterToggleMenuItem', 'from'
+}
+
+# One scan drops comments, string/char literals and preprocessor lines and keeps code tokens
+TOKEN_PATTERN = re.compile(r"""
+    //[^\n]*
+  | /\*.*?\*/
+  | ^[ \t]*\#[^\n]*
+  | \$*\"\"\"[\s\S]*?\"\"\"
+  | \$?@\$?"(?:""|[^"])*"
+  | \$?"(?:\\.|[^"\\\n])*"
+  | '(?:\\.|[^'\\\n])*'
+  | (@?[A-Za-z_]\w*
+  | \d[\w.]*
+  | =>|\?\?|[{}()\[\];:,<>=.?~+\-*/%&|^!])
+""", re.VERBOSE | re.MULTILINE | re.DOTALL)
+
+TYPE_KEYWORDS = {'class', 'interface', 'struct', 'enum', 'record'}
+MODIFIERS = {'public', 'private', 'protected', 'internal', 'static', 'abstract', 'sealed', 'partial', 'unsafe',
+             'readonly', 'new', 'file', 'virtual', 'override', 'extern', 'async', 'const', 'volatile', 'required',
+             'ref', 'fixed', 'event'}
+STRUCTURAL_TOKENS = {'{', '}', ';', '[', 'namespace', 'using'} | TYPE_KEYWORDS
+
+
+def sanitize_identifier(name):
+    """Makes a name valid for PlantUML: invalid chars become '_' and reserved words get an '_Entity' suffix."""
     clean = re.sub(r'[^a-zA-Z0-9_]', '_', name)
-    # Avoid reserved words
-    if clean.lower() in reserved:
+    if clean.lower() in RESERVED_NAMES:
         clean = f'{clean}_Entity'
-    # Avoid duplicates
-    base = clean
-    i = 2
-    while clean in used_names:
-        clean = f'{base}_{i}'
-        i += 1
-    used_names.add(clean)
     return clean
 
 
+def sanitize_name(name, used_names):
+    """
+    Sanitize entity names for PlantUML: avoid reserved words, duplicates, and invalid chars.
+    `used_names` maps every name handed out in one namespace to the next suffix to try, so a
+    duplicate gets its suffix in O(1) instead of probing _2, _3, ... one by one.
+    """
+    clean = sanitize_identifier(name)
+    count = used_names.get(clean)
+    if count is None:
+        used_names[clean] = 2
+        return clean
+    candidate = f'{clean}_{count}'
+    while candidate in used_names:
+        count += 1
+        candidate = f'{clean}_{count}'
+    used_names[clean] = count + 1
+    used_names[candidate] = 2
+    return candidate
+
+
 def scan_cs_files(project_dir):
-    """Recursively find all .cs files in the project directory."""
-    cs_files = []
-    for root, _, files in os.walk(project_dir):
-        for f in files:
-            if f.endswith('.cs'):
-                cs_files.append(os.path.join(root, f))
-    return cs_files
-
-
-def extract_classes_methods_attributes(cs_file, used_names):
-    """Extract classes, inheritance, interfaces, methods, and attributes from a C# file."""
-    classes = {}
-    relations = []
-    with open(cs_file, encoding='utf-8') as f:
+    """Recursively yield all .cs files in the project directory (bin/obj and ignored paths are skipped)."""
+    return iter_files(project_dir, ('.cs',), language='csharp')
+
+
+def tokenize(content):
+    return [t for t in TOKEN_PATTERN.findall(content) if t]
+
+
+def _is_word(token):
+    return token[0].isalnum() or token[0] in '_@'
+
+
+def _skip_balanced(tokens, i, open_tok, close_tok):
+    """`tokens[i]` is `open_tok`; returns the index just after its matching `close_tok`."""
+    depth = 0
+    n = len(tokens)
+    while i < n:
+        t = tokens[i]
+        if t == open_tok:
+            depth += 1
+        elif t == close_tok:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return n
+
+
+def _split_top_level(tokens):
+    """Splits tokens on ',' outside of (), <>, [] and {}."""
+    parts = [[]]
+    depth = 0
+    for t in tokens:
+        if t in ('(', '<', '[', '{'):
+            depth += 1
+        elif t in (')', '>', ']', '}'):
+            depth -= 1
+        elif t == ',' and depth <= 0:
+            parts.append([])
+            continue
+        parts[-1].append(t)
+    return [p for p in parts if p]
+
+
+def _type_name(tokens):
+    """'Game . Core . Base < T >' -> 'Game.Core.Base' (generic arguments dropped)."""
+    if '<' in tokens:
+        tokens = tokens[:tokens.index('<')]
+    return ''.join(t for t in tokens if t not in MODIFIERS).lstrip('@')
+
+
+def _add_member(stmt, entity):
+    """Adds the method, field, property or event declared by the statement tokens `stmt` to `entity`."""
+    while stmt and stmt[0] in MODIFIERS:
+        stmt = stmt[1:]
+    if not stmt or stmt[0] in ('delegate', 'using', '~'):
+        return
+    depth = 0
+    paren = None
+    for idx, t in enumerate(stmt):
+        if t in ('<', '['):
+            depth += 1
+        elif t in ('>', ']'):
+            depth -= 1
+        elif t in ('=', '=>') and depth <= 0:
+            break
+        elif t == '(' and depth <= 0:
+            paren = idx
+            break
+    if paren is not None:
+        name_idx = paren - 1
+        if name_idx >= 0 and stmt[name_idx] == '>':
+            # Generic method: Foo<T>(...)
+            while name_idx > 0 and stmt[name_idx] != '<':
+                name_idx -= 1
+            name_idx -= 1
+        if name_idx < 0:
+            return
+        if 'operator' in stmt[:paren]:
+            op = stmt.index('operator')
+            name = 'operator' + ''.join(stmt[op + 1:paren])
+        else:
+            name = stmt[name_idx].lstrip('@')
+            if not _is_word(name):
+                return
+            # Constructors and destructors have no return type
+            if name_idx == 0 or stmt[name_idx - 1] == '~':
+                return
+        if name not in entity['methods']:
+            entity['methods'].append(name)
+        return
+    for k, decl in enumerate(_split_top_level(stmt)):
+        for stop in ('=', '=>'):
+            if stop in decl:
+                decl = decl[:decl.index(stop)]
+        if not decl or not _is_word(decl[-1]) or decl[-1] == 'this':
+            continue
+        if k == 0 and len(decl) < 2:
+            return
+        name = decl[-1].lstrip('@')
+        if name not in entity['attributes']:
+            entity['attributes'].append(name)
+
+
+def scan_csharp(content):
+    """
+    Scans one C# file in a single pass over its tokens, tracking namespace, type and member scopes.
+    Returns {'usings', 'types'}; every type records its namespace, its name (nested types as
+    'Outer.Inner'), kind, partial flag, bases as written, and the members declared in its own body.
+    """
+    tokens = tokenize(content)
+    n = len(tokens)
+    usings = []
+    types = []
+    file_namespace = ''
+    # Scope stack entries: ('namespace', name), ('type', entity) or ('block', None)
+    scopes = []
+    stmt = []
+    skip_initializer = False
+    i = 0
+    while i < n:
+        t = tokens[i]
+        if skip_initializer:
+            # 'public int X { get; set; } = 5;'
+            skip_initializer = False
+            if t == '=':
+                while i < n and tokens[i] != ';':
+                    i += 1
+                i += 1
+                continue
+        if t not in STRUCTURAL_TOKENS:
+            stmt.append(t)
+            i += 1
+            continue
+        entity = scopes[-1][1] if scopes and scopes[-1][0] == 'type' else None
+        if t == '[' and not stmt:
+            # Attributes: [Serializable], [SerializeField] ...
+            i = _skip_balanced(tokens, i, '[', ']')
+            continue
+        if t == 'using' and not stmt and entity is None:
+            j = i + 1
+            while j < n and tokens[j] != ';':
+                j += 1
+            target = tokens[i + 1:j]
+            if target and target[0] != 'static' and '=' not in target and '(' not in target:
+                usings.append(''.join(target))
+            i = j + 1
+            continue
+        if t == 'namespace' and not stmt:
+            j = i + 1
+            while j < n and tokens[j] not in ('{', ';'):
+                j += 1
+            name = ''.join(tokens[i + 1:j])
+            if j < n and tokens[j] == ';':
+                file_namespace = name
+            else:
+                scopes.append(('namespace', name))
+            i = j + 1
+            continue
+        if t in TYPE_KEYWORDS and all(x in MODIFIERS for x in stmt) and i + 1 < n:
+            j = i + 1
+            if t == 'record' and tokens[j] in ('class', 'struct'):
+                j += 1
+            if j < n and _is_word(tokens[j]) and tokens[j] not in TYPE_KEYWORDS:
+                name = tokens[j].lstrip('@')
+                j += 1
+                if j < n and tokens[j] == '<':
+                    j = _skip_balanced(tokens, j, '<', '>')
+                if j < n and tokens[j] == '(':
+                    # Record primary constructor
+                    j = _skip_balanced(tokens, j, '(', ')')
+                head_end = j
+                while head_end < n and tokens[head_end] not in ('{', ';'):
+                    head_end += 1
+                head = tokens[j:head_end]
+                if 'where' in head:
+                    head = head[:head.index('where')]
+                bases = []
+                if head and head[0] == ':':
+                    for part in _split_top_level(head[1:]):
+                        if '(' in part:
+                            # Record base with arguments: Base(X)
+                            part = part[:part.index('(')]
+                        base = _type_name(part)
+                        if base:
+                            bases.append(base)
+                namespaces = [value for kind, value in scopes if kind == 'namespace']
+                outer = [value['local'] for kind, value in scopes if kind == 'type']
+                namespace = '.'.join(([file_namespace] if file_namespace else []) + namespaces)
+                local = '.'.join(outer[-1:] + [name])
+                kind = 'class' if t == 'record' else t
+                record = {'namespace': namespace, 'name': local, 'kind': kind, 'partial': 'partial' in stmt,
+                          'bases': bases, 'methods': [], 'attributes': [], 'values': [], 'local': local}
+                types.append(record)
+                stmt = []
+                if head_end < n and tokens[head_end] == '{':
+                    if kind == 'enum':
+                        depth = 0
+                        expect_name = True
+                        k = head_end + 1
+                        while k < n:
+                            tk = tokens[k]
+                            if tk in ('(', '[', '{'):
+                                depth += 1
+                            elif tk in (')', ']', '}'):
+                                if depth == 0:
+                                    break
+                                depth -= 1
+                            elif depth == 0:
+                                if tk == ',':
+                                    expect_name = True
+                                elif expect_name and _is_word(tk):
+                                    record['values'].append(tk.lstrip('@'))
+                                    expect_name = False
+                            k += 1
+                        i = k + 1
+                        continue
+                    scopes.append(('type', record))
+                i = head_end + 1
+                continue
+        if t == '{':
+            if entity is None:
+                scopes.append(('block', None))
+                stmt = []
+                i += 1
+                continue
+            has_call = '(' in stmt and not any(x in ('=', '=>') for x in stmt[:stmt.index('(')])
+            if stmt and (has_call or '=' not in stmt):
+                # Method body, or property/event accessors
+                _add_member(stmt, entity)
+                skip_initializer = not has_call
+                stmt = []
+            # Other braces (initializers, lambdas) belong to the current statement
+            i = _skip_balanced(tokens, i, '{', '}')
+            continue
+        if t == '}':
+            stmt = []
+            if scopes:
+                scopes.pop()
+            i += 1
+            continue
+        if t == ';':
+            if entity is not None and stmt:
+                _add_member(stmt, entity)
+            stmt = []
+            i += 1
+            continue
+        stmt.append(t)
+        i += 1
+    for record in types:
+        del record['local']
+    return {'usings': usings, 'types': types}
+
+
+def extract_raw_entities(cs_file):
+    """
+    Extract the raw (unsanitized) types of a C# file with their own members, bases and namespace.
+    Runs independently per file, so it can be used as a ParallelParse worker.
+    """
+    with open(cs_file, encoding='utf-8', errors='ignore') as f:
         content = f.read()
-        # Classes & inheritance
-        for match in re.finditer(r'class\s+(\w+)\s*(?::\s*([\w\s,<>]+))?', content):
-            class_name = sanitize_name(match.group(1), used_names)
-            bases = match.group(2)
-            classes[class_name] = {'methods': [], 'attributes': [], 'bases': []}
-            if bases:
-                for base in [b.strip() for b in bases.split(',') if b.strip()]:
-                    base_name = sanitize_name(base, used_names)
-                    classes[class_name]['bases'].append(base_name)
-                    relations.append({'from': class_name, 'to': base_name, 'type': 'extends'})
-        # Interfaces
-        for match in re.finditer(r'interface\s+(\w+)', content):
-            iface_name = sanitize_name(match.group(1), used_names)
-            classes[iface_name] = {'methods': [], 'attributes': [], 'is_interface': True}
-        # Methods (for both classes and interfaces)
-        for match in re.finditer(r'(public|private|protected|internal)?\s+([\w<>,\[\]]+)\s+(\w+)\s*\(([^)]*)\)', content):
-            method_name = sanitize_name(match.group(3), used_names)
-            for cname in classes:
-                if method_name not in classes[cname]['methods']:
-                    classes[cname]['methods'].append(method_name)
-        # Attributes (only for classes)
-        for match in re.finditer(r'(public|private|protected|internal)?\s+([\w<>,\[\]]+)\s+(\w+)\s*(=\s*[^;]+)?;', content):
-            attr_name = sanitize_name(match.group(3), used_names)
-            for cname in classes:
-                if 'is_interface' not in classes[cname] and attr_name not in classes[cname]['attributes']:
-                    classes[cname]['attributes'].append(attr_name)
-    return classes, relations
-
-
-def generate_uml_json(project_dir):
-    """Generate a UML-compliant JSON for C# classes, interfaces, and relations."""
+    return scan_csharp(content)
+
+
+def generate_model(project_dir, jobs=1, cache=None):
+    """Build the UmlModel of C# classes, interfaces, and relations. Files are parsed on `jobs` processes."""
     cs_files = scan_cs_files(project_dir)
-    uml_json = {
-        'classes': [],
-        'interfaces': [],
-        'relations': []
-    }
-    used_names = set()
-    for cs_file in cs_files:
-        classes, relations = extract_classes_methods_attributes(cs_file, used_names)
-        for cname, cdata in classes.items():
-            if cdata.get('is_interface'):
-                uml_json['interfaces'].append({'name': cname, 'methods': cdata['methods']})
+    return merge_uml_json(parse_files(cs_files, extract_raw_entities, jobs=jobs, cache=cache, version=PARSER_VERSION))
+
+
+def _resolve_type(base, namespace, outer, usings, known):
+    """C#-style lookup of a base type name: nested in the enclosing type, then enclosing namespaces, then usings."""
+    candidates = []
+    if outer:
+        candidates.append((namespace, f'{outer}.{base}'))
+    parts = namespace.split('.') if namespace else []
+    for k in range(len(parts), -1, -1):
+        candidates.append(('.'.join(parts[:k]), base))
+    for using in usings:
+        candidates.append((using, base))
+    if '.' in base:
+        ns, _, local = base.rpartition('.')
+        candidates.append((ns, local))
+    for key in candidates:
+        if key in known:
+            return key
+    return None
+
+
+def merge_uml_json(results):
+    """
+    Merges the per-file raw types (in path order) into a UmlModel.
+    Partial types are merged across files; names are sanitized per namespace, and bases are
+    resolved to 'extends' or 'implements' relations.
+    """
+    model = UmlModel()
+    merged = {}
+    for _, raw in results:
+        for record in raw['types']:
+            key = (record['namespace'], record['name'])
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = dict(record, bases=[], methods=[], attributes=[], values=[], usings=[])
+            if entry['kind'] != record['kind'] and record['kind'] == 'interface':
+                entry['kind'] = 'interface'
+            for field in ('bases', 'methods', 'attributes', 'values'):
+                for value in record[field]:
+                    if value not in entry[field]:
+                        entry[field].append(value)
+            for using in raw['usings']:
+                if using not in entry['usings']:
+                    entry['usings'].append(using)
+    # Names are sanitized per namespace, in path order
+    used_by_namespace = defaultdict(dict)
+    ids = {}
+    for (namespace, name), entry in merged.items():
+        clean = sanitize_name(name, used_by_namespace[namespace])
+        ns_id = '.'.join(sanitize_identifier(part) for part in namespace.split('.')) if namespace else ''
+        ids[(namespace, name)] = f'{ns_id}.{clean}' if ns_id else clean
+        entry['clean'] = clean
+    kinds = {'interface': INTERFACE, 'enum': ENUM, 'struct': STRUCT}
+    for key, entry in merged.items():
+        type_id = ids[key]
+        kind = kinds.get(entry['kind'], CLASS)
+        stereotype = {INTERFACE: 'CSharpInterface', ENUM: '', STRUCT: 'CSharpStruct'}.get(kind, 'CSharpClass')
+        model.add_entity(type_id, kind, entry['clean'], entry['namespace'], stereotype)
+        if kind == ENUM:
+            for value in entry['values']:
+                model.add_member(VALUE, sanitize_identifier(value))
+        else:
+            if kind != INTERFACE:
+                for attr in entry['attributes']:
+                    model.add_member(ATTRIBUTE, sanitize_identifier(attr))
+            for method in entry['methods']:
+                model.add_member(METHOD, sanitize_identifier(method))
+        outer = entry['name'].rpartition('.')[0]
+        for index, base in enumerate(entry['bases']):
+            target = _resolve_type(base, entry['namespace'], outer, entry['usings'], merged)
+            if target is not None:
+                base_id = ids[target]
+                is_interface = merged[target]['kind'] == 'interface'
             else:
-                uml_json['classes'].append({'name': cname, 'methods': cdata['methods'], 'attributes': cdata['attributes'], 'bases': cdata.get('bases', [])})
-        uml_json['relations'].extend(relations)
-    # Detect implements (class implements interface)
-    for cls in uml_json['classes']:
-        for base in cls.get('bases', []):
-            if any(base == iface['name'] for iface in uml_json['interfaces']):
-                uml_json['relations'].append({'from': cls['name'], 'to': base, 'type': 'implements'})
-    return uml_json
-
-
-def generate_puml_from_json(uml_json, project_dir=None):
-    """Generate PlantUML file from C# UML JSON, with improved colors and glowing arrows."""
-    puml_lines = ["@startuml"]
+                base_id = sanitize_identifier(base.rpartition('.')[2])
+                # C# allows a single base class, listed first; the rest (and every base of a struct) are interfaces
+                is_interface = index > 0 or entry['kind'] == 'struct' or re.match(r'^I[A-Z]', base_id) is not None
+            rel_type = IMPLEMENTS if is_interface and entry['kind'] != 'interface' else EXTENDS
+            model.add_relation(rel_type, type_id, base_id)
+    return model
+
+
+def generate_puml_from_model(model, project_dir=None, output_file=None):
+    """Writes CSharpProject.puml (or `output_file`) for the UmlModel and returns its path."""
+    output_file = output_file or os.path.join(project_dir or '.', "CSharpProject.puml")
+    return write_puml_lines(output_file, iter_puml_from_model(model), model)
+
+
+def iter_puml_from_model(model):
+    """Generate PlantUML file from the C# UmlModel, with improved colors and glowing arrows."""
+    yield "@startuml"
     # Background and box style
-    puml_lines.append('skinparam backgroundColor #23272e')
-    puml_lines.append('skinparam classFontColor #000000')  # Black text
-    puml_lines.append('skinparam classAttributeFontColor #000000')
-    puml_lines.append('skinparam classMethodFontColor #000000')
-    puml_lines.append('skinparam classStereotypeFontColor #000000')
-    puml_lines.append('skinparam classBorderColor #178600')  # C# green
-    puml_lines.append('skinparam shadowing true')
+    yield 'skinparam backgroundColor #23272e'
+    yield 'skinparam classFontColor #000000'  # Black text
+    yield 'skinparam classAttributeFontColor #000000'
+    yield 'skinparam classMethodFontColor #000000'
+    yield 'skinparam classStereotypeFontColor #000000'
+    yield 'skinparam classBorderColor #178600'  # C# green
+    yield 'skinparam shadowing true'
     # Glowing, vivid arrows
-    puml_lines.append('skinparam ArrowColor #00ffe7')
-    puml_lines.append('skinparam ArrowThickness 3')
-    puml_lines.append('skinparam ArrowFontColor #00ffe7')
-    puml_lines.append('skinparam ArrowFontSize 14')
-    puml_lines.append('skinparam ArrowFontStyle bold')
-    puml_lines.append('skinparam ArrowLollipopColor #00ffe7')
-    puml_lines.append('skinparam ArrowGlowColor #00ffe7')
-    puml_lines.append('skinparam ArrowGlow 0.5')
+    yield 'skinparam ArrowColor #00ffe7'
+    yield 'skinparam ArrowThickness 3'
+    yield 'skinparam ArrowFontColor #00ffe7'
+    yield 'skinparam ArrowFontSize 14'
+    yield 'skinparam ArrowFontStyle bold'
+    yield 'skinparam ArrowLollipopColor #00ffe7'
+    yield 'skinparam ArrowGlowColor #00ffe7'
+    yield 'skinparam ArrowGlow 0.5'
     # Interface and class definitions
-    for iface in uml_json['interfaces']:
-        puml_lines.append(f'interface {iface["name"]} <<CSharpInterface>> {{')
-        for method in iface['methods']:
-            puml_lines.append(f'  {method}()')
-        puml_lines.append('}')
-    for cls in uml_json['classes']:
-        puml_lines.append(f'class {cls["name"]} <<CSharpClass>> {{')
-        for attr in cls['attributes']:
-            puml_lines.append(f'  {attr}')
-        for method in cls['methods']:
-            puml_lines.append(f'  {method}()')
-        puml_lines.append('}')
-    for rel in uml_json['relations']:
-        if rel['type'] == 'extends':
-            puml_lines.append(f'{rel["from"]} --|> {rel["to"]}')
-        elif rel['type'] == 'implements':
-            puml_lines.append(f'{rel["from"]} ..|> {rel["to"]}')
-    puml_lines.append('@enduml')
-    output_file = os.path.join(project_dir or '.', "CSharpProject.puml")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(puml_lines))
-    return output_file
-
-
-def main(project_dir):
-    uml_json = generate_uml_json(project_dir)
-    json_file = os.path.join(project_dir, 'CSharp_UML_ClassDiagram.json')
-    with open(json_file, 'w', encoding='utf-8') as jf:
-        json.dump(uml_json, jf, indent=2, ensure_ascii=False)
-    print(f'[UML] CSharp UML JSON saved at: {json_file}')
-
-    try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            uml_json = json.load(f)
-    except Exception as e:
-        print(f"[UML] Error reading CSharp JSON to generate PUML: {e}")
-        return
+    # Types are declared by their namespace-qualified id, so PlantUML groups them by namespace
+    for iface in model.entities(INTERFACE):
+        yield f'interface {iface.id} <<{iface.stereotype}>> {{'
+        for method in iface.member_names(METHOD):
+            yield f'  {method}()'
+        yield '}'
+    for cls in model.entities():
+        if cls.kind not in (CLASS, STRUCT):
+            continue
+        yield f'class {cls.id} <<{cls.stereotype}>> {{'
+        for attr in cls.member_names(ATTRIBUTE):
+            yield f'  {attr}'
+        for method in cls.member_names(METHOD):
+            yield f'  {method}()'
+        yield '}'
+    for enum in model.entities(ENUM):
+        yield f'enum {enum.id} {{'
+        for value in enum.member_names(VALUE):
+            yield f'  {value}'
+        yield '}'
+    for kind, source, target, _ in model.relations():
+        if kind == EXTENDS:
+            yield f'{source} --|> {target}'
+        elif kind == IMPLEMENTS:
+            yield f'{source} ..|> {target}'
+    yield '@enduml'
 
-    puml_path = generate_puml_from_json(uml_json, project_dir)
-    print(f"[UML] CSharp PUML saved at: {puml_path}")
 
-    svg = render_svg(puml_path)
+def main(project_dir, jobs=1, use_cache=True, write_json=True, write_snapshot=True, focus=None, paging=None):
+    with open_parse_cache(project_dir, enabled=use_cache) as cache:
+        model = generate_model(project_dir, jobs=jobs, cache=cache)
+    # --focus draws only the neighborhood of one class; the artifacts keep the full model
+    diagram = apply_focus(model, focus)
+    # The JSON and snapshot artifacts are written in the background; the PUML is generated from the model itself
+    export = export_artifacts(model, project_dir, 'CSharp_UML_ClassDiagram', 'CSharp UML', write_json, write_snapshot)
+
+    if paging is not None:
+        puml_path, page_paths = write_pages(diagram, os.path.join(project_dir, 'CSharpProject_pages'),
+                                            lambda page, path: generate_puml_from_model(page, project_dir, path),
+                                            paging, 'C# Project')
+        svgs = render_svgs(page_paths + [puml_path])
+        svg = svgs[-1] if svgs else None
+    else:
+        puml_path = generate_puml_from_model(diagram, project_dir)
+        svg = render_svg(puml_path)
+    print(f"[UML] CSharp PUML saved at: {puml_summary(puml_path)}")
     if svg:
-        print(f"[UML] SVG generated: {svg}")
+        print(f"[UML] {output_kind(svg)} generated: {svg}")
     else:
-        print(f"[UML] SVG not generated!")
+        print(f"[UML] {output_kind()} not generated!")
+    if export is not None:
+        export.wait()
 
 
 if __name__ == '__main__':
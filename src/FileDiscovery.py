@@ -0,0 +1,228 @@
+import os
+import re
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+"""
+FileDiscovery.py
+-----------------
+Shared source file discovery for all language backends.
+Directories are scanned concurrently on a thread pool and matching paths are yielded as soon as
+their directory has been listed, so parsing can start before the walk finishes.
+Generated/vendored folders are skipped through built-in deny lists, .gitignore files (at any level)
+and a project-level .uumlignore (same syntax as .gitignore). When only a subfolder of the project
+is walked (Source/, Content/), the ignore files between the project root and that subfolder apply
+as well.
+"""
+
+# Folders never worth parsing, whatever the project type
+COMMON_DENY_DIRS = {
+    '.git', '.hg', '.svn', '.idea', '.vs', '.vscode', '.uuml-cache', 'node_modules', '__pycache__',
+}
+
+# Per-language deny lists (compared case-insensitively against the folder name)
+LANGUAGE_DENY_DIRS = {
+    'cpp4ue': {'intermediate', 'binaries', 'saved', 'deriveddatacache'},
+    'unrealbp': {'intermediate', 'binaries', 'saved', 'deriveddatacache'},
+    'unity': {'library', 'temp', 'obj', 'logs', 'build', 'builds', 'usersettings'},
+    'csharp': {'bin', 'obj', 'packages', 'testresults'},
+    'cpp': {'build', 'out', 'cmake-build-debug', 'cmake-build-release', '.cache'},
+    'python': {'.venv', 'venv', 'env', '.tox', '.nox', '.eggs', 'build', 'dist', 'site-packages',
+               '.mypy_cache', '.pytest_cache', '.ruff_cache'},
+    'go': {'vendor'},
+}
+
+IGNORE_FILE_NAMES = ('.gitignore',)
+PROJECT_IGNORE_FILE = '.uumlignore'
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def _translate_pattern(pattern):
+    """Translates a gitignore glob (without leading '/' or trailing '/') into a regex."""
+    i, n = 0, len(pattern)
+    out = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 3] == '**/':
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern[i:i + 2] == '**':
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = pattern.find(']', i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                chars = pattern[i + 1:j]
+                if chars.startswith('!'):
+                    chars = '^' + chars[1:]
+                out.append(f'[{chars}]')
+                i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+class IgnoreRule:
+    """One compiled .gitignore/.uumlignore line, relative to the folder that declared it."""
+    __slots__ = ('base', 'regex', 'negate', 'dir_only')
+
+    def __init__(self, base, line):
+        self.negate = line.startswith('!')
+        if self.negate:
+            line = line[1:]
+        self.dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        anchored = '/' in line
+        line = line.lstrip('/')
+        body = _translate_pattern(line)
+        self.base = base
+        self.regex = re.compile(body + r'\Z' if anchored else r'(?:.*/)?' + body + r'\Z')
+
+    def matches(self, path, is_dir):
+        if self.dir_only and not is_dir:
+            return False
+        if not path.startswith(self.base + os.sep):
+            return False
+        rel = path[len(self.base) + 1:]
+        if os.sep != '/':
+            rel = rel.replace(os.sep, '/')
+        return self.regex.match(rel) is not None
+
+
+def load_ignore_file(path, base):
+    """Reads an ignore file and returns its rules (empty list if the file is missing)."""
+    rules = []
+    try:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                line = line.rstrip('\n').rstrip('\r')
+                if not line.strip() or line.startswith('#'):
+                    continue
+                if line.startswith('\\'):
+                    line = line[1:]
+                rules.append(IgnoreRule(base, line.rstrip()))
+    except OSError:
+        pass
+    return rules
+
+
+def is_ignored(rules, path, is_dir):
+    """The last matching rule wins, so a later '!pattern' re-includes a path."""
+    ignored = False
+    for rule in rules:
+        if rule.negate == ignored and rule.matches(path, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+def root_ignore_rules(root, project_root=None):
+    """
+    Rules in force at `root` before its own .gitignore is read: the .uumlignore of every folder
+    from `project_root` down to `root`, and the .gitignore files of the folders above `root`.
+    Each file is anchored at its own folder; outer files come first, so inner ones win.
+    """
+    root = os.path.abspath(root)
+    folders = [root]
+    if project_root is not None:
+        project_root = os.path.abspath(project_root)
+        if os.path.commonpath([root, project_root]) == project_root:
+            folder = root
+            while folder != project_root:
+                folder = os.path.dirname(folder)
+                folders.append(folder)
+    rules = []
+    for folder in reversed(folders):
+        rules += load_ignore_file(os.path.join(folder, PROJECT_IGNORE_FILE), folder)
+        if folder != root:
+            for name in IGNORE_FILE_NAMES:
+                rules += load_ignore_file(os.path.join(folder, name), folder)
+    return rules
+
+
+def iter_files(root, exts, language=None, workers=None, use_ignore_files=True, project_root=None):
+    """
+    Yields every file under `root` whose name ends with one of `exts`, skipping denied folders
+    and ignored paths. `project_root` is the project folder when `root` is a subfolder of it, so
+    the ignore files of the project root apply too. Directories are listed concurrently, so the
+    yield order is not stable; use find_files() when a deterministic order is needed.
+    """
+    exts = tuple(exts)
+    deny = COMMON_DENY_DIRS | LANGUAGE_DENY_DIRS.get(language, set())
+    root = os.path.abspath(root)
+    root_rules = []
+    if use_ignore_files:
+        root_rules = root_ignore_rules(root, project_root)
+    results = queue.Queue()
+    stop = threading.Event()
+    lock = threading.Lock()
+    pending = [0]
+    pool = ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS, thread_name_prefix='uuml-walk')
+
+    def submit(path, rules):
+        with lock:
+            pending[0] += 1
+        pool.submit(scan, path, rules)
+
+    def scan(path, rules):
+        found = []
+        try:
+            if stop.is_set():
+                return
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                return
+            if use_ignore_files:
+                for name in IGNORE_FILE_NAMES:
+                    if any(e.name == name for e in entries):
+                        rules = rules + load_ignore_file(os.path.join(path, name), path)
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if entry.name.lower() in deny or (rules and is_ignored(rules, entry.path, True)):
+                        continue
+                    submit(entry.path, rules)
+                elif entry.name.endswith(exts) and not (rules and is_ignored(rules, entry.path, False)):
+                    found.append(entry.path)
+        finally:
+            results.put(found)
+            with lock:
+                pending[0] -= 1
+                done = pending[0] == 0
+            if done:
+                results.put(None)
+
+    try:
+        submit(root, root_rules)
+        while True:
+            batch = results.get()
+            if batch is None:
+                break
+            yield from batch
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def find_files(root, exts, language=None, workers=None, use_ignore_files=True, project_root=None):
+    """Same as iter_files(), but returns a sorted list so backends produce deterministic output."""
+    return sorted(iter_files(root, exts, language=language, workers=workers, use_ignore_files=use_ignore_files,
+                             project_root=project_root))
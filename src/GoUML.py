@@ -1,114 +1,514 @@
 import os
 import re
-import json
 from collections import defaultdict
-from SVGRenderer import render_svg
+from SVGRenderer import render_svg, render_svgs, output_kind
+from FileDiscovery import iter_files
+from ParallelParse import parse_files
+from ParseCache import open_parse_cache
+from ModelExport import export_artifacts
+from ModelFocus import apply_focus
+from ModelPages import write_pages
+from PumlWriter import write_puml_lines, puml_summary
+from UmlModel import UmlModel, STRUCT, INTERFACE, ATTRIBUTE, METHOD, EXTENDS, IMPLEMENTS, COMPOSITION
+
+# Bump whenever extract_go_structs_and_interfaces changes its output, to invalidate cached entries
+PARSER_VERSION = 4
+
+# Comments are dropped; strings (import paths, struct tags) and newlines are kept as tokens
+TOKEN_PATTERN = re.compile(r"""
+    //[^\n]*
+  | /\*.*?\*/
+  | (`[^`]*`
+  | "(?:\\.|[^"\\\n])*"
+  | '(?:\\.|[^'\\\n])*'
+  | \n
+  | [A-Za-z_]\w*
+  | \d[\w.]*
+  | \.\.\.|:=|<-|[{}()\[\];:,.*&|~=<>!+\-/%^])
+""", re.VERBOSE | re.DOTALL)
+
+PREDECLARED_TYPES = {
+    'bool', 'byte', 'complex64', 'complex128', 'error', 'float32', 'float64', 'int', 'int8', 'int16',
+    'int32', 'int64', 'rune', 'string', 'uint', 'uint8', 'uint16', 'uint32', 'uint64', 'uintptr',
+    'any', 'comparable', 'struct', 'interface', 'func', 'map', 'chan',
+}
 
 def scan_go_files(project_dir):
-    """Recursively find all .go files in the project directory."""
-    go_files = []
-    for root, _, files in os.walk(project_dir):
-        for f in files:
-            if f.endswith('.go'):
-                go_files.append(os.path.join(root, f))
-    return go_files
+    """Recursively yield all .go files in the project directory (vendor/ and ignored paths are skipped)."""
+    return iter_files(project_dir, ('.go',), language='go')
+
+def tokenize(content):
+    tokens = []
+    for t in TOKEN_PATTERN.findall(content):
+        if t and not (t == '\n' and tokens and tokens[-1] == '\n'):
+            tokens.append(t)
+    return tokens
+
+def _is_word(token):
+    return token[0].isalpha() or token[0] == '_'
+
+def _skip_balanced(tokens, i, open_tok, close_tok):
+    """`tokens[i]` is `open_tok`; returns the index just after its matching `close_tok`."""
+    depth = 0
+    n = len(tokens)
+    while i < n:
+        t = tokens[i]
+        if t == open_tok:
+            depth += 1
+        elif t == close_tok:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return n
+
+def _split(tokens, seps):
+    """Splits tokens on `seps` outside of (), [] and {}."""
+    parts = [[]]
+    depth = 0
+    for t in tokens:
+        if t in ('(', '[', '{'):
+            depth += 1
+        elif t in (')', ']', '}'):
+            depth -= 1
+        elif t in seps and depth <= 0:
+            parts.append([])
+            continue
+        parts[-1].append(t)
+    return [p for p in parts if p]
+
+def canonical_type(tokens, own, imports):
+    """
+    Type tokens -> comparable text in which every named type is qualified by its package directory
+    name: 'Reader' in package io and 'io.Reader' elsewhere both become 'io.Reader'.
+    """
+    out = []
+    i = 0
+    n = len(tokens)
+    while i < n:
+        t = tokens[i]
+        if _is_word(t) and i + 2 < n and tokens[i + 1] == '.' and t in imports:
+            out.append(imports[t].rsplit('/', 1)[-1] + '.' + tokens[i + 2])
+            i += 3
+            continue
+        if _is_word(t) and t not in PREDECLARED_TYPES:
+            out.append(f'{own}.{t}')
+        elif t != '\n':
+            out.append(t)
+        i += 1
+    return ''.join(out)
+
+def _is_named(part):
+    """
+    Whether a parameter starts with its name: 'p []byte' and 'buf [4]byte' do, since type tokens
+    follow the brackets, while 'pkg.T' and a generic instantiation 'List[int]' do not.
+    """
+    if len(part) < 2 or not _is_word(part[0]) or part[1] == '.':
+        return False
+    return part[1] != '[' or _skip_balanced(part, 1, '[', ']') < len(part)
+
+def _param_types(tokens, own, imports):
+    """Canonical types of a parameter or result list (names dropped: 'a, b int' -> ['int', 'int'])."""
+    parts = _split(tokens, (',',))
+    named = any(_is_named(p) for p in parts)
+    types = []
+    pending = 0
+    for part in parts:
+        if named:
+            if len(part) == 1:
+                # Name grouped with the type of the next parameter
+                pending += 1
+                continue
+            ctype = canonical_type(part[1:], own, imports)
+            types.extend([ctype] * (pending + 1))
+            pending = 0
+        else:
+            types.append(canonical_type(part, own, imports))
+    return types
+
+def signature(tokens, own, imports):
+    """Canonical signature of '(params) results' tokens, used as method-set key."""
+    close = _skip_balanced(tokens, 0, '(', ')')
+    params = _param_types(tokens[1:close - 1], own, imports)
+    rest = tokens[close:]
+    if rest and rest[0] == '(':
+        results = _param_types(rest[1:_skip_balanced(rest, 0, '(', ')') - 1], own, imports)
+    else:
+        results = [canonical_type(rest, own, imports)] if rest else []
+    return f"({','.join(params)})({','.join(results)})"
+
+def _parse_struct(body, own, imports):
+    fields = []
+    embeds = []
+    pointer_embeds = []
+    for member in _split(body, ('\n', ';')):
+        member = [t for t in member if t[0] not in '`"']
+        if not member:
+            continue
+        names = member[1:] if member[0] == '*' else member
+        # Embedded field: [*]Type or [*]pkg.Type (optionally instantiated, Type[int]), without a field
+        # name; 'data []byte' and 'buf [8]byte' are named fields since type tokens follow the brackets
+        if not _is_named(names) and '[' in names:
+            names = names[:names.index('[')]
+        if (len(names) == 1 and _is_word(names[0])) or (len(names) == 3 and names[1] == '.'):
+            embeds.append(canonical_type(names, own, imports))
+            if member[0] == '*':
+                pointer_embeds.append(embeds[-1])
+            continue
+        for part in _split(member, (',',)):
+            if _is_word(part[0]):
+                fields.append(part[0])
+    return fields, embeds, pointer_embeds
+
+def _parse_interface(body, own, imports):
+    methods = []
+    embeds = []
+    constraint = False
+    for member in _split(body, ('\n', ';')):
+        if len(member) > 1 and _is_word(member[0]) and member[1] == '(':
+            methods.append([member[0], signature(member[1:], own, imports)])
+        elif (len(member) == 1 and _is_word(member[0])) or (len(member) == 3 and member[1] == '.'):
+            embeds.append(canonical_type(member, own, imports))
+        else:
+            # Type sets (~int | ~string) only constrain type parameters
+            constraint = True
+    return methods, embeds, constraint
 
 def extract_go_structs_and_interfaces(go_file):
-    """Extract structs, interfaces, methods, and fields from a Go file."""
-    structs = {}
-    interfaces = {}
-    with open(go_file, encoding='utf-8') as f:
+    """
+    Extract structs (fields and embedded types), interfaces (method signatures and embedded
+    interfaces) and receiver methods from a Go file. Types in signatures are canonicalized so
+    method sets can be compared across files and packages.
+    """
+    with open(go_file, encoding='utf-8', errors='ignore') as f:
         content = f.read()
-        # Structs
-        for match in re.finditer(r'type\s+(\w+)\s+struct\s*{([\s\S]*?)}', content):
-            name = match.group(1)
-            body = match.group(2)
-            fields = []
-            for line in body.split('\n'):
-                line = line.strip()
-                if line and not line.startswith('//'):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        fields.append(parts[0])
-            structs[name] = {'fields': fields}
-        # Interfaces
-        for match in re.finditer(r'type\s+(\w+)\s+interface\s*{([\s\S]*?)}', content):
-            name = match.group(1)
-            body = match.group(2)
-            methods = []
-            for line in body.split('\n'):
-                line = line.strip()
-                if line and not line.startswith('//'):
-                    method_name = line.split('(')[0].strip()
-                    methods.append(method_name)
-            interfaces[name] = {'methods': methods}
-    return structs, interfaces
-
-def generate_uml_json(project_dir):
-    """Generate a UML-compliant JSON for Go structs and interfaces."""
+    tokens = tokenize(content)
+    own = os.path.basename(os.path.dirname(os.path.abspath(go_file)))
+    result = {'package': '', 'dir': os.path.dirname(os.path.abspath(go_file)), 'imports': {},
+              'structs': [], 'interfaces': [], 'methods': []}
+    imports = result['imports']
+    n = len(tokens)
+    i = 0
+    while i < n:
+        t = tokens[i]
+        if t == 'package' and i + 1 < n:
+            result['package'] = tokens[i + 1]
+            i += 2
+        elif t == 'import':
+            j = i + 1
+            if j < n and tokens[j] == '(':
+                end = _skip_balanced(tokens, j, '(', ')')
+                specs = _split(tokens[j + 1:end - 1], ('\n', ';'))
+            else:
+                end = j
+                while end < n and tokens[end] not in ('\n', ';'):
+                    end += 1
+                specs = [tokens[j:end]]
+            for spec in specs:
+                path = spec[-1].strip('"`') if spec and spec[-1][0] in '"`' else None
+                if path:
+                    alias = spec[0] if len(spec) > 1 else path.rsplit('/', 1)[-1]
+                    if alias not in ('_', '.'):
+                        imports[alias] = path
+            i = end
+        elif t == 'type':
+            j = i + 1
+            if j < n and tokens[j] == '(':
+                end = _skip_balanced(tokens, j, '(', ')')
+                specs = _split(tokens[j + 1:end - 1], ('\n', ';'))
+            else:
+                end = j
+                depth = 0
+                while end < n and not (depth == 0 and tokens[end] in ('\n', ';') and end > j + 1
+                                       and tokens[end - 1] not in ('{', ',')):
+                    if tokens[end] in ('(', '[', '{'):
+                        depth += 1
+                    elif tokens[end] in (')', ']', '}'):
+                        depth -= 1
+                    end += 1
+                specs = [tokens[j:end]]
+            for spec in specs:
+                if len(spec) < 2 or not _is_word(spec[0]):
+                    continue
+                name, k = spec[0], 1
+                if spec[k] == '[' and k + 2 < len(spec) and _is_word(spec[k + 1]) and spec[k + 2] != ']':
+                    k = _skip_balanced(spec, k, '[', ']')
+                if k + 1 < len(spec) and spec[k] in ('struct', 'interface') and spec[k + 1] == '{':
+                    body = spec[k + 2:_skip_balanced(spec, k + 1, '{', '}') - 1]
+                    if spec[k] == 'struct':
+                        fields, embeds, pointer_embeds = _parse_struct(body, own, imports)
+                        result['structs'].append({'name': name, 'fields': fields, 'embeds': embeds,
+                                                  'pointer_embeds': pointer_embeds})
+                    else:
+                        methods, embeds, constraint = _parse_interface(body, own, imports)
+                        result['interfaces'].append({'name': name, 'methods': methods, 'embeds': embeds,
+                                                     'constraint': constraint})
+            i = end
+        elif t == 'func' and i + 1 < n and tokens[i + 1] == '(':
+            # Method: func (r *T) Name(params) results { ... }
+            recv_end = _skip_balanced(tokens, i + 1, '(', ')')
+            receiver = tokens[i + 2:recv_end - 1]
+            if '[' in receiver:
+                receiver = receiver[:receiver.index('[')]
+            j = recv_end
+            if j + 1 < n and _is_word(tokens[j]) and tokens[j + 1] in ('(', '['):
+                name = tokens[j]
+                j += 1
+                if tokens[j] == '[':
+                    j = _skip_balanced(tokens, j, '[', ']')
+                sig_start = j
+                depth = 0
+                while j < n and not (depth == 0 and tokens[j] in ('{', '\n')):
+                    if tokens[j] in ('(', '['):
+                        depth += 1
+                    elif tokens[j] in (')', ']'):
+                        depth -= 1
+                    j += 1
+                recv_names = [x for x in receiver if _is_word(x)]
+                if recv_names:
+                    result['methods'].append([recv_names[-1], name, signature(tokens[sig_start:j], own, imports),
+                                              '*' in receiver])
+            if j < n and tokens[j] == '{':
+                j = _skip_balanced(tokens, j, '{', '}')
+            i = j
+        elif t == '{':
+            # Function bodies and composite literals at top level
+            i = _skip_balanced(tokens, i, '{', '}')
+        else:
+            i += 1
+    return result
+
+def generate_model(project_dir, jobs=1, cache=None):
+    """Build the UmlModel of Go structs and interfaces. Files are parsed on `jobs` processes."""
     go_files = scan_go_files(project_dir)
-    uml_json = {
-        'structs': [],
-        'interfaces': [],
-        'relations': []
-    }
-    for go_file in go_files:
-        structs, interfaces = extract_go_structs_and_interfaces(go_file)
-        for sname, sdata in structs.items():
-            uml_json['structs'].append({'name': sname, 'fields': sdata['fields']})
-        for iname, idata in interfaces.items():
-            uml_json['interfaces'].append({'name': iname, 'methods': idata['methods']})
-    # TODO: Detect relations (implements, embeds)
-    return uml_json
-
-def generate_puml_from_json(uml_json, project_dir=None):
-    """Generate PlantUML file from Go UML JSON."""
-    puml_lines = ["@startuml"]
-    puml_lines.append('skinparam backgroundColor #23272e')
-    puml_lines.append('skinparam classFontColor #ffffff')
-    puml_lines.append('skinparam classAttributeFontColor #ffffff')
-    puml_lines.append('skinparam classMethodFontColor #ffffff')
-    puml_lines.append('skinparam classStereotypeFontColor #ffffff')
-    puml_lines.append('skinparam classBorderColor #00add8')  # Go blue
-    for struct in uml_json['structs']:
-        puml_lines.append(f'class {struct["name"]} <<GoStruct>> {{')
+    return merge_uml_json(parse_files(go_files, extract_go_structs_and_interfaces, jobs=jobs, cache=cache, version=PARSER_VERSION))
+
+def _namespaces(dirs_to_package):
+    """Package name of every directory, made unique with the directory path when names collide."""
+    counts = defaultdict(int)
+    for package in dirs_to_package.values():
+        counts[package] += 1
+    root = os.path.commonpath(list(dirs_to_package)) if len(dirs_to_package) > 1 else ''
+    namespaces = {}
+    for d, package in dirs_to_package.items():
+        if counts[package] > 1:
+            rel = os.path.relpath(d, root) if root else os.path.basename(d)
+            package = re.sub(r'\W', '_', rel)
+        namespaces[d] = package
+    return namespaces
+
+def implemented_interfaces(method_sets, interface_methods):
+    """
+    Implicit interface satisfaction through an inverted index: (method, signature) -> types.
+    Each interface intersects the type sets of its methods, smallest first, instead of being
+    compared against every type. Returns {interface key: sorted type keys}.
+    """
+    index = defaultdict(set)
+    for key, methods in method_sets.items():
+        for method in methods.items():
+            index[method].add(key)
+    result = {}
+    for iface, methods in interface_methods.items():
+        if not methods:
+            continue
+        candidates = sorted((index.get(m, ()) for m in methods.items()), key=len)
+        matched = set(candidates[0])
+        for others in candidates[1:]:
+            if not matched:
+                break
+            matched &= others
+        if matched:
+            result[iface] = sorted(matched)
+    return result
+
+def merge_uml_json(results):
+    """
+    Merges the per-file results (in path order) into a UmlModel: collects receiver methods per
+    package, resolves embedded types, promotes embedded methods and detects which structs
+    implement which interfaces.
+    """
+    model = UmlModel()
+    dirs_to_package = {}
+    structs = {}
+    interfaces = {}
+    own_methods = defaultdict(dict)
+    value_methods = defaultdict(dict)
+    by_short = defaultdict(list)
+    for go_file, data in results:
+        d = data['dir']
+        dirs_to_package.setdefault(d, data['package'] or os.path.basename(d))
+        for struct in data['structs']:
+            key = (d, struct['name'])
+            structs.setdefault(key, struct)
+            by_short[(os.path.basename(d), struct['name'])].append(key)
+        for iface in data['interfaces']:
+            key = (d, iface['name'])
+            interfaces.setdefault(key, iface)
+            by_short[(os.path.basename(d), iface['name'])].append(key)
+        for recv, name, sig, pointer in data['methods']:
+            own_methods[(d, recv)].setdefault(name, sig)
+            if not pointer:
+                value_methods[(d, recv)].setdefault(name, sig)
+    namespaces = _namespaces(dirs_to_package)
+
+    def type_id(key):
+        return f'{namespaces[key[0]]}.{key[1]}'
+
+    def resolve(ref, d):
+        """Key of a canonical 'dirname.Type' reference, preferring the referencing directory."""
+        short, _, name = ref.rpartition('.')
+        keys = by_short.get((short, name), [])
+        for key in keys:
+            if key[0] == d:
+                return key
+        return keys[0] if keys else None
+
+    interface_methods = {}
+    complete = {}
+
+    def interface_method_set(key, visiting=()):
+        if key in interface_methods:
+            return interface_methods[key]
+        iface = interfaces[key]
+        methods = dict(iface['methods'])
+        ok = not iface['constraint']
+        for ref in iface['embeds']:
+            target = resolve(ref, key[0])
+            if target in interfaces and target not in visiting:
+                for name, sig in interface_method_set(target, visiting + (key,)).items():
+                    methods.setdefault(name, sig)
+                ok = ok and complete[target]
+            else:
+                # Embeds an interface outside the project: its method set is unknown
+                ok = False
+        interface_methods[key] = methods
+        complete[key] = ok
+        return methods
+
+    # Method sets of T (value receivers only) and of *T (every receiver), per Go's rules
+    method_sets = {}
+    pointer_method_sets = {}
+
+    def struct_method_set(key, pointer, visiting=()):
+        sets = pointer_method_sets if pointer else method_sets
+        if key in sets:
+            return sets[key]
+        struct = structs[key]
+        methods = dict((own_methods if pointer else value_methods).get(key, {}))
+        for ref in struct['embeds']:
+            target = resolve(ref, key[0])
+            if target in structs and target not in visiting:
+                # An embedded *E promotes the methods of *E even into the method set of T
+                promoted = struct_method_set(target, pointer or ref in struct['pointer_embeds'],
+                                             visiting + (key,))
+            elif target in interfaces:
+                promoted = interface_method_set(target)
+            else:
+                continue
+            # Methods declared at a shallower depth win over promoted ones
+            for name, sig in promoted.items():
+                methods.setdefault(name, sig)
+        sets[key] = methods
+        return methods
+
+    for key in interfaces:
+        interface_method_set(key)
+    for key in structs:
+        struct_method_set(key, False)
+        struct_method_set(key, True)
+    satisfiable = {key: methods for key, methods in interface_methods.items() if complete[key]}
+    implementations = implemented_interfaces(method_sets, satisfiable)
+    pointer_implementations = implemented_interfaces(pointer_method_sets, satisfiable)
+
+    for key, struct in structs.items():
+        model.add_entity(type_id(key), STRUCT, struct['name'], namespaces[key[0]], 'GoStruct')
         for field in struct['fields']:
-            puml_lines.append(f'  {field}')
-        puml_lines.append('}')
-    for iface in uml_json['interfaces']:
-        puml_lines.append(f'interface {iface["name"]} <<GoInterface>> {{')
-        for method in iface['methods']:
-            puml_lines.append(f'  {method}()')
-        puml_lines.append('}')
-    # TODO: Add relations (implements, embeds)
-    puml_lines.append('@enduml')
-    output_file = os.path.join(project_dir or '.', "GoProject.puml")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(puml_lines))
-    return output_file
-
-def main(project_dir):
-    uml_json = generate_uml_json(project_dir)
-    json_file = os.path.join(project_dir, 'Go_UML_ClassDiagram.json')
-    with open(json_file, 'w', encoding='utf-8') as jf:
-        json.dump(uml_json, jf, indent=2, ensure_ascii=False)
-    print(f'[UML] Go UML JSON saved at: {json_file}')
-
-    try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            uml_json = json.load(f)
-    except Exception as e:
-        print(f"[UML] Error reading Go JSON to generate PUML: {e}")
-        return
-
-    puml_path = generate_puml_from_json(uml_json, project_dir)
-    print(f"[UML] Go PUML saved at: {puml_path}")
-
-    svg = render_svg(puml_path)
+            model.add_member(ATTRIBUTE, field)
+        for method, sig in own_methods.get(key, {}).items():
+            model.add_member(METHOD, method, params=sig)
+        for ref in struct['embeds']:
+            target = resolve(ref, key[0])
+            if target is not None:
+                # Embedding is composition: the outer struct contains the embedded value
+                model.add_relation(COMPOSITION, type_id(key), type_id(target))
+    for key, iface in interfaces.items():
+        model.add_entity(type_id(key), INTERFACE, iface['name'], namespaces[key[0]], 'GoInterface')
+        for method, sig in iface['methods']:
+            model.add_member(METHOD, method, params=sig)
+        for ref in iface['embeds']:
+            target = resolve(ref, key[0])
+            if target in interfaces:
+                model.add_relation(EXTENDS, type_id(key), type_id(target))
+        by_value = implementations.get(key, [])
+        for struct_key in by_value:
+            model.add_relation(IMPLEMENTS, type_id(struct_key), type_id(key))
+        for struct_key in pointer_implementations.get(key, []):
+            if struct_key not in by_value:
+                # Only *T implements the interface: the relation is labelled with the pointer type
+                model.add_relation(IMPLEMENTS, type_id(struct_key), type_id(key), f'*{struct_key[1]}')
+    return model
+
+def generate_puml_from_model(model, project_dir=None, output_file=None):
+    """Writes GoProject.puml (or `output_file`) for the UmlModel and returns its path."""
+    output_file = output_file or os.path.join(project_dir or '.', "GoProject.puml")
+    return write_puml_lines(output_file, iter_puml_from_model(model), model)
+
+
+def iter_puml_from_model(model):
+    """Generate PlantUML file from the Go UmlModel."""
+    yield "@startuml"
+    yield 'skinparam backgroundColor #23272e'
+    yield 'skinparam classFontColor #ffffff'
+    yield 'skinparam classAttributeFontColor #ffffff'
+    yield 'skinparam classMethodFontColor #ffffff'
+    yield 'skinparam classStereotypeFontColor #ffffff'
+    yield 'skinparam classBorderColor #00add8'  # Go blue
+    # Types are declared as package.Type, so PlantUML groups them by package
+    for struct in model.entities(STRUCT):
+        yield f'class {struct.id} <<GoStruct>> {{'
+        for field in struct.member_names(ATTRIBUTE):
+            yield f'  {field}'
+        for method in struct.member_names(METHOD):
+            yield f'  {method}()'
+        yield '}'
+    for iface in model.entities(INTERFACE):
+        yield f'interface {iface.id} <<GoInterface>> {{'
+        for method in iface.member_names(METHOD):
+            yield f'  {method}()'
+        yield '}'
+    for kind, source, target, label in model.relations():
+        if kind == IMPLEMENTS:
+            yield f'{source} ..|> {target} : {label}' if label else f'{source} ..|> {target}'
+        elif kind == COMPOSITION:
+            yield f'{source} *-- {target}'
+        elif kind == EXTENDS:
+            yield f'{target} <|-- {source}'
+    yield '@enduml'
+
+def main(project_dir, jobs=1, use_cache=True, write_json=True, write_snapshot=True, focus=None, paging=None):
+    with open_parse_cache(project_dir, enabled=use_cache) as cache:
+        model = generate_model(project_dir, jobs=jobs, cache=cache)
+    # --focus draws only the neighborhood of one class; the artifacts keep the full model
+    diagram = apply_focus(model, focus)
+    # The JSON and snapshot artifacts are written in the background; the PUML is generated from the model itself
+    export = export_artifacts(model, project_dir, 'Go_UML_ClassDiagram', 'Go UML', write_json, write_snapshot)
+
+    if paging is not None:
+        puml_path, page_paths = write_pages(diagram, os.path.join(project_dir, 'GoProject_pages'),
+                                            lambda page, path: generate_puml_from_model(page, project_dir, path),
+                                            paging, 'Go Project')
+        svgs = render_svgs(page_paths + [puml_path])
+        svg = svgs[-1] if svgs else None
+    else:
+        puml_path = generate_puml_from_model(diagram, project_dir)
+        svg = render_svg(puml_path)
+    print(f"[UML] Go PUML saved at: {puml_summary(puml_path)}")
     if svg:
-        print(f"[UML] SVG generated: {svg}")
+        print(f"[UML] {output_kind(svg)} generated: {svg}")
     else:
-        print(f"[UML] SVG not generated!")
+        print(f"[UML] {output_kind()} not generated!")
+    if export is not None:
+        export.wait()
 
 if __name__ == '__main__':
     import sys
@@ -0,0 +1,391 @@
+import json
+import os
+from collections import defaultdict
+from LayeredLayout import layered_layout, pack_rows
+from ModelExport import WRITE_BUFFER_SIZE
+from NativeRenderer import box_lines, box_size, entity_link, member_text, stereotype_colors, STUB_COLOR
+from ModelPages import STUB_STEREOTYPE
+
+"""
+HtmlViewer.py
+--------------
+Interactive HTML viewer for diagrams too large for one SVG. Everything the page needs is computed
+here, ahead of time: each namespace is laid out on its own (LayeredLayout) and the namespaces are
+packed as package boxes; the boxes are bucketed in a uniform grid (the spatial index). The page
+embeds the model as compact JSON (a string table plus flat number arrays) and draws on a canvas
+only what intersects the viewport, looked up through the grid, with level of detail:
+package boxes when zoomed out, class names at medium zoom, members when close.
+It also has a search box and click-to-select with neighbor expansion. In paged diagrams the page
+boxes of the index and the <<Stub>> boxes link to the .html page they stand for (double-click, or
+the link of the selection panel).
+
+Used for `--renderer html`; the file is written next to the .puml as <name>.html.
+"""
+
+GRID_CELL = 1024
+PACKAGE_PADDING = 20
+PACKAGE_HEADER = 28
+PACKAGE_GAP = 80
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+class StringTable:
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def __call__(self, text):
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return sid
+
+
+def viewer_data(model, title):
+    """The JSON document embedded in the page (see VIEWER_TEMPLATE for how it is read)."""
+    strings = StringTable()
+    entities = list(model.entities())
+    boxes = [box_lines(entity) for entity in entities]
+    sizes = [box_size(*box) for box in boxes]
+    index_of = {}
+    for e, entity in enumerate(entities):
+        index_of.setdefault(entity.id, e)
+    relations = []
+    seen = set()
+    for kind, source, target, label in model.relations():
+        s = index_of.get(source)
+        t = index_of.get(target)
+        if s is None or t is None or s == t or (kind, s, t) in seen:
+            continue
+        seen.add((kind, s, t))
+        relations.append((kind, s, t, label))
+
+    # One layered layout per namespace, packed as package boxes
+    packages = defaultdict(list)
+    for e, entity in enumerate(entities):
+        packages[entity.namespace].append(e)
+    names = sorted(packages)
+    package_of = [0] * len(entities)
+    for p, name in enumerate(names):
+        for e in packages[name]:
+            package_of[e] = p
+    local_edges = defaultdict(list)
+    for r, (_, s, t, _) in enumerate(relations):
+        if package_of[s] == package_of[t]:
+            local_edges[package_of[s]].append(r)
+    layouts = []
+    for p, name in enumerate(names):
+        members = packages[name]
+        local = {e: i for i, e in enumerate(members)}
+        layouts.append(layered_layout([sizes[e] for e in members],
+                                      [(local[relations[r][2]], local[relations[r][1]]) for r in local_edges[p]]))
+    offsets, width, height = pack_rows([(layout.width + 2 * PACKAGE_PADDING,
+                                         layout.height + 2 * PACKAGE_PADDING + PACKAGE_HEADER) for layout in layouts],
+                                       PACKAGE_GAP)
+    positions = [None] * len(entities)
+    routes = [None] * len(relations)
+    package_rows = []
+    for p, (name, layout, (x, y)) in enumerate(zip(names, layouts, offsets)):
+        ox = x + PACKAGE_PADDING
+        oy = y + PACKAGE_PADDING + PACKAGE_HEADER
+        for e, (px, py) in zip(packages[name], layout.positions):
+            positions[e] = (ox + px, oy + py)
+        for r, points in zip(local_edges[p], layout.routes):
+            routes[r] = [(ox + px, oy + py) for px, py in points]
+        package_rows.append([round(x), round(y), round(layout.width + 2 * PACKAGE_PADDING),
+                             round(layout.height + 2 * PACKAGE_PADDING + PACKAGE_HEADER),
+                             strings(name or '(global)'), len(packages[name])])
+
+    colors = stereotype_colors(set(entity.stereotype for entity in entities))
+    colors[STUB_STEREOTYPE] = STUB_COLOR
+    # nodes: x, y, w, h, id, name, header, stereotype color, package, first member, fields, methods
+    nodes = []
+    member_texts = []
+    for e, (entity, (header, fields, methods)) in enumerate(zip(entities, boxes)):
+        x, y = positions[e]
+        w, h = sizes[e]
+        nodes.extend((round(x), round(y), round(w), round(h), strings(entity.id), strings(header[-1]),
+                      strings(header[0]) if len(header) > 1 else -1, strings(colors[entity.stereotype]),
+                      package_of[e], len(member_texts), len(fields), len(methods)))
+        member_texts.extend(strings(member_text(m)) for m in fields + methods)
+    # Paged diagrams: node index, link string
+    links = []
+    for e, entity in enumerate(entities):
+        link = entity_link(entity, '.html')
+        if link:
+            links.extend((e, strings(link)))
+    edges = []
+    for (kind, s, t, label), route in zip(relations, routes):
+        if route is None:
+            # Between packages: straight from the top of the source to the bottom of the target
+            (sx, sy), (sw, _) = positions[s], sizes[s]
+            (tx, ty), (tw, th) = positions[t], sizes[t]
+            route = [(tx + tw / 2, ty + th), (sx + sw / 2, sy)]
+        edge = [kind, s, t, strings(label) if label else -1]
+        # Routes run from the target to the source; stored from the source, like the arrows
+        for px, py in reversed(route):
+            edge.extend((round(px), round(py)))
+        edges.append(edge)
+
+    # Spatial index: grid cell -> boxes overlapping it
+    cells = defaultdict(list)
+    for e in range(len(entities)):
+        x, y = positions[e]
+        w, h = sizes[e]
+        for cy in range(int(y // GRID_CELL), int((y + h) // GRID_CELL) + 1):
+            for cx in range(int(x // GRID_CELL), int((x + w) // GRID_CELL) + 1):
+                cells[(cx, cy)].append(e)
+    grid = []
+    for (cx, cy), members in sorted(cells.items()):
+        grid.append([cx, cy] + members)
+    return {'title': title, 'width': round(width), 'height': round(height), 'cell': GRID_CELL,
+            'strings': strings.strings, 'nodes': nodes, 'members': member_texts, 'edges': edges,
+            'packages': package_rows, 'grid': grid, 'links': links}
+
+
+def write_html_viewer(model, html_path, title='UML Class Diagram'):
+    """Writes the interactive viewer of `model` to `html_path`; returns the path."""
+    data = viewer_data(model, title)
+    head, tail = VIEWER_TEMPLATE.split('__DATA__')
+    tmp = f'{html_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(head.replace('__TITLE__', title.replace('&', '&amp;').replace('<', '&lt;')))
+        for chunk in _encoder.iterencode(data):
+            # Keeps "</script>" inside a string from closing the data block
+            f.write(chunk.replace('</', '<\\/'))
+        f.write(tail)
+    os.replace(tmp, html_path)
+    return html_path
+
+
+VIEWER_TEMPLATE = r'''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  html, body { margin: 0; height: 100%; overflow: hidden; font-family: sans-serif; }
+  #view { position: absolute; left: 0; top: 0; width: 100%; height: 100%; cursor: grab; background: #ffffff; }
+  #panel { position: absolute; left: 10px; top: 10px; width: 300px; max-height: 90%; overflow: auto;
+           background: rgba(255, 255, 255, 0.95); border: 1px solid #aaa; border-radius: 4px; padding: 8px; font-size: 13px; }
+  #panel input { width: 100%; box-sizing: border-box; }
+  #panel ul { list-style: none; padding: 0; margin: 4px 0; }
+  #panel li { cursor: pointer; padding: 1px 2px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+  #panel li:hover { background: #eef; }
+  #panel button { margin: 4px 4px 0 0; }
+  .muted { color: #777; }
+</style>
+</head>
+<body>
+<canvas id="view"></canvas>
+<div id="panel">
+  <b id="title"></b> <span id="stats" class="muted"></span>
+  <input id="search" type="search" placeholder="Search classes...">
+  <ul id="results"></ul>
+  <div id="selection"></div>
+</div>
+<script id="uuml-data" type="application/json">__DATA__</script>
+<script>
+"use strict";
+const D = JSON.parse(document.getElementById('uuml-data').textContent);
+const S = D.strings, N = D.nodes, F = 12, COUNT = N.length / F;
+const KIND_COLORS = ['#FF4500', '#1E90FF', '#32CD32', '#555555'];
+const PACKAGE_ZOOM = 0.12, MEMBER_ZOOM = 0.6;
+const canvas = document.getElementById('view'), ctx = canvas.getContext('2d');
+
+// Spatial index and adjacency
+const grid = new Map();
+for (const row of D.grid) grid.set(row[0] + ',' + row[1], row.slice(2));
+const links = new Map();
+for (let k = 0; k < D.links.length; k += 2) links.set(D.links[k], S[D.links[k + 1]]);
+const adjacency = Array.from({length: COUNT}, () => []);
+D.edges.forEach((edge, i) => { adjacency[edge[1]].push(i); adjacency[edge[2]].push(i); });
+
+let view = {x: 0, y: 0, scale: 1};
+let selected = -1, expanded = new Set();
+const stamp = new Uint32Array(Math.max(COUNT, D.edges.length)); let frame = 0;
+
+function node(i) { const o = i * F; return N.slice(o, o + F); }
+function fit(x, y, w, h) {
+  const scale = Math.min(canvas.clientWidth / (w + 40), canvas.clientHeight / (h + 40));
+  view.scale = Math.min(scale, 2);
+  view.x = x + w / 2 - canvas.clientWidth / 2 / view.scale;
+  view.y = y + h / 2 - canvas.clientHeight / 2 / view.scale;
+  draw();
+}
+function visibleNodes() {
+  const x0 = view.x, y0 = view.y, x1 = x0 + canvas.clientWidth / view.scale, y1 = y0 + canvas.clientHeight / view.scale;
+  const result = []; frame++;
+  for (let cy = Math.floor(y0 / D.cell); cy <= Math.floor(y1 / D.cell); cy++) {
+    for (let cx = Math.floor(x0 / D.cell); cx <= Math.floor(x1 / D.cell); cx++) {
+      const bucket = grid.get(cx + ',' + cy);
+      if (!bucket) continue;
+      for (const i of bucket) {
+        if (stamp[i] === frame) continue;
+        stamp[i] = frame;
+        const o = i * F;
+        if (N[o] < x1 && N[o] + N[o + 2] > x0 && N[o + 1] < y1 && N[o + 1] + N[o + 3] > y0) result.push(i);
+      }
+    }
+  }
+  return result;
+}
+function drawEdge(edge, highlight) {
+  ctx.strokeStyle = KIND_COLORS[edge[0]] || '#555';
+  ctx.lineWidth = (highlight ? 3 : 1.5) / Math.max(view.scale, 0.3);
+  ctx.setLineDash(edge[0] === 1 ? [6, 4] : []);
+  ctx.beginPath();
+  ctx.moveTo(edge[4], edge[5]);
+  for (let k = 6; k < edge.length; k += 2) ctx.lineTo(edge[k], edge[k + 1]);
+  ctx.stroke();
+  const n = edge.length, ex = edge[n - 2], ey = edge[n - 1], px = edge[n - 4], py = edge[n - 3];
+  const angle = Math.atan2(ey - py, ex - px), size = 10;
+  ctx.setLineDash([]);
+  ctx.beginPath();
+  ctx.moveTo(ex, ey);
+  ctx.lineTo(ex - size * Math.cos(angle - 0.4), ey - size * Math.sin(angle - 0.4));
+  ctx.lineTo(ex - size * Math.cos(angle + 0.4), ey - size * Math.sin(angle + 0.4));
+  ctx.closePath();
+  if (edge[0] <= 1) { ctx.fillStyle = '#fff'; ctx.fill(); ctx.stroke(); } else { ctx.fillStyle = ctx.strokeStyle; ctx.fill(); }
+  if (edge[3] >= 0 && view.scale >= MEMBER_ZOOM) {
+    const m = 4 + 2 * Math.floor((n - 4) / 4);
+    ctx.fillStyle = '#222'; ctx.font = F + 'px monospace';
+    ctx.fillText(S[edge[3]], edge[m] + 4, edge[m + 1]);
+  }
+}
+function drawNode(i, highlight) {
+  const [x, y, w, h, , name, header, color, , first, fields, methods] = node(i);
+  const close = view.scale >= MEMBER_ZOOM;
+  const height = close ? h : Math.min(h, 40);
+  ctx.fillStyle = S[color];
+  ctx.fillRect(x, y, w, height);
+  ctx.lineWidth = (highlight ? 4 : 1) / Math.max(view.scale, 0.3);
+  ctx.strokeStyle = highlight ? '#d00' : '#181818';
+  ctx.strokeRect(x, y, w, height);
+  if (12 * view.scale < 3) return;
+  ctx.fillStyle = '#000';
+  ctx.textAlign = 'center';
+  ctx.font = 'bold 12px monospace';
+  if (!close) { ctx.fillText(S[name], x + w / 2, y + Math.min(height / 2 + 4, 24)); ctx.textAlign = 'left'; return; }
+  let top = y + 8;
+  if (header >= 0) { ctx.font = 'italic 12px monospace'; ctx.fillText(S[header], x + w / 2, top + 12); top += 16; ctx.font = 'bold 12px monospace'; }
+  ctx.fillText(S[name], x + w / 2, top + 12); top += 16;
+  ctx.textAlign = 'left'; ctx.font = '12px monospace';
+  for (const [start, count] of [[first, fields], [first + fields, methods]]) {
+    if (!count) continue;
+    ctx.beginPath(); ctx.moveTo(x, top + 4); ctx.lineTo(x + w, top + 4); ctx.lineWidth = 1 / view.scale; ctx.stroke();
+    top += 8;
+    for (let k = start; k < start + count; k++) { ctx.fillText(S[D.members[k]], x + 8, top + 12); top += 16; }
+  }
+}
+function draw() {
+  const dpr = window.devicePixelRatio || 1;
+  canvas.width = canvas.clientWidth * dpr; canvas.height = canvas.clientHeight * dpr;
+  ctx.setTransform(1, 0, 0, 1, 0, 0);
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  ctx.setTransform(dpr * view.scale, 0, 0, dpr * view.scale, -view.x * view.scale * dpr, -view.y * view.scale * dpr);
+  const x1 = view.x + canvas.clientWidth / view.scale, y1 = view.y + canvas.clientHeight / view.scale;
+  for (const [x, y, w, h, name, count] of D.packages) {
+    if (x > x1 || y > y1 || x + w < view.x || y + h < view.y) continue;
+    ctx.fillStyle = view.scale < PACKAGE_ZOOM ? '#FFF0B3' : '#FAFAFA';
+    ctx.fillRect(x, y, w, h);
+    ctx.lineWidth = 2 / view.scale; ctx.strokeStyle = '#888'; ctx.setLineDash([]); ctx.strokeRect(x, y, w, h);
+    ctx.fillStyle = '#333'; ctx.textAlign = 'left';
+    const size = view.scale < PACKAGE_ZOOM ? Math.min(14 / view.scale, h / 4) : 16;
+    ctx.font = 'bold ' + size + 'px sans-serif';
+    ctx.fillText(S[name] + (view.scale < PACKAGE_ZOOM ? ' (' + count + ')' : ''), x + 8, y + size + 4);
+  }
+  const visible = view.scale < PACKAGE_ZOOM ? [] : visibleNodes();
+  // Edges of the visible boxes, then those of the selection wherever they go
+  frame++;
+  for (const i of visible) for (const e of adjacency[i]) if (stamp[e] !== frame) { stamp[e] = frame; drawEdge(D.edges[e], false); }
+  for (const i of expanded) for (const e of adjacency[i]) {
+    const edge = D.edges[e];
+    if (expanded.has(edge[1]) && expanded.has(edge[2])) drawEdge(edge, true);
+  }
+  for (const i of visible) drawNode(i, expanded.has(i));
+  for (const i of expanded) drawNode(i, true);
+}
+
+// Selection panel, search and neighbor expansion
+function neighbors(i) { return adjacency[i].map(e => D.edges[e][1] === i ? D.edges[e][2] : D.edges[e][1]); }
+function link(i) { const li = document.createElement('li'); li.textContent = S[N[i * F + 5]]; li.title = S[N[i * F + 4]]; li.onclick = () => select(i, true); return li; }
+function select(i, center) {
+  selected = i; expanded = new Set(i < 0 ? [] : [i]);
+  if (center && i >= 0) { const [x, y, w, h] = node(i); view.scale = Math.max(view.scale, 1); fit(x - 200, y - 200, w + 400, h + 400); }
+  showSelection(); draw();
+}
+function showSelection() {
+  const box = document.getElementById('selection'); box.innerHTML = '';
+  if (selected < 0) return;
+  const title = document.createElement('div');
+  title.innerHTML = '<b></b><br><span class="muted"></span>';
+  title.firstChild.textContent = S[N[selected * F + 5]];
+  title.lastChild.textContent = S[N[selected * F + 4]] + ' — ' + S[D.packages[N[selected * F + 8]][4]];
+  box.appendChild(title);
+  if (links.has(selected)) {
+    const open = document.createElement('a'); open.href = links.get(selected); open.textContent = 'Open ' + links.get(selected);
+    box.append(open, document.createElement('br'));
+  }
+  const expand = document.createElement('button'); expand.textContent = 'Expand neighbors (' + expanded.size + ')';
+  expand.onclick = () => { for (const i of [...expanded]) for (const m of neighbors(i)) expanded.add(m); showSelection(); draw(); };
+  const show = document.createElement('button'); show.textContent = 'Fit';
+  show.onclick = () => {
+    let x0 = Infinity, y0 = Infinity, x1 = -Infinity, y1 = -Infinity;
+    for (const i of expanded) { const [x, y, w, h] = node(i); x0 = Math.min(x0, x); y0 = Math.min(y0, y); x1 = Math.max(x1, x + w); y1 = Math.max(y1, y + h); }
+    fit(x0, y0, x1 - x0, y1 - y0);
+  };
+  box.append(expand, show);
+  const list = document.createElement('ul');
+  for (const m of new Set(neighbors(selected))) list.appendChild(link(m));
+  box.appendChild(list);
+}
+document.getElementById('search').oninput = event => {
+  const query = event.target.value.toLowerCase(), results = document.getElementById('results');
+  results.innerHTML = '';
+  if (!query) return;
+  for (let i = 0, found = 0; i < COUNT && found < 30; i++) {
+    if (S[N[i * F + 4]].toLowerCase().includes(query)) { results.appendChild(link(i)); found++; }
+  }
+};
+
+// Pan, zoom and click
+let drag = null;
+canvas.onmousedown = event => { drag = {x: event.clientX, y: event.clientY, vx: view.x, vy: view.y, moved: false}; };
+window.onmousemove = event => {
+  if (!drag) return;
+  const dx = event.clientX - drag.x, dy = event.clientY - drag.y;
+  if (Math.abs(dx) + Math.abs(dy) > 3) drag.moved = true;
+  view.x = drag.vx - dx / view.scale; view.y = drag.vy - dy / view.scale;
+  draw();
+};
+function hitTest(event) {
+  const wx = view.x + event.offsetX / view.scale, wy = view.y + event.offsetY / view.scale;
+  const bucket = grid.get(Math.floor(wx / D.cell) + ',' + Math.floor(wy / D.cell)) || [];
+  const hit = bucket.find(i => { const [x, y, w, h] = node(i); return wx >= x && wx <= x + w && wy >= y && wy <= y + h; });
+  return hit === undefined ? -1 : hit;
+}
+window.onmouseup = event => {
+  if (drag && !drag.moved && event.target === canvas) select(hitTest(event), false);
+  drag = null;
+};
+// Page and <<Stub>> boxes of paged diagrams open their page
+canvas.ondblclick = event => { const hit = hitTest(event); if (links.has(hit)) window.location.href = links.get(hit); };
+canvas.onwheel = event => {
+  event.preventDefault();
+  const factor = Math.exp(-event.deltaY * 0.0015);
+  const wx = view.x + event.offsetX / view.scale, wy = view.y + event.offsetY / view.scale;
+  view.scale = Math.min(4, Math.max(0.002, view.scale * factor));
+  view.x = wx - event.offsetX / view.scale; view.y = wy - event.offsetY / view.scale;
+  draw();
+};
+window.onresize = draw;
+document.getElementById('title').textContent = D.title;
+document.getElementById('stats').textContent = COUNT + ' classes, ' + D.edges.length + ' relations';
+fit(0, 0, D.width, D.height);
+</script>
+</body>
+</html>
+'''
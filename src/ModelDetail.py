@@ -0,0 +1,156 @@
+import time
+from collections import namedtuple
+from UmlModel import UmlModel, Entity, ENUM, METHOD, STATIC_ATTRIBUTE, STATIC_METHOD, VALUE
+from PumlWriter import write_puml_lines
+
+"""
+ModelDetail.py
+---------------
+Level of detail of the class boxes, for classes with hundreds of properties and generated enums with
+thousands of values. Like --focus, it produces the model handed to the emitter (the JSON and
+snapshot artifacts keep the full model):
+- public-only: protected and private members are left out;
+- accessors: a GetX/SetX (or IsX/SetX) method pair becomes one 'Get/SetX' method;
+- caps: at most `max_members` attributes and `max_members` methods per class, and `max_values`
+  values per enum; the rest is summarized by a '+N more' line.
+The '+N more' lines are VALUE members with type MORE, so every emitter can draw them as plain text.
+Every member of the collapsed entities is written to a side file, so nothing is lost.
+"""
+
+# Type of the '+N more' member lines
+MORE = '+more'
+
+Detail = namedtuple('Detail', ('max_members', 'public_only', 'collapse_accessors', 'max_values'))
+
+
+def make_detail(max_members=0, public_only=False, collapse_accessors=False, max_values=0):
+    """Detail policy, or None when every member is drawn (0 = no cap)."""
+    if not (max_members or public_only or collapse_accessors or max_values):
+        return None
+    return Detail(max_members, public_only, collapse_accessors, max_values)
+
+
+def is_more(member):
+    return member.kind == VALUE and member.type == MORE
+
+
+def more_line(count, what):
+    return f'+{count} more {what}' + ('s' if count != 1 else '')
+
+
+def _accessor_pairs(methods):
+    """Getter index -> setter index of the GetX/SetX and IsX/SetX pairs among `methods`."""
+    setters = {}
+    for i, m in enumerate(methods):
+        if m.name.startswith('Set') and len(m.name) > 3:
+            setters.setdefault(m.name[3:], i)
+    pairs = {}
+    for i, m in enumerate(methods):
+        for prefix in ('Get', 'Is'):
+            if m.name.startswith(prefix) and len(m.name) > len(prefix):
+                setter = setters.get(m.name[len(prefix):])
+                if setter is not None and setter not in pairs.values():
+                    pairs[i] = setter
+                break
+    return pairs
+
+
+def collapse_members(entity, detail):
+    """
+    (kept fields, kept methods, hidden fields, hidden methods) of one entity under `detail`; a
+    collapsed accessor pair is one kept Member named 'Get/SetX'. Enum values count as fields.
+    """
+    fields = []
+    methods = []
+    for m in entity.members():
+        if detail.public_only and m.visibility != 0 and m.kind != VALUE:
+            continue
+        (methods if m.kind in (METHOD, STATIC_METHOD) else fields).append(m)
+    if detail.collapse_accessors and methods:
+        pairs = _accessor_pairs(methods)
+        setters = set(pairs.values())
+        collapsed = []
+        for i, m in enumerate(methods):
+            if i in setters:
+                continue
+            if i in pairs:
+                prefix = 'Is' if m.name.startswith('Is') else 'Get'
+                m.name = f'{prefix}/Set{m.name[len(prefix):]}'
+                m.params = ''
+            collapsed.append(m)
+        methods = collapsed
+    cap = detail.max_values if entity.kind == ENUM else detail.max_members
+    hidden_fields = hidden_methods = 0
+    if cap and len(fields) > cap:
+        hidden_fields = len(fields) - cap
+        fields = fields[:cap]
+    if detail.max_members and len(methods) > detail.max_members:
+        hidden_methods = len(methods) - detail.max_members
+        methods = methods[:detail.max_members]
+    return fields, methods, hidden_fields, hidden_methods
+
+
+def detail_model(model, detail):
+    """(model with the members of `detail`, indices of the entities whose boxes lost members)."""
+    symbols = model.symbols.names
+    result = UmlModel()
+    collapsed = []
+    for e in range(len(model)):
+        entity = Entity(model, e)
+        result.add_entity(entity.id, entity.kind, entity.name, entity.namespace, entity.stereotype, entity.template)
+        start, end = model.member_range(e)
+        fields, methods, hidden_fields, hidden_methods = collapse_members(entity, detail)
+        if len(fields) + len(methods) == end - start:
+            # Nothing dropped or merged: members are copied in declaration order
+            for m in range(start, end):
+                result.add_member(model.member_kind[m], symbols[model.member_name[m]], symbols[model.member_type[m]],
+                                  symbols[model.member_params[m]], model.member_visibility[m])
+            continue
+        collapsed.append(e)
+        for m in fields:
+            result.add_member(m.kind, m.name, m.type, m.params, m.visibility)
+        if hidden_fields:
+            result.add_member(VALUE, more_line(hidden_fields, 'value' if entity.kind == ENUM else 'attribute'), MORE)
+        for m in methods:
+            result.add_member(m.kind, m.name, m.type, m.params, m.visibility)
+        if hidden_methods:
+            result.add_member(VALUE, more_line(hidden_methods, 'method'), MORE)
+    for kind, source, target, label in model.relations():
+        result.add_relation(kind, source, target, label)
+    return result, collapsed
+
+
+def iter_detail_lines(model, entities):
+    """Lines of the side file: every member of the given entities, grouped by entity."""
+    marks = ('+', '#', '-')
+    yield f'Full members of the {len(entities)} classes collapsed in the diagram'
+    for e in entities:
+        entity = Entity(model, e)
+        yield ''
+        yield f'{entity.id} ({entity.namespace})' if entity.namespace else entity.id
+        for m in entity.members():
+            if m.kind == VALUE:
+                yield f'  {m.name}'
+                continue
+            static = '{static} ' if m.kind in (STATIC_ATTRIBUTE, STATIC_METHOD) else ''
+            params = f'({m.params})' if m.kind in (METHOD, STATIC_METHOD) else ''
+            type_ = f' : {m.type}' if m.type else ''
+            yield f'  {static}{marks[m.visibility]}{m.name}{params}{type_}'
+
+
+def apply_detail(model, detail, details_path=None):
+    """
+    The model to draw: `model` itself without a detail policy, else the collapsed model; the members
+    of the collapsed entities go to `details_path`.
+    """
+    if detail is None:
+        return model
+    start = time.perf_counter()
+    result, collapsed = detail_model(model, detail)
+    elapsed = time.perf_counter() - start
+    print(f"[UML] Member detail: {len(collapsed)} of {len(model)} entities collapsed "
+          f"({len(result.member_kind)} of {len(model.member_kind)} member lines kept) in {elapsed * 1000:.1f} ms")
+    if collapsed and details_path:
+        write_puml_lines(details_path, iter_detail_lines(model, collapsed))
+        print(f"[UML] Full members of the collapsed entities at: {details_path}")
+    return result
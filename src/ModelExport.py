@@ -0,0 +1,83 @@
+import os
+import json
+import threading
+from ModelSnapshot import write_snapshot, SNAPSHOT_EXT
+from UmlModel import JSON_SCHEMA
+
+"""
+ModelExport.py
+---------------
+Optional artifacts of a UmlModel, written next to the diagram:
+- <name>.json: compact JSON, encoded one entity at a time into a buffered file, so the whole
+  document is never held in memory;
+- <name>.uumlsnap: binary snapshot that downstream tools can mmap and query lazily (ModelSnapshot).
+export_artifacts writes them on a background thread while the caller goes on emitting the .puml
+and rendering; nothing reads them back.
+"""
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def iter_json(model):
+    """Yields the JSON text of model.to_dict() in chunks, one entity or relation per chunk."""
+    yield f'{{"schema":{JSON_SCHEMA},"entities":['
+    for index, entity in enumerate(model.entities()):
+        yield (',' if index else '') + _encode(entity.to_dict())
+    yield '],"relations":['
+    for index, relation in enumerate(model.relation_dicts()):
+        yield (',' if index else '') + _encode(relation)
+    yield ']}'
+
+
+def write_json(model, path):
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        for chunk in iter_json(model):
+            f.write(chunk)
+    return path
+
+
+class ModelExport(threading.Thread):
+    """Background writer of (label, path, writer) targets; wait() joins it and reports each one."""
+
+    def __init__(self, model, targets):
+        super().__init__(name='uuml-model-export', daemon=True)
+        self.model = model
+        self.targets = targets
+        self.errors = {}
+
+    def run(self):
+        for label, path, writer in self.targets:
+            try:
+                writer(self.model, path)
+            except Exception as e:
+                self.errors[label] = e
+
+    def wait(self):
+        self.join()
+        for label, path, _ in self.targets:
+            if label in self.errors:
+                print(f"[UML] Error writing {label}: {self.errors[label]}")
+            else:
+                print(f'[UML] {label} saved at: {path}')
+        return not self.errors
+
+
+def export_artifacts(model, project_dir, basename, label='UML', with_json=True, with_snapshot=True):
+    """
+    Starts writing <basename>.json and/or <basename>.uumlsnap in `project_dir` in the background.
+    Returns the ModelExport to wait() on, or None when nothing is written. The model must not
+    change meanwhile.
+    """
+    base = os.path.join(project_dir, basename)
+    targets = []
+    if with_json:
+        targets.append((f'{label} JSON', base + '.json', write_json))
+    if with_snapshot:
+        targets.append((f'{label} snapshot', base + SNAPSHOT_EXT, write_snapshot))
+    if not targets:
+        return None
+    export = ModelExport(model, targets)
+    export.start()
+    return export
@@ -0,0 +1,105 @@
+import sys
+import time
+from collections import defaultdict, namedtuple
+from UmlModel import UmlModel
+
+"""
+ModelFocus.py
+--------------
+--focus: keeps only the neighborhood of one class. An adjacency index over the relations of the model
+(extends, implements, association, composition; by interned id) is walked breadth-first up to `depth`
+hops, and a UmlModel with just the reached entities and the relations between them is handed to the
+usual emitter. 'up' follows relations from a class to its bases and the types it uses, 'down' from a
+class to the classes that derive from or use it, 'both' ignores the direction.
+"""
+
+DIRECTIONS = ('up', 'down', 'both')
+
+Focus = namedtuple('Focus', ('name', 'depth', 'direction'))
+
+
+class RelationIndex:
+    """Relation numbers by source and by target symbol id; built once per model, then BFS is O(neighborhood)."""
+
+    def __init__(self, model):
+        self.model = model
+        self.up = defaultdict(list)
+        self.down = defaultdict(list)
+        for r, (source, target) in enumerate(zip(model.relation_from, model.relation_to)):
+            self.up[source].append(r)
+            self.down[target].append(r)
+
+    def seeds(self, name):
+        """Symbol ids of the focus: the entity or relation end with that id, or the entities with that name."""
+        model = self.model
+        sid = model.symbols.ids.get(name)
+        if sid is not None and (model.find(name) is not None or sid in self.up or sid in self.down):
+            return [sid]
+        return [model.entity_id[e] for e, entity_name in enumerate(model.entity_name)
+                if model.symbols.names[entity_name] == name]
+
+    def neighborhood(self, seeds, depth, direction='both'):
+        """Symbol ids reachable from `seeds` in at most `depth` hops, mapped to their distance."""
+        model = self.model
+        distance = dict.fromkeys(seeds, 0)
+        frontier = list(distance)
+        for hop in range(1, depth + 1):
+            reached = []
+            for sid in frontier:
+                if direction in ('up', 'both'):
+                    for r in self.up.get(sid, ()):
+                        target = model.relation_to[r]
+                        if target not in distance:
+                            distance[target] = hop
+                            reached.append(target)
+                if direction in ('down', 'both'):
+                    for r in self.down.get(sid, ()):
+                        source = model.relation_from[r]
+                        if source not in distance:
+                            distance[source] = hop
+                            reached.append(source)
+            if not reached:
+                break
+            frontier = reached
+        return distance
+
+    def subgraph(self, sids):
+        """A new UmlModel with the entities of `sids` (in model order) and the relations among them."""
+        model = self.model
+        symbols = model.symbols.names
+        sub = UmlModel()
+        entities = [entity for entity in (model.find(symbols[sid]) for sid in sids) if entity is not None]
+        for entity in sorted(entities, key=lambda e: e.index):
+            sub.add_entity(entity.id, entity.kind, entity.name, entity.namespace, entity.stereotype,
+                           entity.template)
+            for m in entity.members():
+                sub.add_member(m.kind, m.name, m.type, m.params, m.visibility)
+        relations = sorted(r for sid in sids for r in self.up.get(sid, ()) if model.relation_to[r] in sids)
+        for r in relations:
+            sub.add_relation(model.relation_kind[r], symbols[model.relation_from[r]],
+                             symbols[model.relation_to[r]], symbols[model.relation_label[r]])
+        return sub
+
+
+def focus_model(model, focus, index=None):
+    """UmlModel of the `focus` neighborhood, or None if the focus class is not in the model."""
+    index = index or RelationIndex(model)
+    seeds = index.seeds(focus.name)
+    if not seeds:
+        return None
+    return index.subgraph(index.neighborhood(seeds, focus.depth, focus.direction))
+
+
+def apply_focus(model, focus):
+    """The model to draw: `model` itself without a focus, else its focus neighborhood (exits if the class is unknown)."""
+    if focus is None:
+        return model
+    start = time.perf_counter()
+    sub = focus_model(model, focus)
+    elapsed = time.perf_counter() - start
+    if sub is None:
+        print(f"[UML] ERROR: '{focus.name}' was not found in the model; nothing to focus on.")
+        sys.exit(1)
+    print(f"[UML] Focus on {focus.name} (depth {focus.depth}, {focus.direction}): "
+          f"{len(sub)} of {len(model)} entities, extracted in {elapsed * 1000:.1f} ms")
+    return sub
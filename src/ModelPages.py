@@ -0,0 +1,293 @@
+import os
+from collections import defaultdict, namedtuple, deque
+from UmlModel import UmlModel, Entity, CLASS, VALUE, ASSOCIATION
+from PumlWriter import write_puml_lines
+
+"""
+ModelPages.py
+--------------
+Splits a UmlModel into pages of bounded size, so PlantUML lays out many small diagrams instead of one
+huge one. Entities are grouped by structure first (the namespace: Unreal module, C#/Go namespace or
+package, or a key given by the backend, e.g. the Python package); a group that does not fit on one
+page, or a model without any structure, is split into graph communities (label propagation), and
+communities still too large are cut in BFS order. Consecutive small groups share a page.
+
+Each page is emitted by the backend's own emitter as a sub-model; a relation is drawn on the page of
+its source, and a target living on another page appears there as an empty <<Stub>> entity whose
+namespace names that page. An index page shows every page, its size and the cross-page references.
+"""
+
+DEFAULT_MAX_EDGES_PER_NODE = 2
+STUB_STEREOTYPE = 'Stub'
+PAGE_STEREOTYPE = 'Page'
+LABEL_PROPAGATION_ROUNDS = 10
+
+Paging = namedtuple('Paging', ('max_nodes', 'max_edges'))
+
+
+def make_paging(max_nodes, max_edges=None):
+    """Paging limits; the edge budget defaults to DEFAULT_MAX_EDGES_PER_NODE edges per node."""
+    return Paging(max_nodes, max_edges or max_nodes * DEFAULT_MAX_EDGES_PER_NODE)
+
+
+class Page:
+    __slots__ = ('number', 'title', 'entities', 'edges')
+
+    def __init__(self, number, title, entities, edges):
+        self.number = number
+        self.title = title
+        # Entity indices of the model, in model order
+        self.entities = entities
+        self.edges = edges
+
+    @property
+    def name(self):
+        return f'page_{self.number:03d}'
+
+
+def _graph(model):
+    """(entity index by id symbol, outgoing relation count per entity, undirected neighbors per entity)."""
+    by_id = {}
+    for e, sid in enumerate(model.entity_id):
+        by_id.setdefault(sid, e)
+    edges = [0] * len(model)
+    neighbors = defaultdict(set)
+    for source, target in zip(model.relation_from, model.relation_to):
+        s = by_id.get(source)
+        t = by_id.get(target)
+        owner = s if s is not None else t
+        if owner is not None:
+            edges[owner] += 1
+        if s is not None and t is not None and s != t:
+            neighbors[s].add(t)
+            neighbors[t].add(s)
+    return by_id, edges, neighbors
+
+
+def communities(nodes, neighbors):
+    """Label propagation restricted to `nodes`; deterministic (fixed order, ties go to the smallest label)."""
+    members = set(nodes)
+    label = {n: n for n in nodes}
+    for _ in range(LABEL_PROPAGATION_ROUNDS):
+        changed = False
+        for n in nodes:
+            counts = defaultdict(int)
+            for m in neighbors.get(n, ()):
+                if m in members:
+                    counts[label[m]] += 1
+            if not counts:
+                continue
+            best = max(counts.values())
+            new = min(lbl for lbl, c in counts.items() if c == best)
+            if new != label[n]:
+                label[n] = new
+                changed = True
+        if not changed:
+            break
+    groups = defaultdict(list)
+    for n in nodes:
+        groups[label[n]].append(n)
+    return sorted(groups.values(), key=lambda group: group[0])
+
+
+def _bfs_chunks(nodes, neighbors, edges, paging):
+    """Cuts `nodes` into chunks within the limits, following BFS order so chunks stay connected."""
+    members = set(nodes)
+    seen = set()
+    order = []
+    for root in nodes:
+        if root in seen:
+            continue
+        seen.add(root)
+        queue = deque([root])
+        while queue:
+            n = queue.popleft()
+            order.append(n)
+            for m in sorted(neighbors.get(n, ())):
+                if m in members and m not in seen:
+                    seen.add(m)
+                    queue.append(m)
+    chunks = []
+    chunk, chunk_edges = [], 0
+    for n in order:
+        if chunk and (len(chunk) >= paging.max_nodes or chunk_edges + edges[n] > paging.max_edges):
+            chunks.append(chunk)
+            chunk, chunk_edges = [], 0
+        chunk.append(n)
+        chunk_edges += edges[n]
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _fits(nodes, edges, paging):
+    return len(nodes) <= paging.max_nodes and sum(edges[n] for n in nodes) <= paging.max_edges
+
+
+def partition(model, paging, group=None):
+    """
+    Splits the entities of `model` into Pages within `paging` limits (a single entity with more
+    relations than max_edges still gets a page of its own). `group` maps an Entity to its group
+    key; by default the namespace is used.
+    """
+    _, edges, neighbors = _graph(model)
+    key_of = group or (lambda entity: entity.namespace)
+    groups = defaultdict(list)
+    for e in range(len(model)):
+        groups[key_of(Entity(model, e))].append(e)
+    chunks = []
+    for key in sorted(groups):
+        nodes = groups[key]
+        if _fits(nodes, edges, paging):
+            chunks.append((key, nodes))
+            continue
+        # No structure to split by (or a group too large): graph communities, then BFS cuts
+        for community in communities(nodes, neighbors):
+            if _fits(community, edges, paging):
+                chunks.append((key, community))
+            else:
+                chunks.extend((key, chunk) for chunk in _bfs_chunks(community, neighbors, edges, paging))
+    # Consecutive chunks share a page while they fit
+    pages = []
+    keys, nodes, page_edges = [], [], 0
+    for key, chunk in chunks:
+        chunk_edges = sum(edges[n] for n in chunk)
+        if nodes and (len(nodes) + len(chunk) > paging.max_nodes or page_edges + chunk_edges > paging.max_edges):
+            pages.append((keys, nodes, page_edges))
+            keys, nodes, page_edges = [], [], 0
+        if key not in keys:
+            keys.append(key)
+        nodes.extend(chunk)
+        page_edges += chunk_edges
+    if nodes:
+        pages.append((keys, nodes, page_edges))
+    titles = [_title(keys) for keys, _, _ in pages]
+    parts = defaultdict(int)
+    totals = defaultdict(int)
+    for title in titles:
+        totals[title] += 1
+    result = []
+    for number, (title, (_, nodes, page_edges)) in enumerate(zip(titles, pages), 1):
+        if totals[title] > 1:
+            parts[title] += 1
+            title = f'{title} [{parts[title]}/{totals[title]}]'
+        result.append(Page(number, title, sorted(nodes), page_edges))
+    return result
+
+
+def _title(keys):
+    keys = [key or '(global)' for key in keys]
+    return keys[0] if len(keys) == 1 else f'{keys[0]} .. {keys[-1]} ({len(keys)} groups)'
+
+
+def relations_by_page(model, page_of):
+    """Relation numbers grouped by the page that draws them (the page of the source, else of the target)."""
+    by_page = defaultdict(list)
+    for r, (source, target) in enumerate(zip(model.relation_from, model.relation_to)):
+        owner = page_of.get(source) or page_of.get(target)
+        if owner is not None:
+            by_page[owner.number].append(r)
+    return by_page
+
+
+def page_model(model, page, page_of, relations):
+    """
+    Sub-model of one page: its entities with their members, its `relations` (see relations_by_page)
+    and a <<Stub>> entity for every relation end that lives on another page. `page_of` maps an id
+    symbol to the Page holding it.
+    """
+    symbols = model.symbols.names
+    sub = UmlModel()
+    for e in page.entities:
+        start, end = model.member_range(e)
+        sub.add_entity(symbols[model.entity_id[e]], model.entity_kind[e], symbols[model.entity_name[e]],
+                       symbols[model.entity_namespace[e]], symbols[model.entity_stereotype[e]],
+                       symbols[model.entity_template[e]])
+        for m in range(start, end):
+            sub.add_member(model.member_kind[m], symbols[model.member_name[m]], symbols[model.member_type[m]],
+                           symbols[model.member_params[m]], model.member_visibility[m])
+    stubs = {}
+    for r in relations:
+        source = model.relation_from[r]
+        target = model.relation_to[r]
+        for end in (source, target):
+            other = page_of.get(end)
+            if other is not None and other is not page and end not in stubs:
+                stubs[end] = other
+        sub.add_relation(model.relation_kind[r], symbols[source], symbols[target], symbols[model.relation_label[r]])
+    for sid, other in stubs.items():
+        entity = model.find(symbols[sid])
+        sub.add_entity(entity.id, entity.kind, entity.name, f'{other.name}: {other.title}', STUB_STEREOTYPE)
+    return sub
+
+
+def cross_page_references(model, pages, page_of):
+    """(from page number, to page number) -> number of relations between them."""
+    counts = defaultdict(int)
+    for source, target in zip(model.relation_from, model.relation_to):
+        a = page_of.get(source)
+        b = page_of.get(target)
+        if a is not None and b is not None and a is not b:
+            counts[(a.number, b.number)] += 1
+    return counts
+
+
+def index_model(pages, references):
+    """The index as a UmlModel: a <<Page>> entity per page and an association labeled with the reference count."""
+    index = UmlModel()
+    for page in pages:
+        index.add_entity(page.name, CLASS, f'{page.name}: {page.title}', '', PAGE_STEREOTYPE)
+        index.add_member(VALUE, f'{len(page.entities)} entities, {page.edges} relations')
+    for (a, b), count in references:
+        index.add_relation(ASSOCIATION, f'page_{a:03d}', f'page_{b:03d}', str(count))
+    return index
+
+
+def write_index(path, model, pages, page_of, title):
+    """Index diagram: one box per page (linked to its SVG) and an arrow per pair of referencing pages."""
+    references = sorted(cross_page_references(model, pages, page_of).items())
+    lines = ['@startuml', f'title {title} ({len(model)} entities, {len(pages)} pages)',
+             'skinparam rectangle {', '  BackgroundColor #FFF0B3', '  BorderColor #888', '}', '']
+    for page in pages:
+        lines.append(f'rectangle "{page.name}\\n{page.title}\\n{len(page.entities)} entities, {page.edges} relations" '
+                     f'as {page.name} [[{page.name}.svg]]')
+    lines.append('')
+    for (a, b), count in references:
+        lines.append(f'page_{a:03d} --> page_{b:03d} : {count}')
+    lines.append('@enduml')
+    return write_puml_lines(path, lines, index_model(pages, references))
+
+
+def write_pages(model, pages_dir, emit, paging, title, group=None):
+    """
+    Partitions `model` and writes <pages_dir>/page_NNN.puml through `emit(sub_model, output_file)`,
+    plus <pages_dir>/index.puml. Returns (index path, page paths).
+    """
+    os.makedirs(pages_dir, exist_ok=True)
+    pages = partition(model, paging, group)
+    page_of = {}
+    for page in pages:
+        for e in page.entities:
+            page_of.setdefault(model.entity_id[e], page)
+    by_page = relations_by_page(model, page_of)
+    paths = []
+    for page in pages:
+        sub = page_model(model, page, page_of, by_page.get(page.number, ()))
+        paths.append(emit(sub, os.path.join(pages_dir, page.name + '.puml')))
+    index_path = write_index(os.path.join(pages_dir, 'index.puml'), model, pages, page_of, title)
+    # Pages left over from a previous run with more pages
+    current = {page.name for page in pages}
+    for name in os.listdir(pages_dir):
+        stem, ext = os.path.splitext(name)
+        if stem.startswith('page_') and ext in ('.puml', '.svg') and stem not in current:
+            os.remove(os.path.join(pages_dir, name))
+    print(f"[UML] {len(model)} entities split into {len(pages)} pages "
+          f"(at most {paging.max_nodes} entities / {paging.max_edges} relations each): {index_path}")
+    return index_path, paths
+
+
+def page_files(index_path):
+    """The page .puml files next to an index page, followed by the index itself (for render_svgs)."""
+    pages_dir = os.path.dirname(index_path)
+    pages = sorted(name for name in os.listdir(pages_dir) if name.startswith('page_') and name.endswith('.puml'))
+    return [os.path.join(pages_dir, name) for name in pages] + [index_path]
@@ -0,0 +1,213 @@
+import mmap
+import struct
+from array import array
+from UmlModel import UmlModel, Member
+
+"""
+ModelSnapshot.py
+-----------------
+Binary snapshot of a UmlModel (*.uumlsnap), written next to the JSON artifact. The file is a header
+followed by fixed-width tables, so a reader can mmap it and decode only what it touches:
+
+  strings    n+1 uint64 offsets into a UTF-8 blob (string 0 is '')
+  entities   id, name, namespace, stereotype, template, kind, first member, member count
+  members    kind, visibility, name, type, params
+  relations  kind, from, to, label
+  id index   entity numbers sorted by id, for binary-search lookup
+
+Names are string-table ids, as in the model. Integers are little-endian.
+"""
+
+MAGIC = b'UUMLSNP1'
+SNAPSHOT_EXT = '.uumlsnap'
+
+HEADER = struct.Struct('<8sIIIII7Q')
+ENTITY = struct.Struct('<5IB3xII')
+MEMBER = struct.Struct('<BB2x3I')
+RELATION = struct.Struct('<B3x3I')
+
+
+def write_snapshot(model, path):
+    symbols = model.symbols.names
+    encoded = [name.encode('utf-8') for name in symbols]
+    offsets = array('Q', [0])
+    total = 0
+    for data in encoded:
+        total += len(data)
+        offsets.append(total)
+    entity_count = len(model.entity_id)
+    member_count = len(model.member_kind)
+    relation_count = len(model.relation_kind)
+
+    entities = bytearray(ENTITY.size * entity_count)
+    for e in range(entity_count):
+        start, end = model.member_range(e)
+        ENTITY.pack_into(entities, e * ENTITY.size, model.entity_id[e], model.entity_name[e],
+                         model.entity_namespace[e], model.entity_stereotype[e], model.entity_template[e],
+                         model.entity_kind[e], start, end - start)
+    members = bytearray(MEMBER.size * member_count)
+    for m in range(member_count):
+        MEMBER.pack_into(members, m * MEMBER.size, model.member_kind[m], model.member_visibility[m],
+                         model.member_name[m], model.member_type[m], model.member_params[m])
+    relations = bytearray(RELATION.size * relation_count)
+    for r in range(relation_count):
+        RELATION.pack_into(relations, r * RELATION.size, model.relation_kind[r], model.relation_from[r],
+                           model.relation_to[r], model.relation_label[r])
+    index = array('I', sorted(range(entity_count), key=lambda e: symbols[model.entity_id[e]]))
+
+    sections = [offsets.tobytes(), b''.join(encoded), bytes(entities), bytes(members), bytes(relations),
+                index.tobytes()]
+    positions = []
+    position = HEADER.size
+    for section in sections:
+        # Tables start on 8-byte boundaries so they can be cast in place
+        position += -position % 8
+        positions.append(position)
+        position += len(section)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, 1, len(symbols), entity_count, member_count, relation_count,
+                            *positions, position))
+        for section, start in zip(sections, positions):
+            f.write(b'\0' * (start - f.tell()))
+            f.write(section)
+    return path
+
+
+class SnapshotEntity:
+    __slots__ = ('snapshot', 'index', 'id', 'name', 'kind', 'namespace', 'stereotype', 'template', '_members')
+
+    def __init__(self, snapshot, index):
+        s = snapshot.string
+        sid, name, namespace, stereotype, template, kind, first, count = ENTITY.unpack_from(
+            snapshot.mm, snapshot.entity_offset + index * ENTITY.size)
+        self.snapshot = snapshot
+        self.index = index
+        self.id = s(sid)
+        self.name = s(name)
+        self.kind = kind
+        self.namespace = s(namespace)
+        self.stereotype = s(stereotype)
+        self.template = s(template)
+        self._members = (first, count)
+
+    def members(self, kind=None):
+        s = self.snapshot.string
+        mm = self.snapshot.mm
+        first, count = self._members
+        for m in range(first, first + count):
+            member_kind, visibility, name, type_, params = MEMBER.unpack_from(
+                mm, self.snapshot.member_offset + m * MEMBER.size)
+            if kind is None or member_kind == kind:
+                yield Member(member_kind, s(name), s(type_), s(params), visibility)
+
+    def member_names(self, kind):
+        return [m.name for m in self.members(kind)]
+
+
+class Snapshot:
+    """Lazy reader over an mmap-ed snapshot; nothing is decoded until it is asked for."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.string_count, self.entity_count, self.member_count, self.relation_count,
+         offsets_at, blob_at, self.entity_offset, self.member_offset, self.relation_offset, index_at,
+         _size) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != 1:
+            self.close()
+            raise ValueError(f'{path} is not a UML model snapshot')
+        view = memoryview(self.mm)
+        self._offsets = view[offsets_at:offsets_at + 8 * (self.string_count + 1)].cast('Q')
+        self._index = view[index_at:index_at + 4 * self.entity_count].cast('I')
+        self._blob_at = blob_at
+        self._views = (view, self._offsets, self._index)
+
+    def string(self, sid):
+        start = self._blob_at + self._offsets[sid]
+        return self.mm[start:self._blob_at + self._offsets[sid + 1]].decode('utf-8')
+
+    def __len__(self):
+        return self.entity_count
+
+    def entity(self, index):
+        return SnapshotEntity(self, index)
+
+    def entities(self, kind=None):
+        for index in range(self.entity_count):
+            if kind is None or self.mm[self.entity_offset + index * ENTITY.size + 20] == kind:
+                yield SnapshotEntity(self, index)
+
+    def _entity_id(self, index):
+        return self.string(struct.unpack_from('<I', self.mm, self.entity_offset + index * ENTITY.size)[0])
+
+    def find(self, id):
+        """Entity with the given id, by binary search over the id index (O(log n) strings decoded)."""
+        lo, hi = 0, self.entity_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entity_id(self._index[mid]) < id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.entity_count and self._entity_id(self._index[lo]) == id:
+            return SnapshotEntity(self, self._index[lo])
+        return None
+
+    def relations(self, kind=None):
+        """Yields (kind, from_id, to_id, label) tuples, like UmlModel.relations()."""
+        s = self.string
+        for kind_, source, target, label in RELATION.iter_unpack(
+                self.mm[self.relation_offset:self.relation_offset + self.relation_count * RELATION.size]):
+            if kind is None or kind_ == kind:
+                yield kind_, s(source), s(target), s(label)
+
+    def _table(self, record, offset, count):
+        """Columns of a record table (one tuple per field)."""
+        rows = record.iter_unpack(self.mm[offset:offset + count * record.size])
+        columns = list(zip(*rows))
+        return columns or [()] * len(record.unpack(bytes(record.size)))
+
+    def to_model(self):
+        """Loads the whole snapshot into a UmlModel, table by table (strings are decoded once)."""
+        model = UmlModel()
+        offsets = self._offsets
+        blob = self.mm[self._blob_at:self._blob_at + offsets[self.string_count]]
+        names = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(self.string_count)]
+        model.symbols.names = names
+        model.symbols.ids = {name: sid for sid, name in enumerate(names)}
+        (model.entity_id, model.entity_name, model.entity_namespace, model.entity_stereotype, model.entity_template,
+         kinds, first, _) = self._table(ENTITY, self.entity_offset, self.entity_count)
+        for column in ('entity_id', 'entity_name', 'entity_namespace', 'entity_stereotype', 'entity_template'):
+            setattr(model, column, array('I', getattr(model, column)))
+        model.entity_kind = array('B', kinds)
+        model.entity_members = array('I', first)
+        kinds, visibilities, member_names, member_types, member_params = self._table(
+            MEMBER, self.member_offset, self.member_count)
+        model.member_kind = array('B', kinds)
+        model.member_visibility = array('B', visibilities)
+        model.member_name = array('I', member_names)
+        model.member_type = array('I', member_types)
+        model.member_params = array('I', member_params)
+        kinds, sources, targets, labels = self._table(RELATION, self.relation_offset, self.relation_count)
+        model.relation_kind = array('B', kinds)
+        model.relation_from = array('I', sources)
+        model.relation_to = array('I', targets)
+        model.relation_label = array('I', labels)
+        return model
+
+    def close(self):
+        for view in reversed(getattr(self, '_views', ())):
+            view.release()
+        self.mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_snapshot(path):
+    """Opens a snapshot for lazy reading; use it as a context manager or close() it."""
+    return Snapshot(path)
@@ -0,0 +1,192 @@
+import os
+from html import escape
+from LayeredLayout import layered_layout
+from ModelDetail import is_more
+from ModelExport import WRITE_BUFFER_SIZE
+from ModelPages import STUB_STEREOTYPE, PAGE_STEREOTYPE
+from UmlModel import ENUM, INTERFACE, STRUCT, STATIC_ATTRIBUTE, METHOD, STATIC_METHOD, VALUE, \
+    EXTENDS, IMPLEMENTS, ASSOCIATION, COMPOSITION
+
+"""
+NativeRenderer.py
+------------------
+Java-free renderer: lays out a UmlModel with LayeredLayout (Sugiyama-style layers) and writes the
+SVG directly, without PlantUML or Graphviz. Boxes use the stereotype colors of the Unreal diagram
+(pastel palette in stereotype order) and the arrows its colors: inheritance orange, implementation
+dashed blue, association green. Text widths are estimated for a monospace font.
+
+Used for `--renderer native`, and automatically when Java or plantuml.jar is missing.
+"""
+
+# Pastel palette of the stereotype colors (same order in the PUML and in the native SVG)
+STEREOTYPE_PALETTE = ('#FFD580', '#B3E6B3', '#FFB3B3', '#B3D1FF', '#E0B3FF', '#FFF0B3', '#C6E2FF', '#FFCCE5',
+                      '#D5FFCC', '#FFDFBA')
+STUB_COLOR = '#E0E0E0'
+
+FONT_SIZE = 12
+CHAR_WIDTH = 7.2
+LINE_HEIGHT = 16
+PADDING = 8
+MIN_BOX_WIDTH = 80
+MARGIN = 20
+
+VISIBILITY_MARKS = ('+', '#', '-')
+KIND_LABELS = {STRUCT: 'struct', INTERFACE: 'interface', ENUM: 'enum'}
+# kind -> (marker, color, dashed)
+ARROWS = {EXTENDS: ('extends', '#FF4500', False), IMPLEMENTS: ('implements', '#1E90FF', True),
+          ASSOCIATION: ('association', '#32CD32', False), COMPOSITION: ('composition', '#555555', False)}
+MARKERS = (
+    '<marker id="extends" viewBox="0 0 12 12" refX="11" refY="6" markerWidth="12" markerHeight="12" '
+    'orient="auto"><path d="M1,1 L11,6 L1,11 Z" fill="#ffffff" stroke="#FF4500"/></marker>',
+    '<marker id="implements" viewBox="0 0 12 12" refX="11" refY="6" markerWidth="12" markerHeight="12" '
+    'orient="auto"><path d="M1,1 L11,6 L1,11 Z" fill="#ffffff" stroke="#1E90FF"/></marker>',
+    '<marker id="association" viewBox="0 0 12 12" refX="11" refY="6" markerWidth="10" markerHeight="10" '
+    'orient="auto"><path d="M1,1 L11,6 L1,11" fill="none" stroke="#32CD32" stroke-width="1.5"/></marker>',
+    '<marker id="composition" viewBox="0 0 16 10" refX="1" refY="5" markerWidth="16" markerHeight="10" '
+    'orient="auto"><path d="M1,5 L8,1 L15,5 L8,9 Z" fill="#555555"/></marker>',
+)
+
+
+def stereotype_colors(stereotypes):
+    """Stereotype -> color, assigned from the palette in sorted stereotype order."""
+    return {st: STEREOTYPE_PALETTE[i % len(STEREOTYPE_PALETTE)] for i, st in enumerate(sorted(stereotypes))}
+
+
+def member_text(member):
+    if member.kind == VALUE:
+        return member.name
+    text = VISIBILITY_MARKS[member.visibility] + member.name
+    if member.kind in (METHOD, STATIC_METHOD):
+        text += f'({member.params})'
+    return f'{text} : {member.type}' if member.type else text
+
+
+def box_lines(entity):
+    """(header lines, field lines, method lines) of one entity box."""
+    header = []
+    label = KIND_LABELS.get(entity.kind)
+    stereotype = entity.stereotype
+    if label or stereotype:
+        header.append(' '.join(part for part in (label and f'«{label}»', stereotype and f'«{stereotype}»') if part))
+    name = entity.name
+    if entity.template:
+        name += f'<{entity.template}>'
+    header.append(name)
+    fields = []
+    methods = []
+    for member in entity.members():
+        # '+N more' lines of ModelDetail go after the attributes or the methods they summarize
+        if member.kind in (METHOD, STATIC_METHOD) or (methods and is_more(member)):
+            methods.append(member)
+        else:
+            fields.append(member)
+    return header, fields, methods
+
+
+def box_size(header, fields, methods):
+    longest = max([len(line) for line in header] + [len(member_text(m)) for m in fields + methods])
+    width = max(MIN_BOX_WIDTH, longest * CHAR_WIDTH + 2 * PADDING)
+    height = (len(header) + len(fields) + len(methods)) * LINE_HEIGHT + 2 * PADDING
+    if fields or methods:
+        height += PADDING
+    if fields and methods:
+        height += PADDING
+    return width, height
+
+
+def entity_link(entity, extension='.svg'):
+    """
+    Link of a box in paged diagrams: a page box opens its page, a <<Stub>> the page that defines it.
+    `extension` is the one of the rendered pages ('.html' for the viewer).
+    """
+    if entity.stereotype == PAGE_STEREOTYPE:
+        return entity.id + extension
+    if entity.stereotype == STUB_STEREOTYPE:
+        return entity.namespace.split(':', 1)[0] + extension
+    return None
+
+
+def _box(write, entity, x, y, width, height, header, fields, methods, fill):
+    link = entity_link(entity)
+    if link:
+        write(f'<a href="{escape(link)}">')
+    write(f'<g><title>{escape(entity.id)}</title>'
+          f'<rect x="{x:.1f}" y="{y:.1f}" width="{width:.1f}" height="{height:.1f}" rx="3" fill="{fill}" '
+          f'stroke="#181818" stroke-width="1"/>')
+    cx = x + width / 2
+    top = y + PADDING
+    for i, line in enumerate(header):
+        style = ' font-weight="bold"' if i == len(header) - 1 else ' font-style="italic"'
+        write(f'<text x="{cx:.1f}" y="{top + FONT_SIZE:.1f}" text-anchor="middle"{style}>{escape(line)}</text>')
+        top += LINE_HEIGHT
+    for group in (fields, methods):
+        if not group:
+            continue
+        line_y = top + PADDING / 2
+        write(f'<line x1="{x:.1f}" y1="{line_y:.1f}" x2="{x + width:.1f}" y2="{line_y:.1f}" stroke="#181818"/>')
+        top += PADDING
+        for member in group:
+            style = ''
+            if member.kind in (STATIC_ATTRIBUTE, STATIC_METHOD):
+                style = ' text-decoration="underline"'
+            elif is_more(member):
+                style = ' font-style="italic"'
+            write(f'<text x="{x + PADDING:.1f}" y="{top + FONT_SIZE:.1f}"{style}>{escape(member_text(member))}</text>')
+            top += LINE_HEIGHT
+    write('</g>')
+    if link:
+        write('</a>')
+    write('\n')
+
+
+def render_model(model, svg_path, title=None):
+    """Lays out `model` and writes its SVG to `svg_path`; returns the path."""
+    entities = list(model.entities())
+    boxes = [box_lines(entity) for entity in entities]
+    sizes = [box_size(*box) for box in boxes]
+    index_of = {}
+    for e, entity in enumerate(entities):
+        index_of.setdefault(entity.id, e)
+    # Layout edges go from the drawn-above end (target: base, used type) to the source
+    relations = []
+    seen = set()
+    for kind, source, target, label in model.relations():
+        s = index_of.get(source)
+        t = index_of.get(target)
+        if s is None or t is None or s == t or (kind, s, t) in seen:
+            continue
+        seen.add((kind, s, t))
+        relations.append((kind, s, t, label))
+    layout = layered_layout(sizes, [(t, s) for _, s, t, _ in relations])
+    colors = stereotype_colors(set(entity.stereotype for entity in entities))
+    colors[STUB_STEREOTYPE] = STUB_COLOR
+    top = MARGIN + (2 * LINE_HEIGHT if title else 0)
+    width = layout.width + 2 * MARGIN
+    height = layout.height + top + MARGIN
+    tmp = f'{svg_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        write = f.write
+        write(f'<?xml version="1.0" encoding="UTF-8"?>\n'
+              f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+              f'viewBox="0 0 {width:.0f} {height:.0f}" font-family="monospace" font-size="{FONT_SIZE}">\n'
+              f'<defs>{"".join(MARKERS)}</defs>\n'
+              f'<rect width="100%" height="100%" fill="#ffffff"/>\n')
+        if title:
+            write(f'<text x="{width / 2:.1f}" y="{MARGIN + LINE_HEIGHT:.1f}" text-anchor="middle" font-size="18" '
+                  f'font-weight="bold">{escape(title)}</text>\n')
+        for (kind, _, _, label), points in zip(relations, layout.routes):
+            marker, color, dashed = ARROWS[kind]
+            # Routes run from the target down to the source; arrows are drawn from the source
+            path = ' '.join(f'{x + MARGIN:.1f},{y + top:.1f}' for x, y in reversed(points))
+            ends = f'marker-start="url(#{marker})"' if kind == COMPOSITION else f'marker-end="url(#{marker})"'
+            dash = ' stroke-dasharray="6,4"' if dashed else ''
+            write(f'<polyline points="{path}" fill="none" stroke="{color}" stroke-width="1.5"{dash} {ends}/>\n')
+            if label and kind == ASSOCIATION:
+                x, y = points[len(points) // 2]
+                write(f'<text x="{x + MARGIN + 4:.1f}" y="{y + top:.1f}" fill="#222222">{escape(label)}</text>\n')
+        for entity, (x, y), (w, h), (header, fields, methods) in zip(entities, layout.positions, sizes, boxes):
+            _box(write, entity, x + MARGIN, y + top, w, h, header, fields, methods,
+                 colors.get(entity.stereotype, '#F1F1F1'))
+        write('</svg>\n')
+    os.replace(tmp, svg_path)
+    return svg_path
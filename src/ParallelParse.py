@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from ParseCache import parser_key
+
+"""
+ParallelParse.py
+-----------------
+Execution engine for the per-file extractors of every backend.
+Files are fanned out to a ProcessPoolExecutor in chunks while the discovery walk is still running,
+and the per-file results are returned sorted by path. Backends then merge them in a separate,
+serial step, so the generated output is byte-identical whatever the number of jobs.
+With a ParseCache, unchanged files are served from the cache and only the misses reach the workers.
+"""
+
+DEFAULT_CHUNK_SIZE = 32
+
+
+def resolve_jobs(jobs):
+    """jobs <= 0 means one worker per CPU core; None means serial."""
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _run_chunk(worker, chunk):
+    return [(path, worker(path)) for path in chunk]
+
+
+def parse_files(paths, worker, jobs=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, version=1):
+    """
+    Runs worker(path) for every path and returns a list of (path, result) sorted by path.
+    `worker` must be a module-level function so it can be pickled to the worker processes.
+    `paths` may be a generator (e.g. FileDiscovery.iter_files): chunks are submitted as soon as
+    they fill up, so parsing starts before the walk finishes.
+    When `cache` is given, results are looked up/stored under the worker name and `version`.
+    """
+    jobs = resolve_jobs(jobs)
+    results = []
+    parser = parser_key(worker, version)
+
+    def uncached(paths):
+        for path in paths:
+            if cache is not None:
+                hit, value = cache.lookup(path, parser)
+                if hit:
+                    results.append((path, value))
+                    continue
+            yield path
+
+    if jobs == 1:
+        parsed = [(path, worker(path)) for path in uncached(paths)]
+    else:
+        parsed = []
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = []
+            chunk = []
+            for path in uncached(paths):
+                chunk.append(path)
+                if len(chunk) >= chunk_size:
+                    futures.append(pool.submit(_run_chunk, worker, chunk))
+                    chunk = []
+            if chunk:
+                futures.append(pool.submit(_run_chunk, worker, chunk))
+            for future in futures:
+                parsed.extend(future.result())
+    if cache is not None:
+        for path, value in parsed:
+            cache.store(path, parser, value)
+    results.extend(parsed)
+    results.sort(key=lambda item: item[0])
+    return results
@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import contextlib
+
+"""
+ParseCache.py
+--------------
+Persistent per-file cache of extracted entities, stored as SQLite in <project>/.uuml-cache/.
+An entry is reused when a cheap os.stat (size + mtime) matches. When the mtime changed (or is too
+close to the moment the entry was written to be trusted) the content hash decides instead.
+Entries are keyed by parser name and version, so bumping a backend's PARSER_VERSION invalidates them.
+The cache is bounded in size with LRU eviction and reports hit/miss statistics at the end of a run.
+"""
+
+CACHE_DIR_NAME = '.uuml-cache'
+CACHE_FILE_NAME = 'parse_cache.sqlite'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# mtimes closer than this to the write time of an entry may hide a later edit (coarse FS timestamps)
+RACY_MTIME_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT NOT NULL,
+    parser TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    stored_ns INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    nbytes INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (path, parser)
+)
+'''
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def parser_key(worker, version):
+    """Cache namespace of a per-file extractor, e.g. 'GoUML.extract_go_structs_and_interfaces:1'."""
+    return f'{worker.__module__}.{worker.__name__}:{version}'
+
+
+class ParseCache:
+    def __init__(self, project_dir, max_bytes=DEFAULT_MAX_BYTES, db_path=None):
+        if db_path is None:
+            cache_dir = os.path.join(project_dir, CACHE_DIR_NAME)
+            os.makedirs(cache_dir, exist_ok=True)
+            db_path = os.path.join(cache_dir, CACHE_FILE_NAME)
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stats = {}
+        self._touched = []
+
+    def lookup(self, path, parser):
+        """
+        Returns (True, value) on a hit, (False, None) on a miss. On a miss the stat and the content
+        hash are taken now, before the file is parsed, and kept for store(): an edit made while the
+        file is being parsed then leaves an entry whose hash no longer matches, never a hash of the
+        new content next to the entities of the old one.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.misses += 1
+            return False, None
+        row = self.conn.execute(
+            'SELECT size, mtime_ns, hash, stored_ns, payload FROM entries WHERE path = ? AND parser = ?',
+            (path, parser)).fetchone()
+        if row is None or row[0] != st.st_size:
+            return self._miss(path, st)
+        size, mtime_ns, digest, stored_ns, payload = row
+        if mtime_ns != st.st_mtime_ns or stored_ns - mtime_ns < RACY_MTIME_WINDOW_NS:
+            # mtime is not conclusive: fall back to the content hash
+            try:
+                current = file_hash(path)
+            except OSError:
+                self.misses += 1
+                return False, None
+            if current != digest:
+                return self._miss(path, st, current)
+            self.conn.execute('UPDATE entries SET mtime_ns = ?, stored_ns = ? WHERE path = ? AND parser = ?',
+                              (st.st_mtime_ns, time.time_ns(), path, parser))
+        self.hits += 1
+        self._touched.append((path, parser))
+        return True, json.loads(payload)
+
+    def _miss(self, path, st, digest=None):
+        """Records the stat and content hash of a file about to be parsed."""
+        self.misses += 1
+        try:
+            digest = digest or file_hash(path)
+        except OSError:
+            return False, None
+        self._stats[path] = (st.st_size, st.st_mtime_ns, digest)
+        return False, None
+
+    def store(self, path, parser, value):
+        """
+        Stores the extracted entities of `path` with the stat and hash taken by the preceding
+        lookup(); without one, nothing is stored since the parsed content cannot be identified.
+        """
+        stat = self._stats.pop(path, None)
+        if stat is None:
+            return
+        payload = json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+        now = time.time_ns()
+        self.conn.execute(
+            'INSERT OR REPLACE INTO entries (path, parser, size, mtime_ns, hash, stored_ns, last_used, nbytes, payload) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (path, parser, stat[0], stat[1], stat[2], now, now, len(payload), payload))
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits in max_bytes."""
+        total = self.conn.execute('SELECT COALESCE(SUM(nbytes), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute('SELECT path, parser, nbytes FROM entries ORDER BY last_used ASC').fetchall()
+        doomed = []
+        for path, parser, nbytes in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((path, parser))
+            total -= nbytes
+        self.conn.executemany('DELETE FROM entries WHERE path = ? AND parser = ?', doomed)
+        self.evictions += len(doomed)
+
+    def flush(self):
+        """Records LRU timestamps of the entries used so far and commits (long-running sessions)."""
+        if self._touched:
+            now = time.time_ns()
+            self.conn.executemany('UPDATE entries SET last_used = ? WHERE path = ? AND parser = ?',
+                                  [(now, path, parser) for path, parser in self._touched])
+            self._touched = []
+        self.conn.commit()
+
+    def close(self):
+        self.flush()
+        self.evict()
+        self.conn.commit()
+        self.conn.close()
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = 100.0 * self.hits / total if total else 0.0
+        size_mb = os.path.getsize(self.db_path) / (1024 * 1024) if os.path.exists(self.db_path) else 0.0
+        print(f"[UML] Parse cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), "
+              f"{self.evictions} evictions, {size_mb:.1f} MB at {self.db_path}")
+
+
+@contextlib.contextmanager
+def open_parse_cache(project_dir, enabled=True, max_bytes=DEFAULT_MAX_BYTES):
+    """Yields a ParseCache (or None when disabled); on exit the cache is saved and its statistics printed."""
+    if not enabled:
+        yield None
+        return
+    cache = ParseCache(project_dir, max_bytes=max_bytes)
+    try:
+        yield cache
+    finally:
+        cache.close()
+        cache.report()
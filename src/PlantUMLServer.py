@@ -0,0 +1,246 @@
+import atexit
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+
+"""
+PlantUMLServer.py
+------------------
+Keeps one PlantUML JVM alive for the whole run instead of launching `java -jar plantuml.jar` per
+diagram. The process runs in `-pipe` mode: PUML texts are streamed into its stdin and every SVG
+comes back on stdout followed by a delimiter line. Requests go through a bounded queue (submitters
+block when it is full) and are served in order by one worker thread.
+
+The process is health-checked with a tiny probe diagram when it starts and after it has been idle;
+a dead, hung or garbled process is killed and restarted (at most MAX_RESTARTS times in a row).
+When it cannot be kept alive, or Java/PlantUML is missing, rendering falls back to the one-shot
+`java -jar plantuml.jar -tsvg file.puml` path.
+"""
+
+MAX_QUEUE = 32
+RENDER_TIMEOUT = 120.0
+START_TIMEOUT = 60.0
+IDLE_HEALTH_CHECK = 30.0
+MAX_RESTARTS = 3
+PROBE = '@startuml\nclass Probe\n@enduml\n'
+START_TAG = re.compile(r'^\s*@start\w+', re.MULTILINE)
+
+_CLOSED = object()
+
+
+def plantuml_jar_path():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plantuml.jar')
+
+
+class RenderError(Exception):
+    pass
+
+
+class PlantUMLServer:
+    def __init__(self, jar=None, java='java', max_queue=MAX_QUEUE, timeout=RENDER_TIMEOUT):
+        self.jar = jar or plantuml_jar_path()
+        self.java = java
+        self.timeout = timeout
+        self.requests = queue.Queue(maxsize=max_queue)
+        self.delimiter = f'--uuml-{uuid.uuid4().hex}--'
+        self.process = None
+        self.responses = None
+        self.stderr_tail = []
+        self.restarts = 0
+        self.broken = False
+        self.last_used = 0.0
+        self.stats = {'rendered': 0, 'fallbacks': 0, 'restarts': 0}
+        self.worker = threading.Thread(target=self._serve, name='PlantUMLServer', daemon=True)
+        self.worker.start()
+
+    # --- Process management ---
+
+    def _start(self):
+        cmd = [self.java, '-Djava.awt.headless=true', '-jar', self.jar, '-pipe', '-tsvg', '-charset', 'UTF-8',
+               '-pipedelimitor', self.delimiter]
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.responses = queue.Queue()
+        threading.Thread(target=self._read_stdout, args=(self.process, self.responses), daemon=True).start()
+        threading.Thread(target=self._read_stderr, args=(self.process,), daemon=True).start()
+        # The first diagram pays for class loading; it doubles as the initial health check
+        self._exchange(PROBE, START_TIMEOUT)
+
+    def _read_stdout(self, process, responses):
+        lines = []
+        for raw in process.stdout:
+            line = raw.decode('utf-8', errors='replace')
+            if line.rstrip('\r\n') == self.delimiter:
+                responses.put(''.join(lines))
+                lines = []
+            else:
+                lines.append(line)
+        responses.put(None)
+
+    def _read_stderr(self, process):
+        for raw in process.stderr:
+            self.stderr_tail = (self.stderr_tail + [raw.decode('utf-8', errors='replace').rstrip()])[-20:]
+
+    def _exchange(self, puml, timeout, count=1):
+        """
+        Sends a PUML text holding `count` diagrams and waits for their SVGs (a list); raises RenderError
+        when the process misbehaves.
+        """
+        process = self.process
+        if process is None or process.poll() is not None:
+            raise RenderError('PlantUML process is not running')
+        try:
+            process.stdin.write(puml.encode('utf-8') + (b'' if puml.endswith('\n') else b'\n'))
+            process.stdin.flush()
+        except OSError as e:
+            raise RenderError(f'cannot write to PlantUML: {e}')
+        svgs = []
+        for _ in range(count):
+            try:
+                svg = self.responses.get(timeout=timeout)
+            except queue.Empty:
+                raise RenderError(f'PlantUML did not answer within {timeout:.0f}s')
+            if svg is None:
+                raise RenderError('PlantUML exited: ' + ' | '.join(self.stderr_tail[-3:]))
+            if '<svg' not in svg:
+                raise RenderError('PlantUML returned no SVG: ' + svg.strip()[:200])
+            svgs.append(svg)
+        self.last_used = time.monotonic()
+        return svgs
+
+    def _stop(self):
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+
+    def _ensure_healthy(self):
+        """Starts the process, or probes it after an idle period; restarts it when the probe fails."""
+        if self.process is None and not self.broken and (shutil.which(self.java) is None or not os.path.exists(self.jar)):
+            # Nothing to restart: the one-shot path reports what is missing
+            self.broken = True
+        while not self.broken:
+            try:
+                if self.process is None or self.process.poll() is not None:
+                    self._stop()
+                    self._start()
+                elif time.monotonic() - self.last_used > IDLE_HEALTH_CHECK:
+                    self._exchange(PROBE, self.timeout)
+                return True
+            except (RenderError, OSError) as e:
+                self._restart(e)
+        return False
+
+    def _restart(self, reason):
+        self._stop()
+        self.restarts += 1
+        self.stats['restarts'] += 1
+        if self.restarts > MAX_RESTARTS:
+            self.broken = True
+            print(f"[PlantUML] Render server disabled after {MAX_RESTARTS} restarts ({reason}); "
+                  "using one-shot rendering.")
+        else:
+            print(f"[PlantUML] Restarting render server: {reason}")
+
+    # --- Request handling ---
+
+    def _serve(self):
+        while True:
+            item = self.requests.get()
+            if item is _CLOSED:
+                self._stop()
+                return
+            puml_path, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._render(puml_path))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _render(self, puml_path):
+        stem = os.path.splitext(puml_path)[0]
+        with open(puml_path, 'r', encoding='utf-8') as f:
+            puml = f.read()
+        count = len(START_TAG.findall(puml))
+        if count == 0:
+            print(f"[PlantUML] No @startuml block in {puml_path}")
+            return None
+        if self._ensure_healthy():
+            try:
+                svgs = self._exchange(puml, self.timeout, count)
+            except RenderError as e:
+                # A diagram that hangs or kills the process is retried on the one-shot path
+                self._restart(e)
+            else:
+                self.restarts = 0
+                # Same names as the one-shot path: file.svg, then file_001.svg, ... for extra diagrams
+                for n, svg in enumerate(svgs):
+                    write_svg(stem + (f'_{n:03d}' if n else '') + '.svg', svg)
+                self.stats['rendered'] += 1
+                return stem + '.svg'
+        self.stats['fallbacks'] += 1
+        return render_one_shot(puml_path, self.jar, self.java)
+
+    def submit(self, puml_path):
+        """Queues `puml_path` for rendering (blocks while the queue is full); returns a Future of the SVG path."""
+        future = Future()
+        self.requests.put((puml_path, future))
+        return future
+
+    def render(self, puml_path):
+        """Renders `puml_path` next to itself; returns the SVG path, or None if it could not be rendered."""
+        return self.submit(puml_path).result()
+
+    def close(self):
+        if self.worker.is_alive():
+            self.requests.put(_CLOSED)
+            self.worker.join(timeout=10)
+
+
+def write_svg(svg_path, svg):
+    """Writes through a new file, so an SVG hardlinked from the render cache is replaced, not modified."""
+    tmp = f'{svg_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(svg)
+    os.replace(tmp, svg_path)
+
+
+def render_one_shot(puml_path, jar=None, java='java'):
+    """The old path: one JVM for one diagram. Returns the SVG path or None."""
+    jar = jar or plantuml_jar_path()
+    svg_path = os.path.splitext(puml_path)[0] + '.svg'
+    try:
+        # PlantUML rewrites the file in place; unlink it first in case it is a render cache hardlink
+        if os.path.exists(svg_path):
+            os.remove(svg_path)
+        subprocess.run([java, '-jar', jar, '-tsvg', os.path.basename(puml_path)],
+                       cwd=os.path.dirname(os.path.abspath(puml_path)), check=True, timeout=RENDER_TIMEOUT)
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+        print(f"[PlantUML] One-shot rendering failed for {puml_path}: {e}")
+        return None
+    return svg_path if os.path.exists(svg_path) else None
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_server():
+    """The process-wide render server, started on first use and closed at exit."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = PlantUMLServer()
+            atexit.register(_server.close)
+        return _server
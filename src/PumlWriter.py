@@ -0,0 +1,64 @@
+import os
+import sys
+from ModelExport import WRITE_BUFFER_SIZE
+
+"""
+PumlWriter.py
+--------------
+Writes the lines yielded by an emitter generator straight into the .puml file through a large
+buffered writer, so the diagram text is never assembled in memory (peak memory does not grow with
+the diagram). Lines are joined with '\\n', as '\\n'.join() used to do. The diagram is only echoed
+to the console with --verbose; otherwise callers print a one-line summary.
+
+When the native renderer is in use, the model of every diagram written is kept by path, so the SVG
+can be drawn from the model instead of from the PUML text.
+"""
+
+# Ligado por --verbose
+VERBOSE = False
+# .puml path -> model of the diagram, only while keep_models(True)
+_models = None
+
+
+def set_verbose(enabled):
+    global VERBOSE
+    VERBOSE = enabled
+
+
+def keep_models(enabled):
+    """Starts (or keeps) holding the models of the written diagrams, or drops them."""
+    global _models
+    if not enabled:
+        _models = None
+    elif _models is None:
+        _models = {}
+
+
+def diagram_model(path):
+    """The model written to `path` in this run, or None when models are not kept."""
+    return _models.get(os.path.abspath(path)) if _models is not None else None
+
+
+def write_puml_lines(path, lines, model=None):
+    """Streams `lines` (any iterable of str) into `path`; returns the path. `model` is the model drawn."""
+    if model is not None and _models is not None:
+        _models[os.path.abspath(path)] = model
+    echo = sys.stdout.write if VERBOSE else None
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        write = f.write
+        separator = ''
+        for line in lines:
+            write(separator)
+            write(line)
+            if echo:
+                echo(separator)
+                echo(line)
+            separator = '\n'
+    if echo:
+        echo('\n')
+    return path
+
+
+def puml_summary(path):
+    """'<path> (N KB)' for the console summary."""
+    return f"{path} ({os.path.getsize(path) / 1024:.0f} KB)"
@@ -1,143 +1,360 @@
 import os
-import re
+import ast
 from collections import defaultdict
 from SVGRenderer import render_svg
+from FileDiscovery import iter_files
+from ParallelParse import parse_files
+from ParseCache import open_parse_cache
+from UmlModel import UmlModel, CLASS, ATTRIBUTE, STATIC_ATTRIBUTE, METHOD, EXTENDS, ASSOCIATION
+from ModelFocus import apply_focus
+from ModelPages import write_pages
+from PumlWriter import write_puml_lines, puml_summary
 
-# Regex patterns for Python class, method, and attribute extraction
-CLASS_PATTERN = re.compile(r'^class (\w+)(\(([^)]*)\))?:')
-METHOD_PATTERN = re.compile(r'^\s+def (\w+)\(.*\):')
-ATTRIBUTE_PATTERN = re.compile(r'^\s+self\.(\w+)\s*=')
+# Bump whenever extract_classes changes its output, to invalidate cached entries
+PARSER_VERSION = 2
+
+# Import hops followed when a name is re-exported (e.g. by a package __init__.py)
+MAX_REEXPORT_HOPS = 5
 
 
 def scan_python_files(project_dir):
-    """Recursively find all .py files in the project directory."""
-    py_files = []
-    for root, _, files in os.walk(project_dir):
-        for f in files:
-            if f.endswith('.py') and not f.startswith('__'):
-                py_files.append(os.path.join(root, f))
-    return py_files
+    """Recursively yield all .py files in the project directory (virtualenvs and ignored paths are skipped)."""
+    return iter_files(project_dir, ('.py',), language='python')
 
 
-def extract_classes(py_file):
-    """Extract classes, their methods, and attributes from a Python file."""
-    classes = {}
-    current_class = None
-    bases = None
-    with open(py_file, encoding='utf-8') as f:
-        for line in f:
-            class_match = CLASS_PATTERN.match(line)
-            if class_match:
-                current_class = class_match.group(1)
-                bases = class_match.group(3)
-                classes[current_class] = {
-                    'methods': [],
-                    'attributes': [],
-                    'bases': [b.strip() for b in bases.split(',')] if bases else []
-                }
+def dotted_name(node):
+    """'a.b.C' for Name/Attribute chains, None for anything else."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return '.'.join(reversed(parts))
+    return None
+
+
+def annotation_names(node):
+    """Dotted names referenced by a type annotation, including Optional[...], 'Quoted' and X | Y forms."""
+    if node is None:
+        return []
+    if isinstance(node, ast.Constant):
+        if not isinstance(node.value, str):
+            return []
+        try:
+            node = ast.parse(node.value, mode='eval').body
+        except SyntaxError:
+            return []
+    name = dotted_name(node)
+    if name:
+        return [name]
+    names = []
+    for child in ast.iter_child_nodes(node):
+        names.extend(annotation_names(child))
+    return names
+
+
+def summarize_class(node, prefix, classes):
+    """Appends the summary of ClassDef `node` (and of its nested classes) to `classes`."""
+    name = f'{prefix}.{node.name}' if prefix else node.name
+    summary = {
+        'name': name,
+        'bases': [b for b in (dotted_name(base) for base in node.bases) if b],
+        'methods': [],
+        'class_attributes': [],
+        'attributes': [],
+        'annotations': {},
+    }
+    classes.append(summary)
+
+    def add_attribute(kind, attr, annotation=None):
+        if attr not in summary[kind]:
+            summary[kind].append(attr)
+        if annotation is not None:
+            refs = summary['annotations'].setdefault(attr, [])
+            for ref in annotation_names(annotation):
+                if ref not in refs:
+                    refs.append(ref)
+
+    for stmt in node.body:
+        if isinstance(stmt, ast.ClassDef):
+            summarize_class(stmt, name, classes)
+        elif isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if not stmt.name.startswith('__') and stmt.name not in summary['methods']:
+                summary['methods'].append(stmt.name)
+            args = stmt.args.posonlyargs + stmt.args.args
+            is_static = any(dotted_name(d) == 'staticmethod' for d in stmt.decorator_list)
+            if not args or is_static:
                 continue
-            if current_class:
-                method_match = METHOD_PATTERN.match(line)
-                if method_match:
-                    method = method_match.group(1)
-                    if not method.startswith('__'):
-                        classes[current_class]['methods'].append(method)
-                attr_match = ATTRIBUTE_PATTERN.match(line)
-                if attr_match:
-                    attr = attr_match.group(1)
-                    classes[current_class]['attributes'].append(attr)
-    return classes
-
-
-def generate_puml(project_dir):
-    """Generate PlantUML file for Python project."""
+            self_name = args[0].arg
+            for sub in ast.walk(stmt):
+                if isinstance(sub, ast.Assign):
+                    targets = sub.targets
+                    annotation = None
+                elif isinstance(sub, (ast.AnnAssign, ast.AugAssign)):
+                    targets = [sub.target]
+                    annotation = getattr(sub, 'annotation', None)
+                else:
+                    continue
+                for target in targets:
+                    for t in ast.walk(target):
+                        if isinstance(t, ast.Attribute) and isinstance(t.value, ast.Name) and t.value.id == self_name:
+                            add_attribute('attributes', t.attr, annotation)
+        elif isinstance(stmt, ast.Assign):
+            for target in stmt.targets:
+                for t in ast.walk(target):
+                    if isinstance(t, ast.Name):
+                        add_attribute('class_attributes', t.id)
+        elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+            # Annotated class-level names are dataclass/NamedTuple fields or typed class attributes
+            add_attribute('class_attributes', stmt.target.id, stmt.annotation)
+
+
+def extract_classes(py_file):
+    """
+    Summarizes a Python file with the ast module: its imports and every class (nested ones as
+    'Outer.Inner') with bases, methods (sync and async), class and instance attributes and the
+    names referenced by attribute annotations. Names are kept as written; they are resolved
+    against the whole project in merge_classes().
+    """
+    with open(py_file, 'rb') as f:
+        source = f.read()
+    try:
+        tree = ast.parse(source, filename=py_file)
+    except (SyntaxError, ValueError) as e:
+        print(f"[UML] Skipping {py_file}: {e}")
+        return {'imports': {}, 'classes': []}
+    imports = {}
+    classes = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    imports[alias.asname] = [alias.name, None, 0]
+                else:
+                    head = alias.name.split('.')[0]
+                    imports[head] = [head, None, 0]
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name != '*':
+                    imports[alias.asname or alias.name] = [node.module or '', alias.name, node.level]
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            summarize_class(node, '', classes)
+    return {'imports': imports, 'classes': classes}
+
+
+def generate_puml(project_dir, jobs=1, use_cache=True, focus=None, paging=None):
+    """
+    Generate PlantUML file for Python project. Files are parsed on `jobs` processes.
+    With a `focus`, only the neighborhood of that class is drawn; with `paging`, the diagram is split
+    into pages by package and the index page path is returned.
+    """
     py_files = scan_python_files(project_dir)
-    all_classes = {}
-    file_to_classes = defaultdict(list)
+    with open_parse_cache(project_dir, enabled=use_cache) as cache:
+        parsed = parse_files(py_files, extract_classes, jobs=jobs, cache=cache, version=PARSER_VERSION)
+    model = apply_focus(merge_classes(parsed, project_dir), focus)
+    if paging is not None:
+        index_path, _ = write_pages(model, os.path.join(project_dir, 'PythonProject_pages'),
+                                    lambda page, path: write_puml(page, project_dir, path), paging,
+                                    'Python Project UML', group=lambda entity: os.path.dirname(entity.namespace))
+        return index_path
+    return write_puml(model, project_dir)
+
+
+def module_name(py_file, project_dir):
+    """'pkg/sub/mod.py' -> 'pkg.sub.mod'; a package __init__.py is named after its package."""
+    rel = os.path.splitext(os.path.relpath(py_file, project_dir))[0]
+    parts = rel.replace(os.sep, '/').split('/')
+    if parts[-1] == '__init__' and len(parts) > 1:
+        parts = parts[:-1]
+    return '.'.join(parts)
 
-    for py_file in py_files:
-        classes = extract_classes(py_file)
-        for cname, cdata in classes.items():
-            all_classes[cname] = cdata
-            file_to_classes[os.path.relpath(py_file, project_dir)].append(cname)
-
-    output_file = os.path.join(project_dir, 'PythonProject.puml')
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('@startuml\n')
-        f.write('skinparam backgroundColor #23272e\n')
-        f.write('skinparam defaultTextAlignment center\n')
-        f.write('skinparam shadowing true\n')
-        f.write('skinparam classFontColor #ffffff\n')
-        f.write('skinparam classAttributeFontColor #ffffff\n')
-        f.write('skinparam classMethodFontColor #ffffff\n')
-        f.write('skinparam classStereotypeFontColor #ffffff\n')
-        f.write('skinparam classBorderColor #4b8bbe\n')  # Python blue
-        f.write('skinparam classBackgroundColor #23272e\n')
-        f.write('skinparam ArrowColor #f5f5f5\n')
-        f.write('left to right direction\n')
-        f.write('hide empty members\n')
-        f.write('title Python Project UML\n\n')
-
-        # Color palette for grouped modules (Pythonic, visually distinct, and colorblind-friendly)
-        module_colors = [
-            '#4b8bbe', # Python blue
-            '#ffd43b', # Python yellow
-            '#306998', # dark blue
-            '#e06c75', # red
-            '#98c379', # green
-            '#c678dd', # purple
-            '#56b6c2', # cyan
-            '#d19a66', # orange
-            '#abb2bf', # light gray
-            '#282c34', # dark gray
-        ]
-        module_color_map = {}
-        for idx, module in enumerate(file_to_classes):
-            module_color_map[module] = module_colors[idx % len(module_colors)]
-
-        # Group by module (file) with colored backgrounds and <<PythonModule>> stereotype
-        for module, classes in file_to_classes.items():
-            color = module_color_map[module]
-            f.write(f'package "{module}" <<PythonModule>> {{\n')
-            f.write(f'  skinparam packageBackgroundColor {color}\n')
-            f.write(f'  skinparam packageBorderColor {color}\n')
-            for cname in classes:
-                cdata = all_classes[cname]
-                # Add <<PythonClass>> stereotype to every class
-                f.write(f'    class {cname} <<PythonClass>> {{\n')
-                for attr in cdata['attributes']:
-                    f.write(f'      +{attr}\n')
-                for method in cdata['methods']:
-                    f.write(f'      +{method}()\n')
-                f.write('    }\n')
-            f.write('}\n')
-
-        # Inheritance relations
-        for cname, cdata in all_classes.items():
+
+def absolute_module(module, is_package, target, level):
+    """Resolves a (possibly relative) 'from ... import' module against the importing module."""
+    if level == 0:
+        return target
+    package = module.split('.') if is_package else module.split('.')[:-1]
+    if level > 1:
+        package = package[:len(package) - (level - 1)]
+    return '.'.join(package + ([target] if target else []))
+
+
+def merge_classes(results, project_dir):
+    """
+    Merges the per-file summaries (in path order) into a UmlModel whose namespaces are the files.
+    Classes are identified by their module-qualified id ('pkg.models.User'), so same-named classes of
+    different modules no longer overwrite each other. Bases and annotated attribute types are
+    resolved through each module's imports (following re-exports) to class ids.
+    """
+    modules = {}
+    for py_file, summary in results:
+        module = module_name(py_file, project_dir)
+        modules[module] = (py_file, os.path.basename(py_file) == '__init__.py', summary)
+    class_ids = set()
+    for module, (_, _, summary) in modules.items():
+        for cdata in summary['classes']:
+            class_ids.add(f"{module}.{cdata['name']}")
+
+    def resolve(module, name, hops=0, defining=None):
+        """
+        Class id of `name` as seen from `module`, or None when it is not a project class.
+        `defining` is the class whose bases are being resolved: 'class User(User)' refers to the
+        imported User, since the base is evaluated before the new name is bound.
+        """
+        if module not in modules or hops > MAX_REEXPORT_HOPS:
+            return name if name in class_ids else None
+        local = f'{module}.{name}'
+        if local in class_ids and local != defining:
+            return local
+        _, is_package, summary = modules[module]
+        head, _, rest = name.partition('.')
+        imported = summary['imports'].get(head)
+        if imported is None:
+            return None
+        target, attr, level = imported
+        base_module = absolute_module(module, is_package, target, level)
+        if attr is None:
+            full = f'{base_module}.{rest}' if rest else base_module
+        else:
+            full = '.'.join(p for p in (base_module, attr, rest) if p)
+        if full in class_ids:
+            return full
+        # 'from pkg import Base' where pkg/__init__.py re-exports Base, or 'mod.Class' through a module
+        owner = full.rpartition('.')[0]
+        while owner:
+            if owner in modules:
+                return resolve(owner, full[len(owner) + 1:], hops + 1)
+            owner = owner.rpartition('.')[0]
+        return None
+
+    model = UmlModel()
+    for module, (py_file, _, summary) in modules.items():
+        for cdata in summary['classes']:
+            class_id = f"{module}.{cdata['name']}"
+            outer = cdata['name'].rpartition('.')[0]
+            bases = []
             for base in cdata['bases']:
-                if base in all_classes:
-                    f.write(f'{base} <|-- {cname}\n')
-
-        # Add stereotypes definitions for legend/colors
-        f.write('\n' +
-            'hide stereotype\n'+
-            'skinparam class<<PythonClass>> {\n' +
-            '  BackgroundColor #23272e\n' +
-            '  BorderColor #4b8bbe\n' +
-            '  FontColor #ffffff\n' +
-            '  AttributeFontColor #ffffff\n' +
-            '  MethodFontColor #ffffff\n' +
-            '  StereotypeFontColor #ffffff\n' +
-            '  FontStyle bold\n' +
-            '}\n' +
-            'skinparam package<<PythonModule>> {\n' +
-            '  FontColor #23272e\n' +
-            '  FontStyle bold\n' +
-            '}\n')
-        f.write('@enduml\n')
-    print(f"PUML generated at: {output_file}")
+                # Nested classes may refer to siblings of their enclosing class
+                resolved = ((resolve(module, f'{outer}.{base}', defining=class_id) if outer else None)
+                            or resolve(module, base, defining=class_id))
+                bases.append(resolved or base)
+            associations = []
+            for attr, refs in cdata['annotations'].items():
+                for ref in refs:
+                    target = resolve(module, ref)
+                    if target and target != class_id and (target, attr) not in associations:
+                        associations.append((target, attr))
+            model.add_entity(class_id, CLASS, cdata['name'], os.path.relpath(py_file, project_dir), 'PythonClass')
+            for attr in cdata['class_attributes']:
+                model.add_member(STATIC_ATTRIBUTE, attr)
+            for attr in cdata['attributes']:
+                model.add_member(ATTRIBUTE, attr)
+            for method in cdata['methods']:
+                model.add_member(METHOD, method)
+            for base in bases:
+                model.add_relation(EXTENDS, class_id, base)
+            for target, attr in associations:
+                model.add_relation(ASSOCIATION, class_id, target, attr)
+    return model
+
+
+def write_puml(model, project_dir, output_file=None):
+    """Writes PythonProject.puml (or `output_file`) for the merged UmlModel and returns its path."""
+    output_file = output_file or os.path.join(project_dir, 'PythonProject.puml')
+    write_puml_lines(output_file, iter_puml(model), model)
+    print(f"PUML generated at: {puml_summary(output_file)}")
     return output_file
 
+
+def iter_puml(model):
+    """Yields the lines of the PUML of the merged UmlModel."""
+    yield '@startuml'
+    yield 'skinparam backgroundColor #23272e'
+    yield 'skinparam defaultTextAlignment center'
+    yield 'skinparam shadowing true'
+    yield 'skinparam classFontColor #ffffff'
+    yield 'skinparam classAttributeFontColor #ffffff'
+    yield 'skinparam classMethodFontColor #ffffff'
+    yield 'skinparam classStereotypeFontColor #ffffff'
+    yield 'skinparam classBorderColor #4b8bbe'  # Python blue
+    yield 'skinparam classBackgroundColor #23272e'
+    yield 'skinparam ArrowColor #f5f5f5'
+    yield 'left to right direction'
+    yield 'hide empty members'
+    # Class ids are module-qualified ('pkg.models.User'); dots must not create nested namespaces
+    yield 'set namespaceSeparator none'
+    yield 'title Python Project UML'
+    yield ''
+
+    # Color palette for grouped modules (Pythonic, visually distinct, and colorblind-friendly)
+    module_colors = [
+        '#4b8bbe', # Python blue
+        '#ffd43b', # Python yellow
+        '#306998', # dark blue
+        '#e06c75', # red
+        '#98c379', # green
+        '#c678dd', # purple
+        '#56b6c2', # cyan
+        '#d19a66', # orange
+        '#abb2bf', # light gray
+        '#282c34', # dark gray
+    ]
+    file_to_classes = defaultdict(list)
+    for cdata in model.entities():
+        file_to_classes[cdata.namespace].append(cdata)
+    module_color_map = {}
+    for idx, module in enumerate(file_to_classes):
+        module_color_map[module] = module_colors[idx % len(module_colors)]
+
+
+    # Group by module (file) with colored backgrounds and <<PythonModule>> stereotype
+    for module, classes in file_to_classes.items():
+        color = module_color_map[module]
+        yield f'package "{module}" <<PythonModule>> {{'
+        yield f'  skinparam packageBackgroundColor {color}'
+        yield f'  skinparam packageBorderColor {color}'
+        for cdata in classes:
+            # Add <<PythonClass>> stereotype to every class; the module-qualified id is the alias
+            yield f'    class "{cdata.name}" as {cdata.id} <<{cdata.stereotype}>> {{'
+            for attr in cdata.member_names(STATIC_ATTRIBUTE):
+                yield f'      {{static}} +{attr}'
+            for attr in cdata.member_names(ATTRIBUTE):
+                yield f'      +{attr}'
+            for method in cdata.member_names(METHOD):
+                yield f'      +{method}()'
+            yield '    }'
+        yield '}'
+
+    # Inheritance relations
+    for _, cname, base, _ in model.relations(EXTENDS):
+        if model.find(base) is not None:
+            yield f'{base} <|-- {cname}'
+
+    # Associations from type-annotated attributes
+    for _, cname, target, attr in model.relations(ASSOCIATION):
+        yield f'{cname} --> {target} : {attr}'
+
+    # Add stereotypes definitions for legend/colors
+    yield ''
+    yield 'hide stereotype'
+    yield 'skinparam class<<PythonClass>> {'
+    yield '  BackgroundColor #23272e'
+    yield '  BorderColor #4b8bbe'
+    yield '  FontColor #ffffff'
+    yield '  AttributeFontColor #ffffff'
+    yield '  MethodFontColor #ffffff'
+    yield '  StereotypeFontColor #ffffff'
+    yield '  FontStyle bold'
+    yield '}'
+    yield 'skinparam package<<PythonModule>> {'
+    yield '  FontColor #23272e'
+    yield '  FontStyle bold'
+    yield '}'
+    yield '@enduml'
+    yield ''
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1:
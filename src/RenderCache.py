@@ -0,0 +1,142 @@
+import os
+import re
+import shutil
+import hashlib
+
+"""
+RenderCache.py
+---------------
+Content-addressed cache of rendered SVGs, so PlantUML only runs for diagrams whose text changed.
+The key is the SHA-256 of the normalized PUML text (line endings, trailing blanks and ' comment
+lines do not count) together with a hash of plantuml.jar, so upgrading PlantUML invalidates every
+entry. Entries are plain files under <cache dir>/<2 hex>/<key>.svg shared by every project of the
+user; a hit is hardlinked (or copied, across file systems) to the wanted .svg. The directory is
+bounded in size with LRU eviction (a hit refreshes the entry's mtime) and reports hit statistics.
+"""
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+COMMENT_LINE = re.compile(r"^\s*'")
+
+_jar_hashes = {}
+
+
+def default_cache_dir():
+    """UUML_RENDER_CACHE, else the per-user cache folder (%LOCALAPPDATA% or ~/.cache)."""
+    if os.environ.get('UUML_RENDER_CACHE'):
+        return os.environ['UUML_RENDER_CACHE']
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'uuml', 'render')
+
+
+def jar_hash(jar_path):
+    """Hash of the PlantUML jar (computed once per process and jar stat)."""
+    try:
+        st = os.stat(jar_path)
+    except OSError:
+        return 'no-jar'
+    stamp = (jar_path, st.st_size, st.st_mtime_ns)
+    if stamp not in _jar_hashes:
+        h = hashlib.sha1()
+        with open(jar_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        _jar_hashes[stamp] = h.hexdigest()
+    return _jar_hashes[stamp]
+
+
+def normalize_puml(text):
+    lines = [line.rstrip() for line in text.replace('\r\n', '\n').replace('\r', '\n').split('\n')]
+    return '\n'.join(line for line in lines if line and not COMMENT_LINE.match(line))
+
+
+def _replace_with(source, dest):
+    """Makes `dest` a hardlink to `source` (a copy when linking is not possible)."""
+    tmp = f'{dest}.{os.getpid()}.tmp'
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, dest)
+
+
+class RenderCache:
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, puml_text, jar_path):
+        h = hashlib.sha256(normalize_puml(puml_text).encode('utf-8'))
+        h.update(b'\0' + jar_hash(jar_path).encode('ascii'))
+        return h.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.svg')
+
+    def fetch(self, key, svg_path):
+        """Puts the cached SVG of `key` at `svg_path`; returns False on a miss."""
+        entry = self._entry(key)
+        try:
+            os.utime(entry)
+            _replace_with(entry, svg_path)
+        except OSError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def store(self, key, svg_path):
+        """Adds a freshly rendered SVG to the cache (as a copy, so later edits of svg_path cannot reach it)."""
+        entry = self._entry(key)
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            tmp = f'{entry}.{os.getpid()}.tmp'
+            shutil.copyfile(svg_path, tmp)
+            os.replace(tmp, entry)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Deletes least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for bucket in os.scandir(self.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                st = entry.stat()
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                total += st.st_size
+        if total <= self.max_bytes:
+            return total
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        return total
+
+    def report(self, total_bytes):
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        print(f"[UML] Render cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), "
+              f"{self.evictions} evictions, {total_bytes / (1024 * 1024):.1f} MB at {self.cache_dir}")
+
+
+def open_render_cache(enabled=True, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """A RenderCache, or None when disabled or when the cache folder cannot be created."""
+    if not enabled:
+        return None
+    try:
+        return RenderCache(cache_dir, max_bytes)
+    except OSError as e:
+        print(f"[UML] Render cache disabled: {e}")
+        return None
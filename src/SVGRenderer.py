@@ -1,32 +1,124 @@
 import os
-import subprocess
+import shutil
 import webbrowser
+from PlantUMLServer import get_server, plantuml_jar_path, START_TAG
+from RenderCache import open_render_cache
+from PumlWriter import keep_models, diagram_model
+
+# Desligado por --no-render-cache
+RENDER_CACHE_ENABLED = True
+# --renderer: 'plantuml', 'native', 'html' ou 'auto' (native quando Java/plantuml.jar nao estao disponiveis).
+# 'auto' e o padrao tambem quando os backends rodam direto (python CPPForUnrealEngine.py <dir>)
+RENDERER = 'auto'
+
+def set_render_cache(enabled):
+    global RENDER_CACHE_ENABLED
+    RENDER_CACHE_ENABLED = enabled
+
+def set_renderer(name):
+    """
+    Escolhe o renderizador. Com o renderizador nativo e com o visualizador HTML, os modelos dos
+    diagramas escritos ficam em memoria (PumlWriter) para a saida ser desenhada a partir deles.
+    """
+    global RENDERER
+    RENDERER = name
+    keep_models(use_native() or RENDERER == 'html')
+
+def plantuml_available():
+    return shutil.which('java') is not None and os.path.exists(plantuml_jar_path())
+
+def use_native():
+    return RENDERER == 'native' or (RENDERER == 'auto' and not plantuml_available())
+
+# Guarda os modelos desde o import quando o padrao ja cai no renderizador nativo
+set_renderer(RENDERER)
+
+def output_kind(path=None):
+    """'Viewer' para as paginas .html do visualizador, 'SVG' para o resto (nome usado nas mensagens)."""
+    if path is None:
+        return 'Viewer' if RENDERER == 'html' else 'SVG'
+    return 'Viewer' if path.endswith('.html') else 'SVG'
+
+def render_native(puml_paths, open_last=True):
+    """
+    Desenha os SVGs com o NativeRenderer a partir dos modelos dos .puml (sem Java), ou, com
+    --renderer html, escreve o visualizador interativo <nome>.html (HtmlViewer).
+    """
+    if RENDERER == 'html':
+        from HtmlViewer import write_html_viewer as render_model
+        extension = '.html'
+    else:
+        from NativeRenderer import render_model
+        extension = '.svg'
+    svgs = []
+    for puml_path in puml_paths:
+        svg_file = os.path.splitext(puml_path)[0] + extension
+        model = diagram_model(puml_path)
+        if model is None:
+            print(f"[SVGRenderer] Sem modelo para o renderizador {RENDERER}: {puml_path}")
+            continue
+        svgs.append(render_model(model, svg_file))
+    if open_last and svgs:
+        webbrowser.open(svgs[-1])
+    return svgs
 
 def render_svg(puml_path):
     """
-    Gera um arquivo SVG a partir de um arquivo .puml usando plantuml.jar e abre o SVG no navegador.
+    Gera um arquivo SVG a partir de um arquivo .puml e abre o SVG no navegador.
+    A renderizacao passa pelo cache de SVGs e pelo servidor PlantUML persistente (uma JVM para o
+    processo todo), com fallback para `java -jar plantuml.jar -tsvg`.
     Retorna o caminho do SVG gerado ou None em caso de erro.
     """
-    folder = os.path.dirname(os.path.abspath(puml_path))
-    svg_file = os.path.splitext(puml_path)[0] + ".svg"
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    plantuml_jar = os.path.join(script_dir, "plantuml.jar")
+    svgs = render_svgs([puml_path])
+    return svgs[0] if svgs else None
+
+def render_svgs(puml_paths, open_last=True):
+    """
+    Gera os SVGs de varios .puml. Diagramas cujo texto (normalizado) ja foi renderizado com o mesmo
+    plantuml.jar saem do cache de SVGs; os outros entram todos de uma vez na fila do servidor
+    PlantUML persistente. Abre o ultimo SVG (por exemplo a pagina de indice) no navegador.
+    Retorna os SVGs gerados. Com o renderizador nativo, os SVGs sao desenhados a partir dos modelos;
+    com --renderer html, retorna as paginas HTML do visualizador.
+    """
+    if RENDERER == 'html' or use_native():
+        if RENDERER == 'auto':
+            print("[SVGRenderer] Java/plantuml.jar não encontrado: usando o renderizador nativo.")
+        return render_native(puml_paths, open_last)
+    plantuml_jar = plantuml_jar_path()
     if not os.path.exists(plantuml_jar):
         print(f"[SVGRenderer] plantuml.jar não encontrado em: {plantuml_jar}")
-        return None
-    if not os.path.exists(puml_path):
-        print(f"[SVGRenderer] Arquivo .puml não encontrado: {puml_path}")
-        return None
-    try:
-        subprocess.run([
-            "java", "-jar", plantuml_jar, "-tsvg", os.path.basename(puml_path)
-        ], cwd=folder, check=True)
-        if os.path.exists(svg_file):
-            webbrowser.open(svg_file)
-            return svg_file
+        return []
+    cache = open_render_cache(RENDER_CACHE_ENABLED)
+    server = None
+    pending = []
+    for puml_path in puml_paths:
+        if not os.path.exists(puml_path):
+            print(f"[SVGRenderer] Arquivo .puml não encontrado: {puml_path}")
+            continue
+        svg_file = os.path.splitext(puml_path)[0] + '.svg'
+        key = None
+        if cache is not None:
+            with open(puml_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            # Arquivos com varios diagramas geram varios SVGs: esses nao passam pelo cache
+            if len(START_TAG.findall(text)) == 1:
+                key = cache.key(text, plantuml_jar)
+                if cache.fetch(key, svg_file):
+                    pending.append((puml_path, svg_file, None))
+                    continue
+        server = server or get_server()
+        pending.append((puml_path, server.submit(puml_path), key))
+    svgs = []
+    for puml_path, result, key in pending:
+        svg_file = result if isinstance(result, str) else result.result()
+        if svg_file and os.path.exists(svg_file):
+            if key is not None:
+                cache.store(key, svg_file)
+            svgs.append(svg_file)
         else:
-            print(f"[SVGRenderer] SVG não foi gerado: {svg_file}")
-            return None
-    except subprocess.CalledProcessError as e:
-        print(f"[SVGRenderer] Erro ao gerar SVG: {e}")
-        return None
+            print(f"[SVGRenderer] SVG não foi gerado: {os.path.splitext(puml_path)[0] + '.svg'}")
+    if cache is not None:
+        cache.report(cache.evict())
+    if open_last and svgs:
+        webbrowser.open(svgs[-1])
+    return svgs
@@ -0,0 +1,255 @@
+import mmap
+import struct
+from collections import namedtuple
+
+"""
+UAssetHeader.py
+----------------
+Pure-Python reader of the header of a .uasset package, used to pick the Blueprints of a Content
+folder before any UAssetAPI export runs. The file is mmapped and only the package summary
+(FPackageFileSummary), the name table, the import table and the fixed-size rows of the export
+table are touched, so the bulk data of textures, meshes and sounds is never read.
+The class of the top-level exports tells what the asset is (Blueprint, WidgetBlueprint,
+Texture2D, ...); for Blueprints the parent class is the super class of the generated class export.
+Packages the reader does not understand (unversioned/cooked, truncated, not a package) give None,
+and callers should keep them rather than guess.
+"""
+
+PACKAGE_TAG = 0x9E2A83C1
+PKG_FILTER_EDITOR_ONLY = 0x80000000
+
+# EUnrealEngineObjectUE4Version / EUnrealEngineObjectUE5Version values that change the layout
+VER_UE4_LOAD_FOR_EDITOR_GAME = 365
+VER_UE4_SERIALIZE_TEXT_IN_PACKAGES = 459
+VER_UE4_COOKED_ASSETS_IN_EDITOR_SUPPORT = 485
+VER_UE4_NAME_HASHES_SERIALIZED = 504
+VER_UE4_PRELOAD_DEPENDENCIES_IN_COOKED_EXPORTS = 507
+VER_UE4_TEMPLATE_INDEX_IN_COOKED_EXPORTS = 508
+VER_UE4_64BIT_EXPORTMAP_SERIALSIZES = 511
+VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID = 516
+VER_UE4_NON_OUTER_PACKAGE_IMPORT = 520
+VER_UE5_OPTIONAL_RESOURCES = 1003
+VER_UE5_REMOVE_OBJECT_EXPORT_PACKAGE_GUID = 1005
+VER_UE5_TRACK_OBJECT_EXPORT_IS_INHERITED = 1006
+VER_UE5_ADD_SOFTOBJECTPATH_LIST = 1008
+VER_UE5_SCRIPT_SERIALIZATION_OFFSET = 1010
+VER_UE5_PACKAGE_SAVED_HASH = 1016
+
+# Asset classes exported to JSON
+BLUEPRINT_CLASSES = ('Blueprint', 'WidgetBlueprint')
+
+# asset_class: class of the main top-level export; parent_class: '/Script/Engine.Character' or
+# '/Game/Path/BP_Base.BP_Base_C' for Blueprints, else None
+AssetInfo = namedtuple('AssetInfo', ('asset_class', 'parent_class'))
+
+_int32 = struct.Struct('<i')
+_uint32 = struct.Struct('<I')
+_import_row = struct.Struct('<iiiiiii')
+
+
+class HeaderError(Exception):
+    pass
+
+
+class _Reader:
+    __slots__ = ('data', 'pos')
+
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def int32(self):
+        value = _int32.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def uint32(self):
+        value = _uint32.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def skip(self, count):
+        self.pos += count
+
+    def fstring(self):
+        length = self.int32()
+        if length == 0:
+            return ''
+        if length > 0:
+            raw = self.data[self.pos:self.pos + length - 1]
+            self.pos += length
+            return raw.decode('latin-1')
+        if -length > len(self.data):
+            raise HeaderError('bad string length')
+        raw = self.data[self.pos:self.pos - 2 * length - 2]
+        self.pos += -2 * length
+        return raw.decode('utf-16-le', 'replace')
+
+
+def read_summary(data):
+    """The fields of FPackageFileSummary the classifier needs, as a dict; raises HeaderError."""
+    r = _Reader(data)
+    if r.uint32() != PACKAGE_TAG:
+        raise HeaderError('not an Unreal package')
+    legacy = r.int32()
+    if legacy >= 0 or legacy < -8:
+        raise HeaderError(f'unsupported legacy file version {legacy}')
+    if legacy != -4:
+        r.skip(4)  # LegacyUE3Version
+    ue4 = r.int32()
+    ue5 = r.int32() if legacy <= -8 else 0
+    r.skip(4)  # FileVersionLicenseeUE
+    if legacy <= -2:
+        count = r.int32()
+        if count < 0 or count > 1000:
+            raise HeaderError('bad custom version count')
+        if legacy == -2:
+            r.skip(8 * count)
+        elif legacy >= -5:
+            for _ in range(count):
+                r.skip(20)
+                r.fstring()
+        else:
+            r.skip(20 * count)
+    if ue4 == 0 and ue5 == 0:
+        raise HeaderError('unversioned package')
+    if ue5 >= VER_UE5_PACKAGE_SAVED_HASH:
+        r.skip(20)  # SavedHash
+    r.skip(4)  # TotalHeaderSize
+    r.fstring()  # PackageName
+    flags = r.uint32()
+    editor_only = bool(flags & PKG_FILTER_EDITOR_ONLY)
+    name_count, name_offset = r.int32(), r.int32()
+    if ue5 >= VER_UE5_ADD_SOFTOBJECTPATH_LIST:
+        r.skip(8)
+    if ue4 >= VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID and not editor_only:
+        r.fstring()
+    if ue4 >= VER_UE4_SERIALIZE_TEXT_IN_PACKAGES:
+        r.skip(8)
+    export_count, export_offset, import_count, import_offset = r.int32(), r.int32(), r.int32(), r.int32()
+    size = len(data)
+    for count, offset in ((name_count, name_offset), (export_count, export_offset), (import_count, import_offset)):
+        if count < 0 or (count and not 0 < offset < size):
+            raise HeaderError('table out of the file')
+    return {'ue4': ue4, 'ue5': ue5, 'editor_only': editor_only, 'names': (name_count, name_offset),
+            'exports': (export_count, export_offset), 'imports': (import_count, import_offset)}
+
+
+def read_names(data, summary):
+    count, offset = summary['names']
+    r = _Reader(data, offset)
+    hashes = 4 if summary['ue4'] >= VER_UE4_NAME_HASHES_SERIALIZED else 0
+    names = []
+    for _ in range(count):
+        names.append(r.fstring())
+        r.skip(hashes)
+    return names
+
+
+def _fname(names, index, number):
+    name = names[index]
+    return f'{name}_{number - 1}' if number else name
+
+
+def read_imports(data, summary, names):
+    """(class name, object name, outer index) of every import."""
+    count, offset = summary['imports']
+    stride = 28
+    if summary['ue4'] >= VER_UE4_NON_OUTER_PACKAGE_IMPORT and not summary['editor_only']:
+        stride += 8  # PackageName
+    if summary['ue5'] >= VER_UE5_OPTIONAL_RESOURCES:
+        stride += 4  # bImportOptional
+    imports = []
+    for i in range(count):
+        _, _, class_index, class_number, outer, object_index, object_number = _import_row.unpack_from(
+            data, offset + i * stride)
+        imports.append((_fname(names, class_index, class_number), _fname(names, object_index, object_number), outer))
+    return imports
+
+
+def export_stride(summary):
+    """Size of one export table row; it only depends on the package versions."""
+    ue4, ue5 = summary['ue4'], summary['ue5']
+    size = 4 + 4 + 4 + 8 + 4  # ClassIndex, SuperIndex, OuterIndex, ObjectName, ObjectFlags
+    if ue4 >= VER_UE4_TEMPLATE_INDEX_IN_COOKED_EXPORTS:
+        size += 4
+    size += 16 if ue4 >= VER_UE4_64BIT_EXPORTMAP_SERIALSIZES else 8  # SerialSize, SerialOffset
+    size += 12  # bForcedExport, bNotForClient, bNotForServer
+    if ue5 < VER_UE5_REMOVE_OBJECT_EXPORT_PACKAGE_GUID:
+        size += 16
+    if ue5 >= VER_UE5_TRACK_OBJECT_EXPORT_IS_INHERITED:
+        size += 4
+    size += 4  # PackageFlags
+    if ue4 >= VER_UE4_LOAD_FOR_EDITOR_GAME:
+        size += 4
+    if ue4 >= VER_UE4_COOKED_ASSETS_IN_EDITOR_SUPPORT:
+        size += 4
+    if ue5 >= VER_UE5_OPTIONAL_RESOURCES:
+        size += 4
+    if ue4 >= VER_UE4_PRELOAD_DEPENDENCIES_IN_COOKED_EXPORTS:
+        size += 20
+    if ue5 >= VER_UE5_SCRIPT_SERIALIZATION_OFFSET:
+        size += 16
+    return size
+
+
+def read_exports(data, summary):
+    """(class index, super index, outer index) of every export."""
+    count, offset = summary['exports']
+    stride = export_stride(summary)
+    outer_at = 12 if summary['ue4'] >= VER_UE4_TEMPLATE_INDEX_IN_COOKED_EXPORTS else 8
+    exports = []
+    for i in range(count):
+        row = offset + i * stride
+        class_index, super_index = struct.unpack_from('<ii', data, row)
+        exports.append((class_index, super_index, _int32.unpack_from(data, row + outer_at)[0]))
+    return exports
+
+
+def _object_path(imports, index):
+    """'/Script/Engine.Character' for import `index` (a negative package index)."""
+    _, name, outer = imports[-index - 1]
+    parts = [name]
+    while outer < 0:
+        _, outer_name, outer = imports[-outer - 1]
+        parts.append(outer_name)
+    parts.reverse()
+    return parts[0] + ('.' + '.'.join(parts[1:]) if len(parts) > 1 else '')
+
+
+def classify(data):
+    """AssetInfo of a package held in `data` (bytes or mmap); raises HeaderError."""
+    summary = read_summary(data)
+    names = read_names(data, summary)
+    imports = read_imports(data, summary, names)
+    exports = read_exports(data, summary)
+
+    def class_of(index):
+        return imports[-index - 1][1] if index < 0 else None
+
+    top_classes = [class_of(class_index) for class_index, _, outer in exports if outer == 0]
+    asset_class = next((c for c in top_classes if c in BLUEPRINT_CLASSES), None)
+    if asset_class is None:
+        asset_class = next((c for c in top_classes if c and c not in ('MetaData', 'PackageMetaData')), None)
+        return AssetInfo(asset_class, None)
+    parent = None
+    for class_index, super_index, _ in exports:
+        generated = class_of(class_index)
+        if generated and generated.endswith('GeneratedClass') and super_index < 0:
+            parent = _object_path(imports, super_index)
+            break
+    return AssetInfo(asset_class, parent)
+
+
+def classify_uasset(path):
+    """AssetInfo of a .uasset file, or None when its header cannot be read."""
+    try:
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return classify(data)
+    except (OSError, ValueError, IndexError, struct.error, UnicodeDecodeError, HeaderError):
+        return None
+
+
+def is_blueprint(info):
+    return info is not None and info.asset_class in BLUEPRINT_CLASSES
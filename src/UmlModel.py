@@ -0,0 +1,245 @@
+from array import array
+
+"""
+UmlModel.py
+------------
+Shared intermediate representation produced by every backend and consumed by every emitter.
+Names and types are interned once in a SymbolTable and referenced by integer id; entities, members
+and relations are column tables backed by `array`, so a 100k-entity model holds a few flat buffers
+instead of millions of small dicts and duplicated strings. Members of an entity are contiguous
+(they are added right after it), so an entity only stores where its members start.
+"""
+
+# Entity kinds
+CLASS, STRUCT, INTERFACE, ENUM = range(4)
+KIND_NAMES = ('class', 'struct', 'interface', 'enum')
+
+# Member kinds (enum values are members too)
+ATTRIBUTE, METHOD, STATIC_ATTRIBUTE, STATIC_METHOD, VALUE = range(5)
+MEMBER_KIND_NAMES = ('attribute', 'method', 'static_attribute', 'static_method', 'value')
+
+VISIBILITY_NAMES = ('public', 'protected', 'private')
+
+# Relation kinds: always stored as from=owner/derived, to=target/base
+EXTENDS, IMPLEMENTS, ASSOCIATION, COMPOSITION = range(4)
+RELATION_NAMES = ('extends', 'implements', 'association', 'composition')
+
+# Version of the *_UML_ClassDiagram.json layout written by to_dict(); version 1 was the per-backend
+# layout (classes/interfaces/enums, structs for Go) that predates the shared model
+JSON_SCHEMA = 2
+
+
+class SymbolTable:
+    """Interns strings: every distinct name or type is stored once and referenced by its id (0 is '')."""
+    __slots__ = ('names', 'ids')
+
+    def __init__(self):
+        self.names = ['']
+        self.ids = {'': 0}
+
+    def intern(self, text):
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.names)
+            self.names.append(text)
+        return sid
+
+    def __getitem__(self, sid):
+        return self.names[sid]
+
+    def __len__(self):
+        return len(self.names)
+
+
+class Member:
+    __slots__ = ('kind', 'name', 'type', 'params', 'visibility')
+
+    def __init__(self, kind, name, type, params, visibility):
+        self.kind = kind
+        self.name = name
+        self.type = type
+        self.params = params
+        self.visibility = visibility
+
+
+class Entity:
+    """Read-only view of one row of the entity table; strings are resolved on access."""
+    __slots__ = ('model', 'index')
+
+    def __init__(self, model, index):
+        self.model = model
+        self.index = index
+
+    @property
+    def id(self):
+        return self.model.symbols[self.model.entity_id[self.index]]
+
+    @property
+    def name(self):
+        return self.model.symbols[self.model.entity_name[self.index]]
+
+    @property
+    def kind(self):
+        return self.model.entity_kind[self.index]
+
+    @property
+    def namespace(self):
+        return self.model.symbols[self.model.entity_namespace[self.index]]
+
+    @property
+    def stereotype(self):
+        return self.model.symbols[self.model.entity_stereotype[self.index]]
+
+    @property
+    def template(self):
+        return self.model.symbols[self.model.entity_template[self.index]]
+
+    def members(self, kind=None):
+        """Members in declaration order, optionally only those of one kind."""
+        model = self.model
+        symbols = model.symbols.names
+        start, end = model.member_range(self.index)
+        for m in range(start, end):
+            member_kind = model.member_kind[m]
+            if kind is None or member_kind == kind:
+                yield Member(member_kind, symbols[model.member_name[m]], symbols[model.member_type[m]],
+                             symbols[model.member_params[m]], model.member_visibility[m])
+
+    def member_names(self, kind):
+        return [m.name for m in self.members(kind)]
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'kind': KIND_NAMES[self.kind],
+            'namespace': self.namespace,
+            'stereotype': self.stereotype,
+            'template': self.template,
+            'members': [{'kind': MEMBER_KIND_NAMES[m.kind], 'name': m.name, 'type': m.type,
+                         'params': m.params, 'visibility': VISIBILITY_NAMES[m.visibility]}
+                        for m in self.members()],
+        }
+
+
+class UmlModel:
+    __slots__ = ('symbols', 'entity_id', 'entity_name', 'entity_kind', 'entity_namespace', 'entity_stereotype',
+                 'entity_template', 'entity_members', 'member_kind', 'member_name', 'member_type', 'member_params',
+                 'member_visibility', 'relation_kind', 'relation_from', 'relation_to', 'relation_label',
+                 '_index')
+
+    def __init__(self):
+        self.symbols = SymbolTable()
+        self.entity_id = array('I')
+        self.entity_name = array('I')
+        self.entity_kind = array('B')
+        self.entity_namespace = array('I')
+        self.entity_stereotype = array('I')
+        self.entity_template = array('I')
+        # Index of the first member of each entity
+        self.entity_members = array('I')
+        self.member_kind = array('B')
+        self.member_name = array('I')
+        self.member_type = array('I')
+        self.member_params = array('I')
+        self.member_visibility = array('B')
+        self.relation_kind = array('B')
+        # Relation ends are entity id symbols: targets may be external types without an entity
+        self.relation_from = array('I')
+        self.relation_to = array('I')
+        self.relation_label = array('I')
+        self._index = None
+
+    # --- Building ---
+
+    def add_entity(self, id, kind, name=None, namespace='', stereotype='', template=''):
+        """Appends an entity; `name` defaults to `id`. Returns its index."""
+        intern = self.symbols.intern
+        self.entity_id.append(intern(id))
+        self.entity_name.append(intern(id if name is None else name))
+        self.entity_kind.append(kind)
+        self.entity_namespace.append(intern(namespace))
+        self.entity_stereotype.append(intern(stereotype))
+        self.entity_template.append(intern(template))
+        self.entity_members.append(len(self.member_kind))
+        self._index = None
+        return len(self.entity_id) - 1
+
+    def add_member(self, kind, name, type='', params='', visibility=0):
+        """Appends a member to the entity added last."""
+        if not self.entity_id:
+            raise ValueError('add_member() called before add_entity()')
+        intern = self.symbols.intern
+        self.member_kind.append(kind)
+        self.member_name.append(intern(name))
+        self.member_type.append(intern(type))
+        self.member_params.append(intern(params))
+        self.member_visibility.append(visibility)
+
+    def add_relation(self, kind, source, target, label=''):
+        intern = self.symbols.intern
+        self.relation_kind.append(kind)
+        self.relation_from.append(intern(source))
+        self.relation_to.append(intern(target))
+        self.relation_label.append(intern(label))
+
+    # --- Reading ---
+
+    def __len__(self):
+        return len(self.entity_id)
+
+    def member_range(self, index):
+        start = self.entity_members[index]
+        end = self.entity_members[index + 1] if index + 1 < len(self.entity_members) else len(self.member_kind)
+        return start, end
+
+    def entities(self, kind=None):
+        for index, entity_kind in enumerate(self.entity_kind):
+            if kind is None or entity_kind == kind:
+                yield Entity(self, index)
+
+    def find(self, id):
+        """Entity with the given id, or None. The id index is built on first use."""
+        if self._index is None:
+            self._index = {sid: index for index, sid in enumerate(self.entity_id)}
+        sid = self.symbols.ids.get(id)
+        index = self._index.get(sid) if sid is not None else None
+        return Entity(self, index) if index is not None else None
+
+    def relations(self, kind=None):
+        """Yields (kind, from_id, to_id, label) tuples."""
+        symbols = self.symbols.names
+        for r, relation_kind in enumerate(self.relation_kind):
+            if kind is None or relation_kind == kind:
+                yield (relation_kind, symbols[self.relation_from[r]], symbols[self.relation_to[r]],
+                       symbols[self.relation_label[r]])
+
+    def relation_dicts(self):
+        for kind, source, target, label in self.relations():
+            yield {'type': RELATION_NAMES[kind], 'from': source, 'to': target, 'label': label}
+
+    def to_dict(self):
+        """JSON-friendly form of the model (the *_UML_ClassDiagram.json artifacts)."""
+        return {'schema': JSON_SCHEMA,
+                'entities': [entity.to_dict() for entity in self.entities()],
+                'relations': list(self.relation_dicts())}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('schema') != JSON_SCHEMA:
+            raise ValueError(f"unsupported UML JSON schema {data.get('schema', 1)} (expected {JSON_SCHEMA})")
+        model = cls()
+        for entity in data['entities']:
+            model.add_entity(entity['id'], KIND_NAMES.index(entity['kind']), entity['name'], entity['namespace'],
+                             entity['stereotype'], entity['template'])
+            for m in entity['members']:
+                model.add_member(MEMBER_KIND_NAMES.index(m['kind']), m['name'], m['type'], m['params'],
+                                 VISIBILITY_NAMES.index(m['visibility']))
+        for rel in data['relations']:
+            model.add_relation(RELATION_NAMES.index(rel['type']), rel['from'], rel['to'], rel['label'])
+        return model
+
+
+def visibility_code(name):
+    """'protected' -> 1; unknown or missing visibilities count as public."""
+    return VISIBILITY_NAMES.index(name) if name in VISIBILITY_NAMES else 0
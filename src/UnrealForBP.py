@@ -1,10 +1,36 @@
 import os
+import json
+import shlex
 import subprocess
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from FileDiscovery import find_files
+from ParallelParse import resolve_jobs
+from ParseCache import file_hash, RACY_MTIME_WINDOW_NS
+from UAssetHeader import classify_uasset, is_blueprint
 
 # Caminho relativo para o UAssetAPI.dll dentro da pasta UAssetAPI
 UASSETAPI_DIR = os.path.join(os.path.dirname(__file__), 'UAssetAPI')
 UASSETAPI_CLI_EXE = os.path.join(UASSETAPI_DIR, 'UAssetAPI.CLI.exe')
 
+# Tempo maximo (s) de uma exportacao antes de o processo ser encerrado
+EXPORT_TIMEOUT = 300
+# Novas tentativas de um asset cuja exportacao falhou (erro ou tempo limite)
+EXPORT_RETRIES = 2
+# Intervalo (s) entre atualizacoes da linha de progresso
+PROGRESS_INTERVAL = 0.5
+
+# Manifesto da exportacao incremental, na pasta de saida
+MANIFEST_NAME = 'export-manifest.json'
+MANIFEST_VERSION = 2
+# Intervalo (s) entre gravacoes do manifesto durante a exportacao (uma execucao interrompida nao perde tudo)
+MANIFEST_SAVE_INTERVAL = 30
+
+# error e None quando a exportacao deu certo
+ExportResult = namedtuple('ExportResult', ('uasset', 'error', 'attempts'))
+ExportSummary = namedtuple('ExportSummary', ('skipped', 'exported', 'failed', 'pruned'))
+
 
 def find_content_folder(project_root):
     """Procura pela pasta 'Content' dentro do projeto Unreal."""
@@ -15,46 +41,234 @@ def find_content_folder(project_root):
     return None
 
 
-def find_uasset_files(content_folder):
-    """Retorna todos os arquivos .uasset dentro da pasta Content (recursivo)."""
-    uasset_files = []
-    for root, dirs, files in os.walk(content_folder):
-        for file in files:
-            if file.endswith('.uasset'):
-                uasset_files.append(os.path.join(root, file))
-    return uasset_files
+def find_uasset_files(content_folder, project_root=None):
+    """
+    Retorna todos os arquivos .uasset dentro da pasta Content (recursivo, respeitando .gitignore/.uumlignore,
+    inclusive os da raiz do projeto `project_root`).
+    """
+    return find_files(content_folder, ('.uasset',), language='unrealbp', project_root=project_root)
+
+
+def select_blueprints(uasset_files):
+    """
+    Pre-classificacao pelo cabecalho (UAssetHeader): mantem os Blueprints/WidgetBlueprints e os
+    assets cujo cabecalho nao foi entendido (o exportador decide), e descarta texturas, meshes,
+    sons, materiais etc. antes de qualquer processo ser criado. Retorna (assets, classe pai por asset).
+    """
+    start = time.perf_counter()
+    selected = []
+    parents = {}
+    unknown = 0
+    for uasset in uasset_files:
+        info = classify_uasset(uasset)
+        if info is None:
+            unknown += 1
+        elif not is_blueprint(info):
+            continue
+        else:
+            parents[uasset] = info.parent_class
+        selected.append(uasset)
+    elapsed = time.perf_counter() - start
+    print(f"[LOG] Pré-classificação: {len(parents)} Blueprints, {unknown} não reconhecidos (exportados mesmo assim), "
+          f"{len(uasset_files) - len(selected)} outros assets ignorados em {elapsed:.1f} s "
+          f"({len(uasset_files) / elapsed if elapsed > 0 else 0.0:.0f} assets/s).")
+    return selected, parents
+
+
+def exporter_command():
+    """
+    Comando do exportador: UUML_UASSET_EXPORTER (por exemplo um script substituto no Linux,
+    'python fake_exporter.py') ou o UAssetAPI.CLI.exe. Recebe 'export <uasset> <json>'.
+    """
+    override = os.environ.get('UUML_UASSET_EXPORTER')
+    return shlex.split(override) if override else [UASSETAPI_CLI_EXE]
+
+
+def exporter_version(exporter=None):
+    """
+    Versao do exportador gravada no manifesto: o comando e o tamanho/mtime dos arquivos dele (o
+    UAssetAPI.CLI.exe ou o script substituto). Se mudar, todos os assets sao exportados de novo.
+    """
+    parts = []
+    for arg in exporter or exporter_command():
+        parts.append(os.path.basename(arg))
+        if os.path.isfile(arg):
+            st = os.stat(arg)
+            parts.append(f'{st.st_size}:{st.st_mtime_ns}')
+    return ' '.join(parts)
+
+
+class ExportManifest:
+    """
+    Manifesto da exportacao (MANIFEST_NAME na pasta de saida): para cada .uasset exportado, o
+    tamanho, o mtime, o hash do conteudo e a classe pai (Blueprints), mais a versao do exportador. Um asset so e exportado
+    de novo quando o os.stat mudou e o hash tambem (um asset apenas tocado e pulado), quando o JSON
+    sumiu ou quando o exportador mudou. Assets que falharam nao entram no manifesto.
+    """
+
+    def __init__(self, output_dir, version):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.version = version
+        self.assets = {}
+        self.written_ns = 0
+        self.saved = time.perf_counter()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('manifest') == MANIFEST_VERSION and data.get('exporter') == version:
+            self.assets = data.get('assets', {})
+            self.written_ns = data.get('written_ns', 0)
+
+    def up_to_date(self, rel_path, uasset, output_json):
+        """True quando o JSON do asset ainda vale (atualiza o mtime de um asset so tocado)."""
+        entry = self.assets.get(rel_path)
+        if entry is None or not os.path.exists(output_json):
+            return False
+        st = os.stat(uasset)
+        if st.st_size != entry[0]:
+            return False
+        # mtimes muito proximos da gravacao do manifesto podem esconder uma edicao (timestamps grosseiros)
+        if st.st_mtime_ns == entry[1] and st.st_mtime_ns < self.written_ns - RACY_MTIME_WINDOW_NS:
+            return True
+        if file_hash(uasset) != entry[2]:
+            return False
+        entry[1] = st.st_mtime_ns
+        return True
 
+    def record(self, rel_path, uasset, parent_class=None):
+        st = os.stat(uasset)
+        self.assets[rel_path] = [st.st_size, st.st_mtime_ns, file_hash(uasset), parent_class]
+        if time.perf_counter() - self.saved >= MANIFEST_SAVE_INTERVAL:
+            self.save()
 
-def export_uasset_to_json(uasset_path, output_json_path, error_log_path=None):
+    def prune(self, present, output_dir):
+        """Remove do manifesto e da pasta de saida os JSONs de assets que nao existem mais; retorna quantos."""
+        removed = [rel_path for rel_path in self.assets if rel_path not in present]
+        for rel_path in removed:
+            del self.assets[rel_path]
+            output_json = os.path.join(output_dir, os.path.splitext(rel_path)[0] + '.json')
+            if os.path.exists(output_json):
+                os.remove(output_json)
+        return len(removed)
+
+    def save(self):
+        self.written_ns = time.time_ns()
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'manifest': MANIFEST_VERSION, 'exporter': self.version, 'written_ns': self.written_ns,
+                       'assets': self.assets}, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+        self.saved = time.perf_counter()
+
+
+def export_uasset_to_json(uasset_path, output_json_path, error_log_path=None, exporter=None, timeout=EXPORT_TIMEOUT):
     """Usa o UAssetAPI.CLI.exe self-contained para exportar um .uasset para .json.
-    Em caso de erro, registra o arquivo no log de erros."""
-    print(f"[LOG] Chamando UAssetAPI.CLI.exe para exportar: {uasset_path}")
-    print(f"[LOG] Comando: {UASSETAPI_CLI_EXE} export {uasset_path} {output_json_path}")
+    O processo e encerrado apos `timeout` segundos. Retorna None em caso de sucesso, senao a
+    mensagem de erro (o JSON parcial e removido e, com error_log_path, o arquivo e registrado no log)."""
+    command = (exporter or exporter_command()) + ['export', uasset_path, output_json_path]
     try:
-        result = subprocess.run([
-            UASSETAPI_CLI_EXE,
-            'export',
-            uasset_path,
-            output_json_path
-        ], check=False, capture_output=True, text=True)
-        print(f"[LOG] Retorno do processo: {result.returncode}")
-        if result.stdout:
-            print(f"[STDOUT] {result.stdout}")
-        if result.stderr:
-            print(f"[STDERR] {result.stderr}")
+        result = subprocess.run(command, check=False, capture_output=True, text=True, timeout=timeout)
+        error = None
         if result.returncode != 0:
-            print(f"[ERRO] Falha ao exportar {uasset_path}: {result.stderr}")
-            if error_log_path:
-                with open(error_log_path, 'a', encoding='utf-8') as elog:
-                    elog.write(f"{uasset_path}\n")
-    except Exception as e:
-        print(f"[EXCEPTION] Falha ao executar UAssetAPI.CLI.exe: {e}")
+            output = (result.stderr or result.stdout).strip().splitlines()
+            error = f"codigo {result.returncode}: {output[-1] if output else 'sem saida'}"
+    except subprocess.TimeoutExpired:
+        error = f"tempo limite de {timeout} s excedido"
+    except OSError as e:
+        error = f"falha ao executar o exportador: {e}"
+    if error:
+        if os.path.exists(output_json_path):
+            os.remove(output_json_path)
         if error_log_path:
             with open(error_log_path, 'a', encoding='utf-8') as elog:
-                elog.write(f"{uasset_path}\n")
+                elog.write(f"{uasset_path}\t{error}\n")
+    return error
+
+
+def export_with_retries(uasset_path, output_json_path, exporter=None, timeout=EXPORT_TIMEOUT, retries=EXPORT_RETRIES):
+    """Exporta um asset, tentando de novo ate `retries` vezes; retorna um ExportResult."""
+    for attempt in range(1, retries + 2):
+        error = export_uasset_to_json(uasset_path, output_json_path, exporter=exporter, timeout=timeout)
+        if error is None:
+            break
+    return ExportResult(uasset_path, error, attempt)
+
+
+class ExportProgress:
+    """Linha de progresso (feitos/total, assets/s, ETA), reescrita no lugar no maximo a cada PROGRESS_INTERVAL."""
 
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+        self.shown = 0.0
 
-def batch_export_blueprints_to_json(project_root, output_dir=None):
+    def advance(self, failed):
+        self.done += 1
+        self.failed += failed
+        now = time.perf_counter()
+        if now - self.shown >= PROGRESS_INTERVAL or self.done == self.total:
+            self.shown = now
+            print(f"\r{self.line(now)}", end='', flush=True)
+
+    def line(self, now=None):
+        elapsed = (now or time.perf_counter()) - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if rate > 0 else 0.0
+        return (f"[LOG] {self.done}/{self.total} assets ({rate:.1f}/s, ETA {int(eta) // 3600}:{int(eta) // 60 % 60:02d}:"
+                f"{int(eta) % 60:02d}), "
+                f"{self.failed} falhas")
+
+
+def export_all(jobs_list, error_log_path, jobs=0, exporter=None, timeout=EXPORT_TIMEOUT, retries=EXPORT_RETRIES,
+               on_exported=None):
+    """
+    Exporta os pares (uasset, json) em um pool de `jobs` threads (0 = uma por nucleo), cada uma
+    esperando o seu processo exportador. So a thread principal escreve no log de erros (um unico
+    arquivo aberto) e chama on_exported(uasset) para cada sucesso; no maximo 4 exportacoes por
+    worker ficam na fila. Retorna (exportados, falhas).
+    """
+    workers = resolve_jobs(jobs)
+    progress = ExportProgress(len(jobs_list))
+    exported = failed = 0
+    with open(error_log_path, 'w', encoding='utf-8') as elog, ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        queued = iter(jobs_list)
+        while True:
+            for uasset, output_json in queued:
+                pending.add(pool.submit(export_with_retries, uasset, output_json, exporter, timeout, retries))
+                if len(pending) >= workers * 4:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                if result.error:
+                    failed += 1
+                    elog.write(f"{result.uasset}\t{result.error} ({result.attempts} tentativas)\n")
+                    print(f"\n[ERRO] Falha ao exportar {result.uasset}: {result.error}")
+                else:
+                    exported += 1
+                    if on_exported is not None:
+                        on_exported(result.uasset)
+                progress.advance(result.error is not None)
+    if jobs_list:
+        print()
+    return exported, failed
+
+
+def batch_export_blueprints_to_json(project_root, output_dir=None, jobs=0, exporter=None, timeout=EXPORT_TIMEOUT,
+                                   retries=EXPORT_RETRIES, classify=True):
+    """
+    Exporta os Blueprints da pasta Content para JSONs espelhados em output_dir (com classify=False,
+    todos os .uasset). So os assets novos ou alterados desde a ultima execucao (ExportManifest) sao
+    exportados, e os JSONs de assets apagados sao removidos. Retorna um ExportSummary (pulados,
+    exportados, falhas, removidos).
+    """
     print(f"[LOG] Iniciando batch_export_blueprints_to_json para: {project_root}")
     content_folder = find_content_folder(project_root)
     print(f"[LOG] Pasta Content detectada: {content_folder}")
@@ -68,23 +282,45 @@ def batch_export_blueprints_to_json(project_root, output_dir=None):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     error_log_path = os.path.join(output_dir, 'log-error.txt')
-    # Limpa o log de erro anterior
-    open(error_log_path, 'w').close()
-    uasset_files = find_uasset_files(content_folder)
+    uasset_files = find_uasset_files(content_folder, project_root)
     print(f"[LOG] {len(uasset_files)} arquivos .uasset encontrados.")
+    parents = {}
+    if classify:
+        uasset_files, parents = select_blueprints(uasset_files)
+    manifest = ExportManifest(output_dir, exporter_version(exporter))
+    exports = []
+    rel_paths = {}
+    created = set()
+    skipped = 0
     for uasset in uasset_files:
         # Caminho relativo do .uasset em relação à pasta Content
         rel_path = os.path.relpath(uasset, project_root)
+        rel_paths[uasset] = rel_path
         # Troca extensão para .json
         json_rel_path = os.path.splitext(rel_path)[0] + '.json'
         # Caminho de saída espelhando a estrutura
         output_json = os.path.join(output_dir, json_rel_path)
-        # Cria diretório espelhado se necessário
+        if manifest.up_to_date(rel_path, uasset, output_json):
+            skipped += 1
+            continue
+        # Cria diretório espelhado se necessário (uma vez por pasta)
         output_json_dir = os.path.dirname(output_json)
-        if not os.path.exists(output_json_dir):
-            os.makedirs(output_json_dir)
-        print(f"[LOG] Extraindo {uasset} -> {output_json}")
-        export_uasset_to_json(uasset, output_json, error_log_path=error_log_path)
+        if output_json_dir not in created:
+            os.makedirs(output_json_dir, exist_ok=True)
+            created.add(output_json_dir)
+        exports.append((uasset, output_json))
+    pruned = manifest.prune(set(rel_paths.values()), output_dir)
+    print(f"[LOG] {skipped} assets sem alteração, {len(exports)} a exportar, {pruned} JSONs de assets apagados removidos.")
+    start = time.perf_counter()
+    try:
+        exported, failed = export_all(exports, error_log_path, jobs, exporter, timeout, retries,
+                                      lambda uasset: manifest.record(rel_paths[uasset], uasset, parents.get(uasset)))
+    finally:
+        manifest.save()
+    elapsed = time.perf_counter() - start
+    print(f"[LOG] {skipped} pulados, {exported} exportados, {failed} falhas, {pruned} removidos em {elapsed:.1f} s "
+          f"({len(exports) / elapsed if elapsed > 0 else 0.0:.1f} assets/s). Log de erros: {error_log_path}")
+    return ExportSummary(skipped, exported, failed, pruned)
 
 
 if __name__ == '__main__':
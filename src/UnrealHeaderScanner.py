@@ -0,0 +1,432 @@
+import re
+
+"""
+UnrealHeaderScanner.py
+-----------------------
+Single-pass structural scanner for Unreal Engine headers.
+One compiled regex tokenizes the whole file (comments, strings and preprocessor lines are dropped in
+the same scan), then a linear walk over the tokens tracks brace depth and scopes to collect every
+class/struct/interface/enum of the file with its attributes, methods and bases.
+Reflection macros (UCLASS, USTRUCT, UINTERFACE, UENUM, UPROPERTY, UFUNCTION, GENERATED_BODY, *_API, ...)
+are understood, so no per-line regex or comment-stripping pass is needed.
+"""
+
+TOKEN_PATTERN = re.compile(r'''
+    //[^\n]*                                  # line comment
+  | /\*.*?\*/                                 # block comment
+  | ^[ \t]*\#[^\n]*(?:\\\n[^\n]*)*            # preprocessor line (with continuations)
+  | "(?:\\.|[^"\\\n])*"                       # string literal
+  | '(?:\\.|[^'\\\n])*'                       # char literal
+  | ([A-Za-z_]\w*                             # identifier
+  | \d[\w.']*                                 # number
+  | ::|->|==|!=|<=|&&|\|\||[{}()\[\];:,<>=*&~!?+\-/%|^.])  # punctuation
+''', re.VERBOSE | re.MULTILINE | re.DOTALL)
+
+REFLECTION_MACROS = {'UCLASS': 'class', 'USTRUCT': 'struct', 'UINTERFACE': 'interface', 'UENUM': 'enum'}
+# Macros that may appear anywhere in a declaration and are skipped with their arguments
+INLINE_MACROS = {'UPARAM', 'UMETA', 'TEXT', 'PURE_VIRTUAL', 'DEPRECATED', 'UE_DEPRECATED'}
+SPECIFIERS = {'virtual', 'static', 'inline', 'explicit', 'constexpr', 'mutable', 'FORCEINLINE',
+              'FORCENOINLINE', 'extern', 'volatile'}
+SKIPPED_STATEMENTS = {'friend', 'using', 'typedef', 'static_assert', 'template'}
+ACCESS = {'public', 'protected', 'private'}
+STRUCTURAL_TOKENS = {'class', 'struct', 'enum', 'namespace', 'template', '{', '}', ';'} | ACCESS
+MACRO_NAME = re.compile(r'^(?:[A-Z][A-Z0-9_]+|DECLARE_\w+|GENERATED_\w+)$')
+
+POINTER_CHARS = re.compile(r'[&*]')
+TEMPLATE_ARGS = re.compile(r'<[^<>]*>')
+TYPE_KEYWORDS = re.compile(r'\b(const|virtual|static|inline|override|final|explicit|friend|mutable|volatile|constexpr|typename|class|struct|enum|public|protected|private)\b')
+TRAILING_NAME = re.compile(r'\b\w+\s*$')
+
+
+def clean_type(type_str):
+    """
+    Cleans the data type by removing unwanted characters.
+    """
+    type_str = POINTER_CHARS.sub('', type_str)
+    # Innermost template arguments first, so nested ones like TArray<TMap<K, V>> are removed too
+    previous = None
+    while previous != type_str:
+        previous = type_str
+        type_str = TEMPLATE_ARGS.sub('', type_str)
+    type_str = TYPE_KEYWORDS.sub('', type_str)
+    return type_str.strip()
+
+def clean_param(param):
+    """
+    Cleans the parameter by removing unwanted characters.
+    """
+    param = clean_type(param)
+    param = TRAILING_NAME.sub('', param).strip()
+    return param
+
+def clean_params(params_str):
+    """
+    Cleans the parameters by removing unwanted characters.
+    """
+    if not params_str.strip():
+        return ''
+    params = []
+    for p in params_str.split(','):
+        p = clean_param(p.strip())
+        if p:
+            params.append(p)
+    return ', '.join(params)
+
+
+def tokenize(content):
+    """Returns the code tokens of `content`; comments, literals and preprocessor lines are dropped."""
+    return [t for t in TOKEN_PATTERN.findall(content) if t]
+
+
+def _is_word(token):
+    return token[0].isalnum() or token[0] == '_'
+
+
+def join_tokens(tokens):
+    """Joins tokens back into source-like text ('const FString&', 'TArray<AActor*> Items')."""
+    out = []
+    prev_space = False
+    for t in tokens:
+        word = _is_word(t)
+        if word and prev_space:
+            out.append(' ')
+        out.append(t)
+        prev_space = word or t in ('*', '&', '>')
+    return ''.join(out)
+
+
+def split_top_level(tokens, sep=','):
+    """Splits tokens on `sep` outside of (), <>, [] and {} nesting."""
+    parts = [[]]
+    depth = 0
+    for t in tokens:
+        if t in '(<[{':
+            depth += 1
+        elif t in ')>]}':
+            depth -= 1
+        elif t == sep and depth <= 0:
+            parts.append([])
+            continue
+        parts[-1].append(t)
+    return [p for p in parts if p]
+
+
+def _skip_balanced(tokens, i, open_tok, close_tok):
+    """`tokens[i]` is `open_tok`; returns the index just after its matching `close_tok`."""
+    depth = 0
+    n = len(tokens)
+    while i < n:
+        t = tokens[i]
+        if t == open_tok:
+            depth += 1
+        elif t == close_tok:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return n
+
+
+def _class_head(tokens, i):
+    """
+    Looks at the tokens after a 'class'/'struct' keyword at `i`.
+    Returns (end_index, terminator, head_tokens) when it is a definition ('{') or forward declaration (';'),
+    or None when the keyword is an elaborated type specifier such as 'class UCameraComponent* Camera;'.
+    """
+    n = len(tokens)
+    j = i + 1
+    while j < n and tokens[j] not in ('{', ';'):
+        if tokens[j] in ('*', '&', '(', ')', '=', '}'):
+            return None
+        j += 1
+    if j >= n:
+        return None
+    return j, tokens[j], tokens[i + 1:j]
+
+
+def _parse_head(head):
+    """Splits a class head into (name, bases) skipping *_API and 'final'."""
+    colon = head.index(':') if ':' in head else len(head)
+    names = [t for t in head[:colon] if _is_word(t) and not t.endswith('_API') and t not in ('final', 'alignas')]
+    name = names[-1] if names else None
+    bases = []
+    for part in split_top_level(head[colon + 1:]):
+        part = [t for t in part if t not in ACCESS and t != 'virtual']
+        if part:
+            bases.append(join_tokens(part))
+    return name, bases
+
+
+def _parse_enum(tokens, i):
+    """`tokens[i]` is the '{' of an enum body; returns (values, index after the closing brace)."""
+    values = []
+    n = len(tokens)
+    i += 1
+    expect_name = True
+    depth = 0
+    while i < n:
+        t = tokens[i]
+        if t in ('(', '{', '['):
+            depth += 1
+        elif t in (')', '}', ']'):
+            if depth == 0 and t == '}':
+                return values, i + 1
+            depth -= 1
+        elif depth == 0:
+            if t == ',':
+                expect_name = True
+            elif expect_name and _is_word(t) and t not in INLINE_MACROS:
+                values.append(t)
+                expect_name = False
+        i += 1
+    return values, n
+
+
+def type_references(tokens):
+    """
+    Type names referenced by the tokens of a type, template arguments included, each normalized
+    with clean_type: 'const TArray<UItem*>&' -> ['TArray', 'UItem'], 'UE::FVector' -> ['FVector'].
+    """
+    refs = []
+    i = 0
+    n = len(tokens)
+    while i < n:
+        if _is_word(tokens[i]):
+            while i + 2 < n and tokens[i + 1] == '::' and _is_word(tokens[i + 2]):
+                i += 2
+            name = clean_type(tokens[i])
+            if name and name not in refs:
+                refs.append(name)
+        i += 1
+    return refs
+
+def _add_refs(entity, refs):
+    for ref in refs:
+        if ref not in entity['refs']:
+            entity['refs'].append(ref)
+
+def _member_from_statement(stmt, entity):
+    """Adds the attribute(s) or method declared by the statement tokens `stmt` to `entity`."""
+    while stmt and stmt[0] in SPECIFIERS:
+        stmt = stmt[1:]
+    if not stmt or stmt[0] in SKIPPED_STATEMENTS:
+        return
+    visibility = entity['_visibility']
+    class_name = entity['name']
+    # A method has a top-level '(' before any top-level '='
+    depth = 0
+    paren = None
+    for idx, t in enumerate(stmt):
+        if t in ('<', '['):
+            depth += 1
+        elif t in ('>', ']'):
+            depth -= 1
+        elif t == '=' and depth == 0 and 'operator' not in stmt:
+            break
+        elif t == '(' and depth <= 0:
+            paren = idx
+            break
+    if paren is not None:
+        if paren == 0:
+            return
+        name_idx = paren - 1
+        name = stmt[name_idx]
+        if 'operator' in stmt[max(0, paren - 4):paren]:
+            name_idx = stmt.index('operator', max(0, paren - 4))
+            name = ''.join(stmt[name_idx:paren])
+        elif not _is_word(name):
+            return
+        # Constructors and destructors are not listed
+        if name == class_name or (name_idx > 0 and stmt[name_idx - 1] == '~'):
+            return
+        ret = [t for t in stmt[:name_idx] if t not in SPECIFIERS]
+        close = _skip_balanced(stmt, paren, '(', ')')
+        params = []
+        for p in split_top_level(stmt[paren + 1:close - 1]):
+            if '=' in p:
+                p = p[:p.index('=')]
+            # The parameter name is not a type reference
+            named = len(p) > 1 and _is_word(p[-1]) and p[-2] != '::'
+            _add_refs(entity, type_references(p[:-1] if named else p))
+            p = clean_param(join_tokens(p))
+            if p and p != 'void':
+                params.append(p)
+        meth_type = clean_type(join_tokens(ret))
+        entity['methods'].append({'name': name, 'type': meth_type if meth_type else class_name,
+                                  'params': ', '.join(params), 'visibility': visibility})
+        return
+    declarators = split_top_level(stmt)
+    type_tokens = None
+    for k, decl in enumerate(declarators):
+        for stop in ('=', ':', '['):
+            if stop in decl:
+                decl = decl[:decl.index(stop)]
+        if not decl or not _is_word(decl[-1]):
+            continue
+        if k == 0:
+            if len(decl) < 2:
+                return
+            type_tokens = decl[:-1]
+        elif type_tokens is None:
+            return
+        attr_type = clean_type(join_tokens(type_tokens))
+        if k == 0:
+            _add_refs(entity, type_references(type_tokens))
+        if attr_type:
+            entity['attributes'].append({'name': decl[-1], 'type': attr_type, 'visibility': visibility})
+
+
+def scan_header(content):
+    """
+    Scans one header and returns {'forward_declarations', 'classes', 'interfaces', 'enums'}.
+    Every class/struct/interface definition of the file is emitted (not only the first UCLASS).
+    'forward_declarations' holds the class names the file only declares ('class X;') or refers to
+    with an elaborated type ('class X* Ptr'). Each class/interface lists in 'refs' the type names
+    its attributes and parameters refer to.
+    """
+    tokens = tokenize(content)
+    n = len(tokens)
+    forward_declarations = []
+    entities = []
+    enums = []
+    u_interfaces = set()
+    # Scope stack: entity dicts for class bodies, None for namespaces and other blocks
+    scopes = []
+    stmt = []
+    pending_kind = None
+    i = 0
+    while i < n:
+        t = tokens[i]
+        nxt = tokens[i + 1] if i + 1 < n else ''
+        if nxt != '(' and t not in STRUCTURAL_TOKENS:
+            # Fast path: most tokens are plain parts of a declaration
+            stmt.append(t)
+            i += 1
+            continue
+        entity = scopes[-1] if scopes else None
+        if t in REFLECTION_MACROS and nxt == '(':
+            pending_kind = REFLECTION_MACROS[t]
+            i = _skip_balanced(tokens, i + 1, '(', ')')
+            continue
+        if nxt == '(' and (t in INLINE_MACROS or (not stmt and MACRO_NAME.match(t))):
+            # UPROPERTY(...), UFUNCTION(...), GENERATED_BODY(), DECLARE_*(...), UPARAM(...)
+            i = _skip_balanced(tokens, i + 1, '(', ')')
+            if not stmt and i < n and tokens[i] == ';':
+                i += 1
+            continue
+        if t == 'template' and nxt == '<':
+            i = _skip_balanced(tokens, i + 1, '<', '>')
+            continue
+        if t in ('class', 'struct') and not stmt:
+            head = _class_head(tokens, i)
+            if head is not None:
+                end, terminator, head_tokens = head
+                name, bases = _parse_head(head_tokens)
+                kind = pending_kind if pending_kind in ('class', 'struct', 'interface') else t
+                pending_kind = None
+                if name and terminator == ';' and name not in forward_declarations:
+                    forward_declarations.append(name)
+                if terminator == ';' or not name:
+                    i = end + 1
+                    continue
+                if kind == 'interface':
+                    u_interfaces.add(name)
+                elif name[:1] == 'I' and 'U' + name[1:] in u_interfaces:
+                    # The native I-class paired with a UINTERFACE U-class
+                    kind = 'interface'
+                relations = []
+                for idx, base in enumerate(bases):
+                    target = base.split('<')[0].strip()
+                    rel_type = 'implements' if idx > 0 and re.match(r'^I[A-Z]', target) else 'extends'
+                    relations.append({'type': rel_type, 'target': base})
+                new_entity = {
+                    'name': name,
+                    'type': kind,
+                    'attributes': [],
+                    'methods': [],
+                    'relations': relations,
+                    'refs': [],
+                    '_visibility': 'private' if kind == 'class' else 'public',
+                }
+                entities.append(new_entity)
+                scopes.append(new_entity)
+                i = end + 1
+                continue
+        if t == 'class':
+            # Elaborated type specifier: 'class UCameraComponent* Camera;'
+            if _is_word(nxt) and nxt not in forward_declarations:
+                forward_declarations.append(nxt)
+            stmt.append(t)
+            i += 1
+            continue
+        if t == 'enum' and not stmt:
+            j = i + 1
+            while j < n and tokens[j] not in ('{', ';'):
+                j += 1
+            head = [x for x in tokens[i + 1:j] if x not in ('class', 'struct')]
+            colon = head.index(':') if ':' in head else len(head)
+            name = head[colon - 1] if colon > 0 else None
+            pending_kind = None
+            if j < n and tokens[j] == '{':
+                values, i = _parse_enum(tokens, j)
+                if name:
+                    enums.append({'name': name, 'values': values})
+            else:
+                i = j + 1
+            stmt = []
+            continue
+        if t == 'namespace' and not stmt:
+            j = i + 1
+            while j < n and tokens[j] not in ('{', ';'):
+                j += 1
+            if j < n and tokens[j] == '{':
+                scopes.append(None)
+            i = j + 1
+            continue
+        if t == '{':
+            if entity is not None and '(' in stmt and ('=' not in stmt or stmt.index('(') < stmt.index('=')):
+                # Inline method body: keep the declaration, skip the body
+                _member_from_statement(stmt, entity)
+                stmt = []
+                i = _skip_balanced(tokens, i, '{', '}')
+                if i < n and tokens[i] == ';':
+                    i += 1
+                continue
+            if stmt:
+                # Brace initializer or a free function body
+                i = _skip_balanced(tokens, i, '{', '}')
+                if entity is None:
+                    stmt = []
+                continue
+            scopes.append(None)
+            i += 1
+            continue
+        if t == '}':
+            stmt = []
+            if scopes:
+                scopes.pop()
+            i += 1
+            continue
+        if t == ';':
+            if entity is not None and stmt:
+                _member_from_statement(stmt, entity)
+            stmt = []
+            pending_kind = None
+            i += 1
+            continue
+        if t in ACCESS and nxt == ':' and not stmt and entity is not None:
+            entity['_visibility'] = t
+            i += 2
+            continue
+        stmt.append(t)
+        i += 1
+    classes = []
+    interfaces = []
+    for entity in entities:
+        del entity['_visibility']
+        if entity['type'] == 'interface':
+            interfaces.append(entity)
+        else:
+            classes.append(entity)  # Struct becomes UML class
+    return {'forward_declarations': forward_declarations, 'classes': classes, 'interfaces': interfaces,
+            'enums': enums}
@@ -0,0 +1,132 @@
+from UnrealHeaderScanner import clean_type
+
+"""
+UnrealSymbolIndex.py
+---------------------
+Symbol index of an Unreal project, built from the scanned headers. Definitions (classes, structs,
+interfaces and enums) are keyed by (module, name) and remember their defining header; forward
+declarations ('class UCameraComponent;') are kept apart, since they only say that a type exists
+somewhere (usually in the engine). Type references are normalized with clean_type and resolved with
+hashed lookups, preferring a definition from the referencing module.
+"""
+
+
+def module_of(path):
+    """Unreal module of a header: the folder right under the last 'Source' folder ('' if there is none)."""
+    path = path.replace('\\', '/')
+    start = path.rfind('/Source/')
+    if start < 0:
+        if not path.startswith('Source/'):
+            return ''
+        start = -1
+    rest = path[start + 8:]
+    slash = rest.find('/')
+    return rest[:slash] if slash > 0 else ''
+
+
+def defined_names(header):
+    """Names of every class, struct, interface and enum a scanned header defines."""
+    return [e['name'] for e in header['classes'] + header['interfaces'] + header['enums']]
+
+
+class UnrealSymbolIndex:
+    def __init__(self):
+        # (module, name) -> defining header
+        self.definitions = {}
+        # (module, name) -> number of headers defining it
+        self.definition_counts = {}
+        # name -> modules that define it, in insertion order
+        self.modules_by_name = {}
+        # name -> number of headers forward-declaring it
+        self.forward_declarations = {}
+        # header -> (module, defined names, forward-declared names), to undo add_header
+        self.headers = {}
+
+    def add_header(self, path, header):
+        """Indexes the definitions and forward declarations of one scanned header (replacing a previous version)."""
+        if path in self.headers:
+            self.remove_header(path)
+        module = module_of(path)
+        names = defined_names(header)
+        counts = self.definition_counts
+        for name in names:
+            key = (module, name)
+            if key in counts:
+                counts[key] += 1
+            else:
+                counts[key] = 1
+                self.definitions[key] = path
+                self.modules_by_name.setdefault(name, []).append(module)
+        forwards = header.get('forward_declarations', [])
+        forward_declarations = self.forward_declarations
+        for name in forwards:
+            forward_declarations[name] = forward_declarations.get(name, 0) + 1
+        self.headers[path] = (module, names, forwards)
+
+    def remove_header(self, path):
+        entry = self.headers.pop(path, None)
+        if entry is None:
+            return
+        module, names, forwards = entry
+        for name in names:
+            key = (module, name)
+            self.definition_counts[key] -= 1
+            if self.definition_counts[key]:
+                # Another header of the same module defines the name as well
+                if self.definitions[key] == path:
+                    self.definitions[key] = next(p for p, (m, n, _) in self.headers.items()
+                                                 if m == module and name in n)
+                continue
+            del self.definition_counts[key]
+            del self.definitions[key]
+            modules = self.modules_by_name[name]
+            modules.remove(module)
+            if not modules:
+                del self.modules_by_name[name]
+        for name in forwards:
+            self.forward_declarations[name] -= 1
+            if not self.forward_declarations[name]:
+                del self.forward_declarations[name]
+
+    def resolve(self, name, module=''):
+        """
+        Resolves a type name already normalized by clean_type (as the scanner's 'refs' are), seen in
+        `module`: returns the (module, name) key of its definition (the referencing module first),
+        (None, name) for a type that is only forward-declared, or None.
+        """
+        if (module, name) in self.definitions:
+            return module, name
+        modules = self.modules_by_name.get(name)
+        if modules:
+            return modules[0], name
+        if name in self.forward_declarations:
+            return None, name
+        return None
+
+    def resolve_type(self, type_name, module=''):
+        """Same as resolve(), for a raw type spelling ('const TArray<AItem*>&' resolves TArray)."""
+        return self.resolve(clean_type(type_name), module)
+
+    def defining_header(self, name, module=None):
+        """Header defining `name` (in `module`, or in the first module that defines it), or None."""
+        if module is None:
+            modules = self.modules_by_name.get(name)
+            if not modules:
+                return None
+            module = modules[0]
+        return self.definitions.get((module, name))
+
+    def __contains__(self, name):
+        """True if a reference to `name` resolves (it is defined or forward-declared somewhere)."""
+        return name in self.modules_by_name or name in self.forward_declarations
+
+    def names(self):
+        """Every name a reference can resolve to (defined or forward-declared)."""
+        return self.modules_by_name.keys() | self.forward_declarations.keys()
+
+    @classmethod
+    def from_headers(cls, header_data):
+        index = cls()
+        for path, header in header_data:
+            index.add_header(path, header)
+        return index
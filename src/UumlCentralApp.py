@@ -1,6 +1,7 @@
 import argparse
 import os
 import sys
+from collections import Counter
 
 LANGUAGES = [
     ("C#", [".cs"]),
@@ -16,63 +17,132 @@ PROJECT_SIGNATURES = {
     "C++ for Unreal": ["UCLASS", ".uproject"],
 }
 
-def find_files_with_ext(root, exts, exclude_dirs=None):
-    for dirpath, dirnames, filenames in os.walk(root):
-        if exclude_dirs and any(ex in dirpath for ex in exclude_dirs):
-            continue
-        for f in filenames:
-            if any(f.endswith(ext) for ext in exts):
-                print(f"DEBUG: found {f} in {dirpath}")
-                return True
-    print(f"DEBUG: no files with extensions {exts} found in {root}")
-    return False
+SOURCE_EXTS = ('.cs', '.py', '.cpp', '.h', '.hpp', '.go')
 
-def detect_project_type(project_dir):
-    # Unreal Engine: .uproject obrigatório
-    uproject_files = [f for f in os.listdir(project_dir) if f.endswith('.uproject')]
+def _scan_dir(path):
+    try:
+        with os.scandir(path) as it:
+            return list(it)
+    except OSError:
+        return []
+
+def _decide_project_type(markers, histogram, cpp_outside_source, complete):
+    """
+    Applies the detection precedence over what has been scanned so far.
+    Returns (type, certain); certain means no further file can change the result.
+    """
+    if markers['uproject']:
+        if markers['source_cpp']:
+            return 'cpp4ue', True
+        if markers['source_done'] and markers['content_uasset']:
+            return 'unrealbp', True
+        if not complete:
+            return None, False
+    if histogram['.cs']:
+        if markers['assembly_csharp'] or markers['project_settings']:
+            return 'unity', True
+        return 'csharp', True
+    if not complete:
+        return None, False
+    if markers['go_mod'] and histogram['.go']:
+        return 'go', True
+    if histogram['.py']:
+        return 'python', True
+    if cpp_outside_source:
+        return 'cpp', True
+    if histogram['.go']:
+        return 'go', True
+    return None, True
+
+def classify_project(project_dir):
+    """
+    Classifies the project with a single os.scandir pass, building an extension/marker histogram.
+    The walk stops as soon as the result is certain. Returns a dict with
+    'type', 'confidence' (0..1), 'histogram', 'markers', 'files_scanned' and 'complete'.
+    """
+    markers = {
+        'uproject': False, 'project_settings': False, 'assembly_csharp': False, 'go_mod': False,
+        'source_cpp': False, 'source_done': False, 'content_uasset': False,
+    }
+    histogram = Counter()
+    cpp_outside_source = 0
+    files_scanned = 0
+    root_entries = _scan_dir(project_dir)
+    for entry in root_entries:
+        if entry.is_dir():
+            if entry.name == 'ProjectSettings':
+                markers['project_settings'] = True
+        elif entry.name.endswith('.uproject'):
+            markers['uproject'] = True
+        elif entry.name == 'Assembly-CSharp.csproj':
+            markers['assembly_csharp'] = True
+        elif entry.name == 'go.mod':
+            markers['go_mod'] = True
+    # Stack of (path, in_source, in_unreal_source, in_content); Unreal's Source is scanned first
     source_dir = os.path.join(project_dir, 'Source')
-    has_cpp = os.path.isdir(source_dir) and find_files_with_ext(source_dir, ['.h', '.cpp'])
-    # Blueprint: tem .uproject, tem .uasset em Content, mas NÃO tem Source com .cpp/.h
-    content_dir = None
-    for root, dirs, files in os.walk(project_dir):
-        for d in dirs:
-            if d.lower() == 'content':
-                content_dir = os.path.join(root, d)
-                break
-        if content_dir:
-            break
-    has_uasset = False
-    if content_dir:
-        for root, dirs, files in os.walk(content_dir):
-            if any(f.endswith('.uasset') for f in files):
-                has_uasset = True
-                break
-    if uproject_files:
-        if has_cpp:
-            return 'cpp4ue'
-        elif has_uasset:
-            return 'unrealbp'
-    # Unity
-    if find_files_with_ext(project_dir, ['.cs']):
-        # CSharp for Unity: tem Assembly-CSharp.csproj ou ProjectSettings
-        if (
-            os.path.exists(os.path.join(project_dir, 'Assembly-CSharp.csproj')) or
-            os.path.isdir(os.path.join(project_dir, 'ProjectSettings'))
-        ):
-            return 'unity'
-        # CSharp puro: NÃO tem Assembly-CSharp.csproj nem ProjectSettings
-        else:
-            return 'csharp'
-    # Python
-    if find_files_with_ext(project_dir, ['.py']):
-        return 'python'
-    # C++ puro (mas não Unreal)
-    if find_files_with_ext(project_dir, ['.cpp', '.h'], exclude_dirs=['Source']):
-        return 'cpp'
-    # Go
-    if find_files_with_ext(project_dir, ['.go']):
-        return 'go'
-    return None
+    stack = [(project_dir, False, False, False)]
+    pending_source_dirs = 0
+    if markers['uproject'] and os.path.isdir(source_dir):
+        stack.append((source_dir, True, True, False))
+        pending_source_dirs = 1
+    else:
+        markers['source_done'] = True
+    result, certain = None, False
+    while stack and not certain:
+        path, in_source, in_unreal_source, in_content = stack.pop()
+        entries = root_entries if path == project_dir else _scan_dir(path)
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if path == project_dir and name == 'Source' and markers['uproject']:
+                    continue
+                stack.append((entry.path, in_source or name == 'Source', in_unreal_source,
+                              in_content or name.lower() == 'content'))
+                pending_source_dirs += in_unreal_source
+                continue
+            files_scanned += 1
+            ext = os.path.splitext(name)[1]
+            histogram[ext] += 1
+            if ext in ('.h', '.cpp'):
+                if in_unreal_source:
+                    markers['source_cpp'] = True
+                elif not in_source:
+                    cpp_outside_source += 1
+            elif ext == '.uasset' and in_content:
+                markers['content_uasset'] = True
+        if in_unreal_source:
+            pending_source_dirs -= 1
+            markers['source_done'] = pending_source_dirs == 0
+        result, certain = _decide_project_type(markers, histogram, cpp_outside_source, complete=not stack)
+    return {
+        'type': result,
+        'confidence': _detection_confidence(result, markers, histogram),
+        'histogram': dict(histogram),
+        'markers': markers,
+        'files_scanned': files_scanned,
+        'complete': not stack,
+    }
+
+def _detection_confidence(project_type, markers, histogram):
+    """Confidence is 1.0 when a project marker decided the type, else the share of matching source files."""
+    if project_type is None:
+        return 0.0
+    if project_type in ('cpp4ue', 'unrealbp') or (project_type == 'unity' and (markers['assembly_csharp'] or markers['project_settings'])):
+        return 1.0
+    if project_type == 'go' and markers['go_mod']:
+        return 1.0
+    lang_exts = {'csharp': ('.cs',), 'unity': ('.cs',), 'python': ('.py',), 'cpp': ('.cpp', '.h', '.hpp'), 'go': ('.go',)}
+    total = sum(histogram.get(ext, 0) for ext in SOURCE_EXTS)
+    matching = sum(histogram.get(ext, 0) for ext in lang_exts[project_type])
+    return round(matching / total, 2) if total else 0.0
+
+def detect_project_type(project_dir):
+    info = classify_project(project_dir)
+    if info['type']:
+        scope = 'full scan' if info['complete'] else 'early exit'
+        print(f"[UML] Detected project type: {info['type']} (confidence {info['confidence']:.2f}, "
+              f"{info['files_scanned']} files scanned, {scope})")
+    return info['type']
 
 def get_project_dir():
     if getattr(sys, 'frozen', False):
@@ -80,13 +150,57 @@ def get_project_dir():
     else:
         return os.path.dirname(os.path.abspath(__file__))
 
+def render_paged_svg(index_path):
+    """Renders every page and the index page in one PlantUML run; returns the index SVG (or None)."""
+    from ModelPages import page_files
+    from SVGRenderer import render_svgs
+    svgs = render_svgs(page_files(index_path))
+    return svgs[-1] if svgs else None
+
 if __name__ == "__main__":
     import sys
+    import multiprocessing
+    # Required for the --jobs process pool in the frozen (PyInstaller) executable
+    multiprocessing.freeze_support()
     try:
         parser = argparse.ArgumentParser(description="UML Central App (console)")
         parser.add_argument("--project", "-p", required=False, help="Project path (root directory)")
         parser.add_argument("--type", "-t", required=False, choices=["cpp4ue", "cpp", "unity", "python", "csharp", "go"], help="Project type: cpp4ue, cpp, unity, python, csharp, go")
+        parser.add_argument("--jobs", "-j", type=int, default=1, help="Parser processes (0 = one per CPU core, default 1)")
+        parser.add_argument("--no-cache", action="store_true", help="Do not use the per-file parse cache in .uuml-cache/")
+        parser.add_argument("--no-json", action="store_true", help="Do not write the *_UML_ClassDiagram.json artifact (cpp4ue, cpp, csharp, go)")
+        parser.add_argument("--no-snapshot", action="store_true", help="Do not write the binary *_UML_ClassDiagram.uumlsnap model snapshot")
+        parser.add_argument("--watch", "-w", action="store_true", help="Keep running and regenerate the .puml incrementally when source files change")
+        parser.add_argument("--watch-interval", type=float, default=0.5, help="Seconds between change polls in --watch mode (default 0.5)")
+        parser.add_argument("--focus", metavar="CLASS", help="Only draw the neighborhood of this class")
+        parser.add_argument("--depth", type=int, default=1, help="Relation hops kept around the --focus class (default 1)")
+        parser.add_argument("--direction", choices=["up", "down", "both"], default="both", help="Follow relations towards bases/used types (up), derived/using classes (down) or both (default)")
+        parser.add_argument("--max-page-nodes", type=int, default=0, help="Split the diagram into pages of at most N classes, plus an index page (0 = one diagram)")
+        parser.add_argument("--max-page-edges", type=int, default=0, help="At most M relations per page (default 2 per class)")
+        parser.add_argument("--max-members", type=int, default=0, help="At most N attributes and N methods per class box, the rest summarized by a '+N more' line (cpp4ue; 0 = all)")
+        parser.add_argument("--max-enum-values", type=int, default=0, help="At most N values per enum box (cpp4ue; 0 = all)")
+        parser.add_argument("--public-only", action="store_true", help="Only draw public members (cpp4ue)")
+        parser.add_argument("--collapse-accessors", action="store_true", help="Draw each GetX/SetX method pair as one 'Get/SetX' method (cpp4ue)")
+        parser.add_argument("--no-render-cache", action="store_true", help="Always run PlantUML instead of reusing SVGs of unchanged diagrams from the render cache")
+        parser.add_argument("--renderer", choices=["plantuml", "native", "html"], help="SVG renderer: plantuml (needs Java), native (built-in layered layout, no Java) or html (interactive viewer for very large diagrams, no Java). Default: plantuml, or native when Java/plantuml.jar is missing")
+        parser.add_argument("--verbose", "-v", action="store_true", help="Also echo the generated .puml to the console (by default only a summary is printed)")
         args = parser.parse_args()
+        from SVGRenderer import set_render_cache, set_renderer
+        set_render_cache(not args.no_render_cache)
+        set_renderer(args.renderer or 'auto')
+        if args.verbose:
+            from PumlWriter import set_verbose
+            set_verbose(True)
+        paging = None
+        if args.max_page_nodes > 0:
+            from ModelPages import make_paging
+            paging = make_paging(args.max_page_nodes, args.max_page_edges)
+        focus = None
+        if args.focus:
+            from ModelFocus import Focus
+            focus = Focus(args.focus, args.depth, args.direction)
+        from ModelDetail import make_detail
+        detail = make_detail(args.max_members, args.public_only, args.collapse_accessors, args.max_enum_values)
 
         # Definir diretório do projeto
         project_dir = args.project if args.project else get_project_dir()
@@ -99,11 +213,15 @@ if __name__ == "__main__":
                 input('Pressione ENTER para sair...')
             sys.exit(1)
 
-        if tipo == "cpp4ue":
+        if args.watch:
+            from WatchMode import run_watch
+            print(f"[UML] Watch mode ({tipo}) in {project_dir}")
+            run_watch(project_dir, tipo, jobs=args.jobs, use_cache=not args.no_cache, interval=args.watch_interval, focus=focus)
+        elif tipo == "cpp4ue":
             from CPPForUnrealEngine import main as gen_cpp4ue
             print(f"[UML] Generating UML for C++ Unreal in {project_dir}")
             try:
-                gen_cpp4ue(project_dir)
+                gen_cpp4ue(project_dir, jobs=args.jobs, use_cache=not args.no_cache, write_json=not args.no_json, write_snapshot=not args.no_snapshot, focus=focus, paging=paging, detail=detail)
             except Exception as e:
                 print(f"[ERROR] Execution interrupted: {e}")
             print("[UML] Finished!")
@@ -113,47 +231,47 @@ if __name__ == "__main__":
             from CPPGenericUML import main as gen_cpp
             from SVGRenderer import render_svg
             print(f"[UML] Generating UML for pure C++ in {project_dir}")
-            gen_cpp(project_dir)
+            gen_cpp(project_dir, jobs=args.jobs, use_cache=not args.no_cache, write_json=not args.no_json, write_snapshot=not args.no_snapshot, focus=focus, paging=paging)
             print("[UML] Finished!")
             if getattr(sys, 'frozen', False):
                 input('Pressione ENTER para sair...')
         elif tipo == "unity":
             from CSharpForUnity import generate_puml as gen_unity
-            from SVGRenderer import render_svg
+            from SVGRenderer import render_svg, output_kind
             print(f"[UML] Generating UML for Unity C# in {project_dir}")
-            puml_path = gen_unity(project_dir)
-            svg = render_svg(puml_path)
+            puml_path = gen_unity(project_dir, focus=focus, paging=paging)
+            svg = render_paged_svg(puml_path) if paging else render_svg(puml_path)
             if svg:
-                print(f"[UML] SVG generated: {svg}")
+                print(f"[UML] {output_kind(svg)} generated: {svg}")
             else:
-                print("[UML] SVG not generated!")
+                print(f"[UML] {output_kind()} not generated!")
             print("[UML] Finished!")
             if getattr(sys, 'frozen', False):
                 input('Pressione ENTER para sair...')
         elif tipo == "python":
             from PythonUML import generate_puml as gen_py
-            from SVGRenderer import render_svg
+            from SVGRenderer import render_svg, output_kind
             print(f"[UML] Generating UML for Python in {project_dir}")
-            puml_path = gen_py(project_dir)
-            svg = render_svg(puml_path)
+            puml_path = gen_py(project_dir, jobs=args.jobs, use_cache=not args.no_cache, focus=focus, paging=paging)
+            svg = render_paged_svg(puml_path) if paging else render_svg(puml_path)
             if svg:
-                print(f"[UML] SVG generated: {svg}")
+                print(f"[UML] {output_kind(svg)} generated: {svg}")
             else:
-                print("[UML] SVG not generated!")
+                print(f"[UML] {output_kind()} not generated!")
             print("[UML] Finished!")
             if getattr(sys, 'frozen', False):
                 input('Pressione ENTER para sair...')
         elif tipo == "csharp":
             from CSharpUML import main as gen_csharp
             print(f"[UML] Generating UML for C# in {project_dir}")
-            gen_csharp(project_dir)
+            gen_csharp(project_dir, jobs=args.jobs, use_cache=not args.no_cache, write_json=not args.no_json, write_snapshot=not args.no_snapshot, focus=focus, paging=paging)
             print("[UML] Finished!")
             if getattr(sys, 'frozen', False):
                 input('Pressione ENTER para sair...')
         elif tipo == "go":
             from GoUML import main as gen_go
             print(f"[UML] Generating UML for Go in {project_dir}")
-            gen_go(project_dir)
+            gen_go(project_dir, jobs=args.jobs, use_cache=not args.no_cache, write_json=not args.no_json, write_snapshot=not args.no_snapshot, focus=focus, paging=paging)
             print("[UML] Finished!")
             if getattr(sys, 'frozen', False):
                 input('Pressione ENTER para sair...')
@@ -0,0 +1,230 @@
+import os
+import time
+from FileDiscovery import iter_files
+from ParallelParse import parse_files, DEFAULT_CHUNK_SIZE
+from ParseCache import open_parse_cache
+from UnrealSymbolIndex import UnrealSymbolIndex, defined_names
+from ModelFocus import focus_model
+
+"""
+WatchMode.py
+-------------
+--watch: keeps the parsed model in memory and re-emits the .puml whenever a source file changes.
+Changes are found by a stat-polling loop; bursts of saves (e.g. a git checkout) are debounced into a
+single cycle. Only changed files are re-parsed, and for Unreal only the associations that touch
+changed or added/removed classes are re-resolved. There is no JSON round trip and no JVM launch
+per cycle; the edit-to-diagram latency of every cycle is reported.
+"""
+
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.3
+MAX_DEBOUNCE_WAIT = 10.0
+
+
+class MergeWatch:
+    """Backends whose per-file results are merged by a plain function (C++, C#, Go, Python)."""
+
+    def __init__(self, root, exts, language, worker, version, merge, emit, project_root=None):
+        self.root = root
+        # Folder whose ignore files apply on top of the ones under `root`
+        self.project_root = project_root or root
+        self.exts = exts
+        self.language = language
+        self.worker = worker
+        self.version = version
+        self.merge = merge
+        self.emit = emit
+        self.results = {}
+        # Entities whose relations were re-resolved in the last cycle (only tracked for Unreal)
+        self.resolved = None
+
+    def update(self, parsed, removed):
+        for path in removed:
+            self.results.pop(path, None)
+        self.results.update(parsed)
+        return self.merge(sorted(self.results.items()))
+
+
+class UnrealWatch(MergeWatch):
+    """
+    Keeps the symbol index of every header up to date, so associations are only re-resolved for the
+    changed headers and for entities referencing a name that appeared or disappeared.
+    """
+
+    def __init__(self, project_dir):
+        import CPPForUnrealEngine as ue
+        self.ue = ue
+        super().__init__(os.path.join(project_dir, 'Source'), ('.h',), 'cpp4ue', ue.parse_unreal_header,
+                         ue.PARSER_VERSION, ue.merge_headers,
+                         lambda model: ue.generate_puml_from_model(model, project_dir), project_dir)
+        self.index = UnrealSymbolIndex()
+        self.candidates = {}
+
+    def update(self, parsed, removed):
+        ue = self.ue
+        index = self.index
+        # Only names declared by the old or new version of a changed header can appear or disappear
+        touched = set()
+        for path in removed:
+            if path in index.headers:
+                touched.update(*index.headers[path][1:])
+        for path, header in parsed:
+            if path in index.headers:
+                touched.update(*index.headers[path][1:])
+            touched.update(defined_names(header), header['forward_declarations'])
+        known = {name for name in touched if name in index}
+        for path in list(removed) + [path for path, _ in parsed]:
+            if self.results.pop(path, None) is not None:
+                index.remove_header(path)
+                self.candidates.pop(path, None)
+        for path, header in parsed:
+            self.results[path] = header
+            index.add_header(path, header)
+            self.candidates[path] = [ue.association_candidates(e) for e in ue.resolvable_entities(header)]
+        delta = known ^ {name for name in touched if name in index}
+        changed = {path for path, _ in parsed}
+        self.resolved = 0
+        for path, header in self.results.items():
+            if path not in changed and not delta:
+                continue
+            module = index.headers[path][0]
+            for entity, candidates in zip(ue.resolvable_entities(header), self.candidates[path]):
+                if path in changed or not delta.isdisjoint(candidates):
+                    ue.resolve_associations(entity, index, module)
+                    self.resolved += 1
+        return self.merge(sorted(self.results.items()))
+
+
+class RebuildWatch:
+    """Backends without a per-file extractor (Unity): every cycle regenerates the whole diagram."""
+
+    def __init__(self, root, exts, language, regenerate):
+        self.root = root
+        self.project_root = root
+        self.exts = exts
+        self.language = language
+        self.worker = None
+        self.regenerate = regenerate
+        self.resolved = None
+
+    def update(self, parsed, removed):
+        return None
+
+    def emit(self, model):
+        return self.regenerate()
+
+
+def make_watch_backend(tipo, project_dir, focus=None):
+    if tipo == 'cpp4ue':
+        return UnrealWatch(project_dir)
+    if tipo == 'cpp':
+        import CPPGenericUML as cpp
+        return MergeWatch(project_dir, ('.h', '.hpp'), 'cpp', cpp.parse_header_file, cpp.PARSER_VERSION,
+                          cpp.merge_header_results, lambda model: cpp.generate_puml_from_model(model, project_dir))
+    if tipo == 'csharp':
+        import CSharpUML as cs
+        return MergeWatch(project_dir, ('.cs',), 'csharp', cs.extract_raw_entities, cs.PARSER_VERSION,
+                          cs.merge_uml_json, lambda model: cs.generate_puml_from_model(model, project_dir))
+    if tipo == 'go':
+        import GoUML as go
+        return MergeWatch(project_dir, ('.go',), 'go', go.extract_go_structs_and_interfaces, go.PARSER_VERSION,
+                          go.merge_uml_json, lambda model: go.generate_puml_from_model(model, project_dir))
+    if tipo == 'python':
+        import PythonUML as py
+        return MergeWatch(project_dir, ('.py',), 'python', py.extract_classes, py.PARSER_VERSION,
+                          lambda results: py.merge_classes(results, project_dir),
+                          lambda model: py.write_puml(model, project_dir))
+    if tipo == 'unity':
+        import CSharpForUnity as unity
+        emit = lambda model: unity.generate_puml(project_dir, model)
+        if focus is not None:
+            emit = focused_emit(emit, focus)
+        return RebuildWatch(project_dir, ('.cs',), 'unity', lambda: emit(unity.build_model(project_dir)))
+    return None
+
+
+def snapshot(backend):
+    """Maps every watched file to its (size, mtime_ns)."""
+    stats = {}
+    for path in iter_files(backend.root, backend.exts, language=backend.language, project_root=backend.project_root):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stats[path] = (st.st_size, st.st_mtime_ns)
+    return stats
+
+
+def run_cycle(backend, changed, removed, jobs, cache):
+    """Re-parses `changed`, updates the in-memory model and re-emits the .puml. Returns (puml, parse_s, emit_s)."""
+    start = time.perf_counter()
+    parsed = []
+    if backend.worker is not None and changed:
+        # A process pool only pays off when many files changed at once
+        cycle_jobs = jobs if len(changed) > DEFAULT_CHUNK_SIZE else 1
+        parsed = parse_files(changed, backend.worker, jobs=cycle_jobs, cache=cache, version=backend.version)
+    model = backend.update(parsed, removed)
+    parsed_at = time.perf_counter()
+    puml_path = backend.emit(model)
+    return puml_path, parsed_at - start, time.perf_counter() - parsed_at
+
+
+def focused_emit(emit, focus):
+    """Wraps an emitter so it draws the focus neighborhood; the whole model is drawn while the class is missing."""
+    def emit_focus(model):
+        sub = focus_model(model, focus)
+        if sub is None:
+            print(f"[UML] '{focus.name}' is not in the model (yet); drawing the whole diagram.")
+            return emit(model)
+        return emit(sub)
+    return emit_focus
+
+
+def run_watch(project_dir, tipo, jobs=1, use_cache=True, interval=DEFAULT_POLL_INTERVAL, debounce=DEFAULT_DEBOUNCE,
+              focus=None):
+    """Generates the .puml once, then regenerates it incrementally on every change until Ctrl+C."""
+    backend = make_watch_backend(tipo, project_dir, focus)
+    if backend is None:
+        print(f"[UML] Watch mode is not supported for project type '{tipo}'.")
+        return
+    if focus is not None and backend.worker is not None:
+        backend.emit = focused_emit(backend.emit, focus)
+    with open_parse_cache(project_dir, enabled=use_cache) as cache:
+        stats = snapshot(backend)
+        puml_path, parse_s, emit_s = run_cycle(backend, sorted(stats), [], jobs, cache)
+        print(f"[UML] Initial diagram: {puml_path} ({len(stats)} files, parse {parse_s:.2f}s, emit {emit_s:.2f}s)")
+        print(f"[UML] Watching {backend.root} for {', '.join(backend.exts)} changes (Ctrl+C to stop)...")
+        try:
+            while True:
+                polled_at = time.time()
+                time.sleep(interval)
+                current = snapshot(backend)
+                if current == stats:
+                    continue
+                # Debounce: wait until a poll shows no further change (bounded for endless writers)
+                deadline = time.time() + MAX_DEBOUNCE_WAIT
+                while time.time() < deadline:
+                    time.sleep(debounce)
+                    newer = snapshot(backend)
+                    if newer == current:
+                        break
+                    current = newer
+                changed = sorted(p for p, st in current.items() if stats.get(p) != st)
+                removed = sorted(p for p in stats if p not in current)
+                stats = current
+                if not changed and not removed:
+                    continue
+                # The edit happened after the previous quiet poll; mtimes refine that when plausible
+                edited_at = polled_at
+                if changed:
+                    edited_at = max(polled_at, min(stats[p][1] / 1e9 for p in changed))
+                puml_path, parse_s, emit_s = run_cycle(backend, changed, removed, jobs, cache)
+                latency = time.time() - edited_at
+                resolved = f", {backend.resolved} entities re-resolved" if backend.resolved is not None else ''
+                print(f"[UML] {len(changed)} changed, {len(removed)} removed{resolved} "
+                      f"-> {os.path.basename(puml_path)} in {latency:.2f}s after the edit "
+                      f"(parse {parse_s * 1000:.0f} ms, emit {emit_s * 1000:.0f} ms)")
+                if cache is not None:
+                    cache.flush()
+        except KeyboardInterrupt:
+            print("[UML] Watch stopped.")